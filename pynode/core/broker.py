@@ -22,6 +22,7 @@ from core.patterns.pynode_logger import LogSocketHandler
 from core.patterns.exceptions import CriticalTransactionError
 
 from core.processor.processor import Processor, ProcessorDelegate
+from core.processor.readers import check_json_head
 
 
 class Broker(Thread, Singleton, WorkerNodeDelegate, ProcessorDelegate):
@@ -161,6 +162,8 @@ class Broker(Thread, Singleton, WorkerNodeDelegate, ProcessorDelegate):
     # todo job address is necessary ADD it to method call parameters
     def init_cognitive_job(self) -> bool:
         self.manager.job_contract_address = self.job_address
+        # metrics of previous job are not reported for new job
+        self.manager.job_metrics = {}
         self.job_container = self.eth.init_contract(server_address=self.manager.eth_host,
                                                     contract_address=self.job_address,
                                                     contract_abi=self.manager.eth_cognitive_job_contract)
@@ -243,10 +246,13 @@ class Broker(Thread, Singleton, WorkerNodeDelegate, ProcessorDelegate):
                               data_dir=self.data_dir)
             self.logger.info('IPFS connection instantiated success')
             # load kernel and dataset root files
-            self.ipfs.download_file(kernel_ipfs_address.decode("utf-8"))
+            self.ipfs.download_file(kernel_ipfs_address.decode("utf-8"), validator=check_json_head)
             self.logger.info('Kernel datafile download success...')
-            self.ipfs.download_file(dataset_ipfs_address.decode("utf-8"))
+            self.ipfs.download_file(dataset_ipfs_address.decode("utf-8"), validator=check_json_head)
             self.logger.info('Dataset datafile download success...')
+            dataset_file = self.read_file(dataset_ipfs_address)
+            batches = self.assign_batches(batch, workers_count, dataset_file)
+            self.logger.info('BATCHES : ' + str(batches))
 
             processor_id = '%s:%s' % (self.node, self.job_address)
             # processor initialization
@@ -256,10 +262,21 @@ class Broker(Thread, Singleton, WorkerNodeDelegate, ProcessorDelegate):
             self.processors[processor_id] = processor
             processor.run()
             processor.prepare(kernel_file=self.read_file(kernel_ipfs_address),
-                              dataset_file=self.read_file(dataset_ipfs_address),
-                              batch=batch)
+                              dataset_file=dataset_file,
+                              batch=batches)
             return processor
 
+    @staticmethod
+    def assign_batches(worker_index: int, workers_count: int, dataset_file: dict) -> list:
+        # if batches count exceeds workers count, node takes every workers_count batch
+        # starting from its own index, so all batches are processed in one job
+        batches = dataset_file.get('batches', [])
+        # batches may be declared as one shared file with rows ranges
+        batches_count = len(batches['ranges']) if isinstance(batches, dict) else len(batches)
+        if batches_count <= workers_count:
+            return [worker_index]
+        return list(range(worker_index, batches_count, workers_count))
+
     @staticmethod
     def read_file(file_address) -> dict:
         with open(file_address) as json_file:
@@ -36,6 +36,67 @@ class Manager:
     web_socket_host = None
     web_socket_port = None
     web_socket_listeners = None
+    # base settings for cognitive job processor
+    # validation mode for VALIDATING_DATA stage
+    # header = check dataset files headers against kernel input layer
+    # full   = read kernel model and all dataset data
+    processor_validation_mode = 'header'
+    # scan data values for NaN, Inf and out of limit values on validation
+    processor_scan_values = True
+    processor_scan_chunk_rows = 4096
+    processor_scan_workers = 4
+    # absolute values limit of scan (None = only NaN and Inf values are rejected)
+    processor_scan_value_limit = None
+    # sample of chunks for values scan: all, chunks count or percent of chunks,
+    # default sample bounds scanned rows of large datasets, found anomalies escalate to full scan
+    processor_scan_sample = '16'
+    # rows count of kernel dry run on validation (0 = dry run is disabled)
+    processor_probe_rows = 8
+    # count of processes for parallel decompression of chunked hdf5 datasets (1 = serial reading)
+    # and min size of decompressed data in megabytes for it
+    processor_read_workers = 4
+    processor_read_parallel_min_size = 64
+    # prediction backend: keras, or numpy for simple sequential dense models (keras is used for other models)
+    processor_backend = 'keras'
+    # quantization of numpy executed models: none, int8 or float16, rejected if max outputs delta exceeds tolerance
+    # on check rows (scales are taken from weights ranges, check rows validate accuracy only)
+    processor_quantization = 'none'
+    processor_quantization_tolerance = 0.01
+    processor_quantization_check_rows = 256
+    # fit jobs checkpoint interval in epochs (0 = checkpoints are disabled)
+    processor_checkpoint_interval = 1
+    # min interval in seconds between training and prediction progress metrics updates
+    processor_progress_interval = 1.0
+    # prediction batch size: auto = tuned by probing, or fixed size, and memory limit of batch in megabytes
+    processor_predict_batch_size = 'auto'
+    processor_batch_memory_limit = 512
+    # processes count for data parallel prediction (1 = single process) and min rows count for it
+    processor_predict_workers = 1
+    processor_parallel_min_rows = 10000
+    # predict unique rows of data only, results of repeated rows are copied
+    processor_dedup_rows = False
+    # cache of compiled prediction models: max models count (0 = disabled) and max memory in megabytes
+    processor_model_cache_size = 4
+    processor_model_cache_memory = 1024
+    # persistent disk store of prediction models: directory (empty = disabled) and max size in megabytes
+    processor_model_store_dir = ''
+    processor_model_store_size = 4096
+    # persistent inference worker process for prediction, recycled after jobs count or memory in megabytes
+    processor_inference_worker = False
+    processor_worker_max_jobs = 100
+    processor_worker_max_memory = 4096
+    # prediction results file settings
+    # chunks = auto (guessed by h5py), none (contiguous), rows count (1024) or chunk shape (1024,10)
+    processor_result_chunks = 'auto'
+    # compression = none, gzip or lzf
+    processor_result_compression = 'gzip'
+    processor_result_compression_level = 4
+    processor_result_shuffle = True
+    # store float results with float16 precision
+    processor_result_float16 = False
+    # persistent cache of published results by job inputs: directory (empty = disabled) and max entries count
+    processor_result_cache_dir = ''
+    processor_result_cache_size = 1000
     # base settings for launch tests
     test_host = None
 
@@ -73,6 +134,9 @@ class Manager:
     # variable for storing last result ipfs address
     job_result_ipfs_address = ''                            # '' - empty or address while job is in process
 
+    # variable for storing job processing metrics
+    job_metrics = {}                                        # {} - empty or metrics by processing stage
+
     __instance = None
 
     def __init__(self):
@@ -121,11 +185,17 @@ class Manager:
         self.job_result_ipfs_address = address
         self.on_property_value_change()
 
+    def set_job_metrics(self, name: str, metrics: dict):
+        self.job_metrics = dict(self.job_metrics, **{name: metrics})
+        self.on_property_value_change()
+
     def set_complete_reset(self):
         self.job_contract_address = ''
         self.job_contract_state = ''
         self.job_kernel_ipfs_address = ''
         self.job_dataset_ipfs_address = ''
+        # metrics of completed job are not reported during next job of node process
+        self.job_metrics = {}
         self.on_property_value_change()
 
 # ----------------------------------
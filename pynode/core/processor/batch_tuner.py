@@ -0,0 +1,76 @@
+import time
+import logging
+import numpy as np
+
+from core.manager import Manager
+from core.patterns.pynode_logger import LogSocketHandler
+
+
+class BatchTuner:
+    """
+    BatchTuner probes prediction batch sizes on first rows of data and chooses
+    size with highest throughput, which estimated activations memory fits memory limit.
+    Chosen sizes are cached by model address.
+    """
+
+    # probed sizes, doubled from min size to max size
+    min_size = 16
+    max_size = 4096
+    # probing is stopped if throughput grows less than by 5%
+    min_gain = 1.05
+    # chosen batch sizes by model address
+    sizes = {}
+
+    def __init__(self, memory_limit: int = 512):
+        # Initializing logger object
+        self.logger = logging.getLogger("BatchTuner")
+        self.logger.addHandler(LogSocketHandler.get_instance())
+        self.manager = Manager.get_instance()
+
+        # memory limit of batch activations in megabytes
+        self.memory_limit = memory_limit * 1024 * 1024
+
+    @staticmethod
+    def row_bytes(model) -> int:
+        # memory of one row activations, outputs of all layers are summed as float32 values
+        total = 0
+        for layer in model.layers:
+            shapes = layer.output_shape if isinstance(layer.output_shape, list) else [layer.output_shape]
+            for shape in shapes:
+                total += int(np.prod([dim for dim in shape[1:] if dim is not None])) * 4
+        return max(total, 1)
+
+    def tune(self, model, data, model_address: str) -> int:
+        if model_address in self.sizes:
+            self.logger.info('Cached prediction batch size : %d', self.sizes[model_address])
+            return self.sizes[model_address]
+        row_bytes = self.row_bytes(model)
+        rows = data.shape[0]
+        # first call builds prediction function, so it is not measured
+        model.predict_on_batch(np.asarray(data[:min(rows, self.min_size)]))
+        throughputs = {}
+        best_size, best_throughput = min(rows, self.min_size), 0.0
+        size = self.min_size
+        while size <= self.max_size and size * row_bytes <= self.memory_limit:
+            block = np.asarray(data[:size])
+            start = time.time()
+            model.predict_on_batch(block)
+            throughput = block.shape[0] / max(time.time() - start, 1e-9)
+            throughputs[size] = throughput
+            gain = throughput >= best_throughput * self.min_gain
+            if throughput > best_throughput:
+                best_size, best_throughput = size, throughput
+            if not gain:
+                break
+            # all rows are probed, larger sizes are not useful for this data
+            if size >= rows:
+                break
+            size *= 2
+        self.logger.info('Prediction batch size : %d, probed throughputs : %s', best_size, str(throughputs))
+        self.manager.set_job_metrics('batch_size', {'size': best_size,
+                                                    'row_bytes': row_bytes,
+                                                    'throughputs': throughputs})
+        # size chosen by data smaller than probed batch is not cached for other jobs
+        if size < rows:
+            self.sizes[model_address] = best_size
+        return best_size
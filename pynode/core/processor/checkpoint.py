@@ -0,0 +1,73 @@
+import os
+import time
+import h5py
+import keras
+import logging
+
+from core.manager import Manager
+from core.patterns.pynode_logger import LogSocketHandler
+
+
+class EpochCheckpoint(keras.callbacks.Callback):
+    """
+    EpochCheckpoint saves model with optimizer state and number of completed epochs
+    into job workspace every interval epochs, so training of job repeated after
+    node restart is resumed from last checkpoint by initial epoch.
+    Checkpoint is written to temporary file and renamed, so interrupted write
+    does not damage previous checkpoint.
+    """
+
+    def __init__(self, file: str, epochs: int, interval: int = 1):
+        super().__init__()
+        # Initializing logger object
+        self.logger = logging.getLogger("EpochCheckpoint")
+        self.logger.addHandler(LogSocketHandler.get_instance())
+        self.manager = Manager.get_instance()
+
+        self.file = file
+        self.epochs = epochs
+        self.interval = interval
+        self.stats = {'writes': 0, 'write_time': 0.0, 'bytes': 0, 'last_epoch': 0, 'resumed_epoch': 0}
+
+    @staticmethod
+    def job_file() -> str:
+        # file name has no 'out' substring, so checkpoint is removed by processor clean up after job completion
+        return str(Manager.get_instance().job_contract_address) + '.checkpoint.hdf5'
+
+    def restore(self):
+        # returns compiled model with optimizer state and completed epochs, or (None, 0) if there is no checkpoint
+        if not os.path.isfile(self.file):
+            return None, 0
+        try:
+            with h5py.File(self.file, 'r') as h5f:
+                epoch = int(h5f.attrs['epoch'])
+            model = keras.models.load_model(self.file)
+        except Exception as ex:
+            self.logger.error("Error reading checkpoint: %s", type(ex))
+            self.logger.error(ex.args)
+            return None, 0
+        self.stats['resumed_epoch'] = epoch
+        self.logger.info('Training is resumed from checkpoint of epoch %d', epoch)
+        self.report()
+        return model, epoch
+
+    def on_epoch_end(self, epoch, logs=None):
+        completed = epoch + 1
+        if completed % self.interval and completed != self.epochs:
+            return
+        start = time.time()
+        temp_file = self.file + '.tmp.hdf5'
+        self.model.save(temp_file)
+        with h5py.File(temp_file, 'a') as h5f:
+            h5f.attrs['epoch'] = completed
+        os.replace(temp_file, self.file)
+        write_time = time.time() - start
+        self.stats['writes'] += 1
+        self.stats['write_time'] += write_time
+        self.stats['bytes'] = os.path.getsize(self.file)
+        self.stats['last_epoch'] = completed
+        self.logger.info('Checkpoint of epoch %d saved in %g sec', completed, write_time)
+        self.report()
+
+    def report(self):
+        self.manager.set_job_metrics('checkpoint', dict(self.stats))
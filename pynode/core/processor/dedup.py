@@ -0,0 +1,37 @@
+import numpy as np
+
+
+def block_unique(block: np.ndarray) -> tuple:
+    # each row is viewed as single opaque value, so rows are compared by one vectorized sort
+    rows = np.ascontiguousarray(block).reshape((block.shape[0], -1))
+    keys = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).reshape(rows.shape[0])
+    return np.unique(keys, return_index=True, return_inverse=True)
+
+
+def unique_rows(data, block_rows: int = 4096) -> tuple:
+    """
+    Finds unique rows of data by comparing rows bytes,
+    returns indices of unique rows in original order and inverse indices,
+    so that data[indices][inverse] equals data.
+    Data is deduplicated by blocks of rows, then unique rows of blocks are merged,
+    so memory mapped or hdf5 data is not copied to memory at once
+    """
+    keys, first_indices, inverses = [], [], []
+    offset = 0
+    for start in range(0, data.shape[0], block_rows):
+        block_keys, block_indices, block_inverse = block_unique(data[start:start + block_rows])
+        keys.append(block_keys)
+        first_indices.append(block_indices + start)
+        inverses.append(block_inverse.reshape(-1) + offset)
+        offset += block_keys.shape[0]
+    if not keys:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    # blocks are merged in rows order, so first occurrence of merged key is first occurrence in data
+    _, merged_indices, merged_inverse = np.unique(np.concatenate(keys), return_index=True, return_inverse=True)
+    indices = np.concatenate(first_indices)[merged_indices]
+    inverse = merged_inverse.reshape(-1)[np.concatenate(inverses)]
+    # unique rows are kept in original order for sequential reading
+    order = np.argsort(indices)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.shape[0])
+    return indices[order], rank[inverse]
@@ -1,14 +1,24 @@
-import h5py
+import io
 import logging
 import numpy as np
 
+from typing import Union, Iterable
+from concurrent.futures import ThreadPoolExecutor
 from core.manager import Manager
 from core.patterns.pynode_logger import LogSocketHandler
+from core.processor.readers import get_reader, read_npy_header, rows_shape, check_data_head, NpyReader
+from core.processor.preprocessing import Preprocessor
+from core.processor.reducers import OutputReducer
 
 
 class Dataset:
 
-    def __init__(self, dataset_file, ipfs_api, batch_no: int):
+    # max count of parallel batches downloads
+    download_workers = 4
+    # rows count of data block for preprocessing while reading
+    read_block_rows = 4096
+
+    def __init__(self, dataset_file, ipfs_api, batch_no: Union[int, Iterable[int]]):
         # Initializing logger object
         self.logger = logging.getLogger("Kernel")
         self.logger.addHandler(LogSocketHandler.get_instance())
@@ -17,11 +27,22 @@ class Dataset:
         self.json_dataset = dataset_file
         # variable for determinate process (predict, fit)
         self.process = None
+        # data files format (hdf5, npy, npz), determinated by files signatures if empty
+        self.data_format = None
+        # prediction batch size, tuned by kernel if empty
+        self.predict_batch_size = None
+        # preprocessing of input (x) and labels (y) data
+        self.preprocessing = {}
+        # reducing of prediction output before results writing
+        self.reducer = None
 
-        # variables for predict job by batches
-        self.data_address = None
+        # variables for predict job by batches (node may process several batches in one job)
         self.batch_no = batch_no
-        self.dataset = None
+        self.batches_no = [batch_no] if isinstance(batch_no, int) else list(batch_no)
+        self.data_addresses = []
+        # rows ranges (start, end) of batches in shared data file, None for whole file
+        self.data_rows = []
+        self.datasets = None
 
         # variables for training (fit)
         self.train_x_address = None
@@ -42,6 +63,19 @@ class Dataset:
         # parse all incoming dataset data
         train_block = False
         batches_block = False
+        # data format, preprocessing and output reducing are not necessary
+        self.data_format = self.json_dataset.get('options', {}).get('format')
+        self.predict_batch_size = self.json_dataset.get('options', {}).get('predict_batch_size')
+        try:
+            preprocessing_block = self.json_dataset.get('options', {}).get('preprocessing', {})
+            self.preprocessing = {target: Preprocessor(steps) for target, steps in preprocessing_block.items()}
+            output_block = self.json_dataset.get('options', {}).get('output')
+            self.reducer = OutputReducer(output_block) if output_block else None
+        except Exception as ex:
+            self.logger.error("Wrong Dataset preprocessing structure")
+            self.logger.error(ex.args)
+            return False
+
         try:
             # train block parsing
             train_block = self.json_dataset['train']
@@ -72,7 +106,13 @@ class Dataset:
             try:
                 # batches block parsing (only for prediction)
                 batches = self.json_dataset['batches']
-                self.data_address = batches[self.batch_no]
+                if isinstance(batches, dict):
+                    # one shared file with rows range for each batch
+                    self.data_addresses = [batches['file'] for _ in self.batches_no]
+                    self.data_rows = [self.parse_rows(batches['ranges'][batch_no]) for batch_no in self.batches_no]
+                else:
+                    self.data_addresses = [batches[batch_no] for batch_no in self.batches_no]
+                    self.data_rows = [None for _ in self.batches_no]
                 batches_block = True
             except Exception as ex:
                 self.logger.error("Wrong Dataset data file structure")
@@ -86,7 +126,7 @@ class Dataset:
         if self.train_x_address:
             try:
                 self.logger.info("Downloading train_x file %s", self.train_x_address)
-                self.ipfs_api.download_file(self.train_x_address)
+                self.ipfs_api.download_file(self.train_x_address, validator=self.check_head)
             except Exception as ex:
                 self.logger.error("Can't download data file from IPFS: %s", type(ex))
                 self.logger.error(ex.args)
@@ -96,17 +136,16 @@ class Dataset:
         if self.train_y_address:
             try:
                 self.logger.info("Downloading train_y file %s", self.train_y_address)
-                self.ipfs_api.download_file(self.train_y_address)
+                self.ipfs_api.download_file(self.train_y_address, validator=self.check_head)
             except Exception as ex:
                 self.logger.error("Can't download data file from IPFS: %s", type(ex))
                 self.logger.error(ex.args)
                 return False
 
-        # try to get dataset for prediction
+        # try to get datasets for prediction
         if self.data_address:
             try:
-                self.logger.info("Downloading data file %s", self.data_address)
-                self.ipfs_api.download_file(self.data_address)
+                self.download_batches()
             except Exception as ex:
                 self.logger.error("Can't download data file from IPFS: %s", type(ex))
                 self.logger.error(ex.args)
@@ -122,28 +161,95 @@ class Dataset:
 
         return True
 
-    def read_dataset(self) -> np.ndarray:
-        if self.dataset is not None:
-            return self.dataset
+    @property
+    def data_address(self) -> Union[str, None]:
+        # first batch address, for single batch jobs it is the only one
+        return self.data_addresses[0] if self.data_addresses else None
+
+    @data_address.setter
+    def data_address(self, address: str):
+        self.data_addresses = [address]
+        self.data_rows = [None]
+
+    @staticmethod
+    def parse_rows(rows) -> tuple:
+        start, end = rows
+        return int(start), int(end)
+
+    def batch_rows(self, batch: int):
+        return self.data_rows[batch] if batch < len(self.data_rows) else None
+
+    def download_batches(self):
+        # batches are independent, so they are downloaded in parallel
+        with ThreadPoolExecutor(max_workers=self.download_workers) as executor:
+            batches = list(range(len(self.data_addresses)))
+            # rows ranges of shared file are read remotely if it is possible
+            local_addresses = list(executor.map(self.download_rows, batches))
+            addresses = []
+            for batch, local_address in zip(batches, local_addresses):
+                if local_address:
+                    self.data_addresses[batch] = local_address
+                    self.data_rows[batch] = None
+                elif self.data_addresses[batch] and self.data_addresses[batch] not in addresses:
+                    addresses.append(self.data_addresses[batch])
+            # rest of files are downloaded entirely, shared file is downloaded once
+            for _ in executor.map(self.download_batch, addresses):
+                pass
 
-        self.logger.info('Loading dataset...')
-        h5f = h5py.File(self.data_address, 'r')
-        # magic internal variable can not be empty (for more easy performance named as structure variable)
-        h5ds = h5f['batches']
-        self.dataset = np.ndarray(shape=h5ds.shape)
-        h5ds.read_direct(dest=self.dataset)
-        return self.dataset
+    def download_batch(self, address: str):
+        self.logger.info("Downloading data file %s", address)
+        self.ipfs_api.download_file(address, validator=self.check_head)
+
+    def check_head(self, head: bytes):
+        # transfer of data file is aborted if its first bytes are not known data format
+        check_data_head(head, self.data_format)
+
+    def download_rows(self, batch: int) -> Union[str, None]:
+        # ranged remote read of npy file rows range into local file
+        # returns local file address or None if ranged read is not possible
+        address, rows = self.data_addresses[batch], self.batch_rows(batch)
+        if not address or rows is None or self.data_format not in (None, NpyReader.format):
+            return None
+        # npy prefix contains magic, version and header length
+        prefix = self.ipfs_api.download_range(address, 0, 12)
+        if not prefix or not prefix.startswith(NpyReader.signature):
+            return None
+        if prefix[6] == 1:
+            header_size = 10 + int.from_bytes(prefix[8:10], 'little')
+        else:
+            header_size = 12 + int.from_bytes(prefix[8:12], 'little')
+        header = self.ipfs_api.download_range(address, 0, header_size)
+        if not header or len(header) != header_size:
+            return None
+        shape, fortran_order, dtype = read_npy_header(io.BytesIO(header))
+        if fortran_order:
+            # rows of fortran ordered array are not contiguous
+            return None
+        shape = rows_shape(shape, rows)
+        row_bytes = int(np.prod(shape[1:])) * dtype.itemsize
+        self.logger.info("Reading rows %s of data file %s", str(rows), address)
+        data = self.ipfs_api.download_range(address, header_size + rows[0] * row_bytes, shape[0] * row_bytes)
+        if not data or len(data) != shape[0] * row_bytes:
+            return None
+        local_address = '%s.%d-%d' % (address, rows[0], rows[1])
+        with open(local_address, 'wb') as npy_file:
+            np.save(npy_file, np.frombuffer(data, dtype=dtype).reshape(shape))
+        return local_address
+
+    def read_dataset(self) -> list:
+        if self.datasets is not None:
+            return self.datasets
+
+        self.logger.info('Loading dataset batches %s...', str(self.batches_no))
+        self.datasets = [self.read_data(address, name, rows) for address, name, rows in self.data_files()]
+        return self.datasets
 
     def read_x_train_dataset(self) -> np.ndarray:
         if self.train_x_dataset is not None:
             return self.train_x_dataset
 
         self.logger.info('Loading train_x dataset...')
-        h5f = h5py.File(self.train_x_address, 'r')
-        # magic internal variable can not be empty (for more easy performance named as structure variable)
-        h5ds = h5f['train_x']
-        self.train_x_dataset = np.ndarray(shape=h5ds.shape)
-        h5ds.read_direct(dest=self.train_x_dataset)
+        self.train_x_dataset = self.read_data(self.train_x_address, 'train_x')
         return self.train_x_dataset
 
     def read_y_train_dataset(self) -> np.ndarray:
@@ -151,11 +257,50 @@ class Dataset:
             return self.train_y_dataset
 
         self.logger.info('Loading train_y dataset...')
-        h5f = h5py.File(self.train_y_address, 'r')
-        # magic internal variable can not be empty (for more easy performance named as structure variable)
-        h5ds = h5f['train_y']
-        self.train_y_dataset = np.ndarray(shape=h5ds.shape)
-        h5ds.read_direct(dest=self.train_y_dataset)
+        self.train_y_dataset = self.read_data(self.train_y_address, 'train_y')
         return self.train_y_dataset
 
+    def inspect_dataset(self) -> dict:
+        # read only shapes and types from files headers, without data reading
+        headers = {}
+        if self.process == 'predict':
+            headers['batches'] = [self.read_header(address, name, rows) for address, name, rows in self.data_files()]
+        elif self.process == 'fit':
+            headers['train_x'] = self.read_header(self.train_x_address, 'train_x')
+            headers['train_y'] = self.read_header(self.train_y_address, 'train_y')
+        return headers
+
+    def read_header(self, file_address: str, name: str, rows: tuple = None) -> tuple:
+        self.logger.info('Reading %s dataset header...', name)
+        shape, dtype = get_reader(file_address, self.data_format).read_header(file_address, name, rows)
+        preprocessor = self.preprocessor(name)
+        if preprocessor is None:
+            return shape, dtype
+        return preprocessor.output_shape(shape), np.dtype(np.float32)
+
+    def preprocessor(self, name: str):
+        # labels preprocessing is declared as y, inputs (batches, train_x) as x
+        return self.preprocessing.get('y' if name == 'train_y' else 'x')
+
+    def open_data(self, file_address: str, name: str, rows: tuple = None):
+        # context manager with array like object for reading data by rows ranges
+        return get_reader(file_address, self.data_format).open(file_address, name, rows)
+
+    def data_files(self) -> list:
+        # file address, internal dataset name and rows range for current computing mode
+        if self.process == 'predict':
+            return [(address, 'batches', self.batch_rows(batch)) for batch, address in enumerate(self.data_addresses)]
+        elif self.process == 'fit':
+            return [(self.train_x_address, 'train_x', None), (self.train_y_address, 'train_y', None)]
+        return []
 
+    def read_data(self, file_address: str, name: str, rows: tuple = None) -> np.ndarray:
+        reader = get_reader(file_address, self.data_format)
+        self.logger.info('Reading %s dataset as %s, rows : %s', name, reader.format, str(rows or 'all'))
+        preprocessor = self.preprocessor(name)
+        if preprocessor is None:
+            return reader.read(file_address, name, rows)
+        # preprocessing is applied block by block while data is read
+        self.logger.info('Preprocessing %s dataset', name)
+        with reader.open(file_address, name, rows) as data:
+            return preprocessor.transform(data, self.read_block_rows)
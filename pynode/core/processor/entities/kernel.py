@@ -1,12 +1,53 @@
+import os
+import json
+import math
+import time
 import keras
 import logging
+import numpy as np
 
 from core.patterns.pynode_logger import LogSocketHandler
 from core.manager import Manager
+from core.patterns.exceptions import ModelInconsistencyError, DataInconsistencyError
+from core.processor.readers import check_json_head, Hdf5Reader
+from core.processor.sparse import CsrMatrix
+from core.processor.dedup import unique_rows
+from core.processor.model_cache import ModelCache
+from core.processor.batch_tuner import BatchTuner
+from core.processor.parallel_predictor import ParallelPredictor, scaling
+from core.processor.numpy_executor import NumpyExecutor
+from core.processor.quantization import quantize, accuracy_delta, weights_bytes
+from core.processor.checkpoint import EpochCheckpoint
+from core.processor.progress import ProgressMonitor
+from core.processor.model_store import ModelStore
 from .dataset import Dataset
 from keras.models import model_from_json
 
 
+class MinibatchSequence(keras.utils.Sequence):
+    """
+    Keras sequence of rows range [start:end] of data by minibatches,
+    sparse data is densified for one minibatch at a time
+    """
+
+    def __init__(self, x, y=None, batch_size: int = 32, start: int = 0, end: int = None):
+        self.x = x
+        self.y = y
+        self.batch_size = batch_size
+        self.start = start
+        self.end = x.shape[0] if end is None else end
+
+    def __len__(self):
+        return int(math.ceil((self.end - self.start) / self.batch_size))
+
+    def __getitem__(self, index: int):
+        first = self.start + index * self.batch_size
+        last = min(first + self.batch_size, self.end)
+        if self.y is None:
+            return self.x[first:last]
+        return self.x[first:last], self.y[first:last]
+
+
 class Kernel:
 
     def __init__(self, kernel_file, ipfs_api):
@@ -20,6 +61,20 @@ class Kernel:
         self.model_address = None
         self.weights_address = None
         self.model = None
+        # weights are loaded and model is ready for prediction (model is taken from cache)
+        self.model_ready = False
+        # pool of parallel prediction processes, kept for all batches of job
+        self.parallel_predictor = None
+        # model source (memory, disk or ipfs files), architecture json and loading start time for load report
+        self.model_source = None
+        self.json_model = None
+        self.load_start = None
+        self.input_shape = None
+        self.input_dtype = None
+        # rows counts of predicted data for deduplication report
+        self.dedup_stats = {'rows': 0, 'unique_rows': 0}
+        # progress of job prediction, recorded by predicted minibatches
+        self.progress = None
 
     def init_kernel(self):
         # get main kernel params
@@ -51,10 +106,10 @@ class Kernel:
 
         try:
             self.logger.info("Downloading model file %s", self.model_address)
-            self.ipfs_api.download_file(self.model_address)
+            self.ipfs_api.download_file(self.model_address, validator=self.check_model_head)
             if self.weights_address:
                 self.logger.info("Downloading weights file %s", self.weights_address)
-                self.ipfs_api.download_file(self.weights_address)
+                self.ipfs_api.download_file(self.weights_address, validator=self.check_weights_head)
             else:
                 self.logger.info("Weights address is empty, skip downloading")
         except Exception as ex:
@@ -64,13 +119,52 @@ class Kernel:
 
         return True
 
-    def read_model(self) -> str:
+    @staticmethod
+    def check_model_head(head: bytes):
+        # model architecture is json object
+        try:
+            check_json_head(head)
+        except DataInconsistencyError as ex:
+            raise ModelInconsistencyError(*ex.args)
+
+    def check_weights_head(self, head: bytes):
+        # keras weights are stored in hdf5 file, model and weights may be stored in one file
+        if self.weights_address == self.model_address:
+            return
+        try:
+            Hdf5Reader().check_head(head)
+        except DataInconsistencyError as ex:
+            raise ModelInconsistencyError(*ex.args)
+
+    def cache_key(self) -> tuple:
+        # prediction models are not compiled, so architecture and weights define model
+        return self.model_address, self.weights_address
+
+    def read_model(self, dataset: Dataset = None) -> str:
         if self.model is not None:
             return self.model
+        self.load_start = time.time()
+        # ready to run prediction model may be taken from cache, trained models are not cached
+        if dataset is not None and dataset.process == 'predict':
+            self.model = ModelCache.get_instance().get(self.cache_key())
+            if self.model is not None:
+                self.logger.info('Kernel model is taken from cache')
+                self.model_source = 'memory'
+                self.model_ready = True
+                return self.model
+            self.model = self.read_stored_model()
+            if self.model is not None:
+                return self.model
         self.logger.info('Loading kernel architecture...')
+        self.model_source = 'ipfs'
         with open(self.model_address, "r") as json_file:
             json_model = json_file.read()
+        self.json_model = json_model
 
+        if dataset is not None and dataset.process == 'predict' and self.manager.processor_backend == 'numpy':
+            self.model = self.read_numpy_model(json_model)
+            if self.model is not None:
+                return self.model
         try:
             self.model = keras.models.model_from_json(json_model)
         except Exception as ex:
@@ -79,31 +173,308 @@ class Kernel:
             return None
         return self.model
 
+    def stored(self) -> bool:
+        # models with separate weights file are stored on disk, weights are loaded from store without hdf5 parsing
+        return bool(self.weights_address) and self.weights_address != self.model_address
+
+    def read_stored_model(self):
+        if not self.stored():
+            return None
+        json_model, weights = ModelStore.get_instance().load(self.cache_key())
+        if json_model is None:
+            return None
+        try:
+            model = None
+            if self.manager.processor_backend == 'numpy':
+                model = self.read_numpy_model(json_model, weights)
+            if model is None:
+                model = keras.models.model_from_json(json_model)
+                model.set_weights(weights)
+        except Exception as ex:
+            self.logger.error('Error reading stored kernel model: %s', type(ex))
+            self.logger.error(ex.args)
+            return None
+        self.logger.info('Kernel model is loaded from disk store')
+        self.model_source = 'disk'
+        self.json_model = json_model
+        return model
+
+    def read_numpy_model(self, json_model: str, weights: list = None):
+        # simple sequential models with weights are executed by numpy, keras is used for other models
+        if not self.weights_address or self.weights_address == self.model_address:
+            return None
+        try:
+            model = NumpyExecutor(json.loads(json_model))
+            if weights is None:
+                model.load_weights(self.weights_address)
+            else:
+                model.set_weights(weights)
+        except (ModelInconsistencyError, KeyError, ValueError) as ex:
+            self.logger.info('Kernel model is executed by keras: %s', str(ex.args))
+            return None
+        self.logger.info('Kernel model is executed by numpy')
+        return model
+
+    def read_input_layer(self) -> tuple:
+        # obtain model input shape and type from architecture json without model building
+        if self.input_shape is not None:
+            return self.input_shape, self.input_dtype
+        self.logger.info('Reading kernel input layer...')
+        with open(self.model_address, "r") as json_file:
+            json_model = json.load(json_file)
+
+        config = json_model['config']
+        # keras 2.0 Sequential model stores layers list directly in config
+        layers = config if isinstance(config, list) else config['layers']
+        input_layer = layers[0]
+        if isinstance(config, dict) and 'input_layers' in config:
+            # functional model, take first declared input
+            input_name = config['input_layers'][0][0]
+            input_layer = next(layer for layer in layers if layer['config']['name'] == input_name)
+
+        layer_config = input_layer['config']
+        if 'batch_input_shape' in layer_config:
+            self.input_shape = tuple(layer_config['batch_input_shape'])
+        elif 'input_dim' in layer_config:
+            self.input_shape = (None, layer_config['input_dim'])
+        else:
+            raise ModelInconsistencyError('Unable to determinate model input shape')
+        self.input_dtype = layer_config.get('dtype', 'float32')
+        return self.input_shape, self.input_dtype
+
+    def prepare_model(self, dataset: Dataset):
+        # load weights for prediction, ready model is cached
+        # model is not compiled, optimizer and training functions are not necessary for forward pass
+        if self.model_ready:
+            self.report_load()
+            return
+        # weights of numpy executed and stored models are loaded with architecture
+        if self.model_source != 'disk':
+            if self.weights_address and not isinstance(self.model, NumpyExecutor):
+                if self.weights_address != self.model_address:
+                    self.model.load_weights(self.weights_address)
+            if self.model_source == 'ipfs' and self.stored():
+                ModelStore.get_instance().put(self.cache_key(), self.json_model, self.model.get_weights())
+        self.model_ready = True
+        ModelCache.get_instance().put(self.cache_key(), self.model)
+        self.report_load()
+
+    def report_load(self):
+        # time from model loading start to model ready for prediction
+        if self.load_start is None:
+            return
+        load_time = time.time() - self.load_start
+        self.logger.info('Kernel model is ready in %g sec, source : %s', load_time, self.model_source)
+        ModelStore.get_instance().report(self.model_source, load_time)
+        self.load_start = None
+
+    def quantize_model(self, dataset: Dataset):
+        # quantized model is used if its outputs on first rows of job are close to full precision outputs,
+        # these rows only check accuracy, scales of weights do not depend on data
+        mode = self.manager.processor_quantization
+        if mode == 'none' or not dataset.datasets:
+            return
+        if not isinstance(self.model, NumpyExecutor):
+            self.logger.info('Quantization is supported for numpy executed models only')
+            return
+        sample = np.asarray(dataset.datasets[0][:self.manager.processor_quantization_check_rows])
+        quantized = quantize(self.model, mode)
+        delta = accuracy_delta(self.model, quantized, sample, batch_size=BatchTuner.min_size)
+        accepted = delta <= self.manager.processor_quantization_tolerance
+        self.logger.info('Quantization %s, check rows : %d, accuracy delta : %g, accepted : %s',
+                         mode, sample.shape[0], delta, str(accepted))
+        # parallel prediction processes load keras model from files, so quantized model is run serially
+        parallel_disabled = accepted and self.manager.processor_predict_workers > 1
+        if parallel_disabled:
+            self.logger.info('Parallel prediction is disabled for quantized model')
+        self.manager.set_job_metrics('quantization', {'mode': mode,
+                                                      'check_rows': sample.shape[0],
+                                                      'delta': delta,
+                                                      'accepted': accepted,
+                                                      'parallel_disabled': parallel_disabled,
+                                                      'weights_bytes': weights_bytes(self.model),
+                                                      'quantized_bytes': weights_bytes(quantized)})
+        if accepted:
+            self.model = quantized
+
     def inference_prediction(self, dataset: Dataset):
         self.logger.info('Running prediction model inference...')
-        self.model.compile(loss=dataset.loss,
-                           optimizer=dataset.optimizer)
-        # check and load weights after model compile
-        if self.weights_address:
-            if self.weights_address != self.model_address:
-                self.model.load_weights(self.weights_address)
-        result = self.model.predict(dataset.dataset, batch_size=100)  # may be take from price ? (100 for test)
+        self.prepare_model(dataset)
+        self.quantize_model(dataset)
+        # all job batches are processed by one model load
+        batch_size = self.predict_batch_size(dataset)
+        # keras 2.0 prediction has no callbacks, so data is predicted and progress is recorded by minibatches
+        steps = sum(int(math.ceil(data.shape[0] / batch_size)) for data in dataset.datasets)
+        self.progress = ProgressMonitor('prediction_progress', steps=steps, batch_size=batch_size,
+                                        interval=self.manager.processor_progress_interval)
+        result = []
+        try:
+            for data in dataset.datasets:
+                result.append(self.predict(data, batch_size=batch_size))
+        finally:
+            # parallel prediction processes are kept for job batches only
+            self.close_parallel_predictor()
+            self.progress.report(force=True)
+            self.progress = None
+        if self.dedup_stats['rows']:
+            self.dedup_stats['ratio'] = 1. - self.dedup_stats['unique_rows'] / self.dedup_stats['rows']
+            self.logger.info('Rows deduplication : %d of %d rows are unique',
+                             self.dedup_stats['unique_rows'], self.dedup_stats['rows'])
+            self.manager.set_job_metrics('dedup', dict(self.dedup_stats))
         # tensorflow bug https://github.com/tensorflow/tensorflow/issues/14356
-        keras.backend.clear_session()
+        # session is kept while prediction models are cached
+        if not ModelCache.get_instance().enabled:
+            keras.backend.clear_session()
         return result
 
+    def clear_training_session(self):
+        # trained model is not cached, so training graph is cleared after its weights are saved;
+        # cached prediction models are built in the same graph, so they are released too
+        keras.backend.clear_session()
+        ModelCache.get_instance().clear()
+        self.model = None
+
+    def check_compile_options(self, dataset: Dataset):
+        # loss and optimizer are necessary for training only
+        for name, value, getter in (('loss', dataset.loss, keras.losses.get),
+                                    ('optimizer', dataset.optimizer, keras.optimizers.get)):
+            if not value:
+                raise ModelInconsistencyError('Training %s is not declared' % name)
+            try:
+                getter(value)
+            except Exception as ex:
+                raise ModelInconsistencyError('Unknown training %s : %s' % (name, str(value)), *ex.args)
+
     def inference_training(self, dataset: Dataset):
         self.logger.info('Running training model inference...')
+        self.check_compile_options(dataset)
         self.model.compile(loss=dataset.loss,
                            optimizer=dataset.optimizer)
-        self.model.fit(dataset.train_x_dataset,
-                       dataset.train_y_dataset,
-                       batch_size=dataset.batch_size,
-                       epochs=dataset.epochs,
-                       validation_split=dataset.validation_split,
-                       shuffle=dataset.shuffle,
-                       initial_epoch=dataset.initial_epoch)
+        # training samples are rows before validation split as keras splits them
+        samples = int(dataset.train_x_dataset.shape[0] * (1. - dataset.validation_split))
+        batch_size = dataset.batch_size or 32
+        callbacks = [ProgressMonitor('training_progress', epochs=dataset.epochs,
+                                     steps=int(math.ceil(samples / batch_size)), batch_size=batch_size,
+                                     samples=samples, interval=self.manager.processor_progress_interval)]
+        initial_epoch = dataset.initial_epoch
+        if self.manager.processor_checkpoint_interval > 0:
+            checkpoint = EpochCheckpoint(EpochCheckpoint.job_file(), epochs=dataset.epochs,
+                                         interval=self.manager.processor_checkpoint_interval)
+            # job repeated after node restart continues from last saved epoch
+            model, epoch = checkpoint.restore()
+            if model is not None and epoch > initial_epoch:
+                self.model = model
+                initial_epoch = epoch
+            callbacks.append(checkpoint)
+        if isinstance(dataset.train_x_dataset, CsrMatrix) or isinstance(dataset.train_y_dataset, CsrMatrix):
+            self.fit_sparse(dataset, initial_epoch, callbacks)
+        else:
+            self.model.fit(dataset.train_x_dataset,
+                           dataset.train_y_dataset,
+                           batch_size=dataset.batch_size,
+                           epochs=dataset.epochs,
+                           validation_split=dataset.validation_split,
+                           shuffle=dataset.shuffle,
+                           initial_epoch=initial_epoch,
+                           callbacks=callbacks)
         # return model weights after model training
         return self.model
 
+    def predict_batch_size(self, dataset: Dataset) -> int:
+        # batch size declared by dataset options has priority over node settings
+        if dataset.predict_batch_size:
+            return int(dataset.predict_batch_size)
+        if self.manager.processor_predict_batch_size != 'auto':
+            return int(self.manager.processor_predict_batch_size)
+        # tuning is performed by largest batch of job
+        data = max(dataset.datasets, key=lambda batch: batch.shape[0])
+        if data.shape[0] == 0:
+            return BatchTuner.min_size
+        return BatchTuner(memory_limit=self.manager.processor_batch_memory_limit).tune(self.model, data,
+                                                                                       self.model_address)
+
+    def predict(self, data, batch_size: int):
+        if isinstance(data, CsrMatrix):
+            self.logger.info('Sparse data prediction, density : %g', data.density)
+            return self.predict_sequence(MinibatchSequence(data, batch_size=batch_size))
+        if self.manager.processor_dedup_rows:
+            return self.predict_unique(data, batch_size)
+        return self.forward(data, batch_size)
+
+    def predict_unique(self, data, batch_size: int):
+        # model is run on unique rows only, results are scattered back to all rows
+        if isinstance(self.model.output_shape, list):
+            self.logger.info('Rows deduplication is not used for model with several outputs')
+            return self.forward(data, batch_size)
+        indices, inverse = unique_rows(data)
+        self.dedup_stats['rows'] += data.shape[0]
+        self.dedup_stats['unique_rows'] += indices.shape[0]
+        if indices.shape[0] == data.shape[0]:
+            return self.forward(data, batch_size)
+        if self.progress is not None:
+            # duplicate rows are not predicted, so job has less minibatches
+            self.progress.steps -= int(math.ceil(data.shape[0] / batch_size)) - \
+                int(math.ceil(indices.shape[0] / batch_size))
+        return self.forward(data[indices], batch_size)[inverse]
+
+    def forward(self, data, batch_size: int):
+        # large data is predicted by shards in several processes, models with several outputs are not sharded
+        workers = min(self.manager.processor_predict_workers, os.cpu_count() or 1)
+        if workers > 1 and data.shape[0] >= self.manager.processor_parallel_min_rows \
+                and not isinstance(self.model.output_shape, list):
+            # workers load keras model from files, numpy executed and quantized models are predicted serially
+            if isinstance(self.model, NumpyExecutor):
+                self.logger.info('Parallel prediction is not used for numpy executed model')
+                return self.predict_sequence(MinibatchSequence(data, batch_size=batch_size))
+            if self.parallel_predictor is None:
+                self.parallel_predictor = ParallelPredictor(self.model_address, self.weights_address, workers)
+            result = self.parallel_predictor.predict(self.model, data, batch_size,
+                                                     progress=lambda rows: self.step_progress(rows, batch_size))
+            self.manager.set_job_metrics('parallel_predict', {str(count): dict(report)
+                                                              for count, report in scaling.items()})
+            return result
+        return self.predict_sequence(MinibatchSequence(data, batch_size=batch_size))
+
+    def predict_sequence(self, sequence: MinibatchSequence):
+        # minibatches are predicted one by one, so progress of large batch is recorded during prediction
+        if not len(sequence):
+            return self.model.predict(sequence.x, batch_size=sequence.batch_size)
+        outputs = []
+        for index in range(len(sequence)):
+            block = sequence[index]
+            outputs.append(self.model.predict_on_batch(block))
+            self.step_progress(block.shape[0], sequence.batch_size)
+        if isinstance(outputs[0], list):
+            return [np.concatenate(output) for output in zip(*outputs)]
+        return np.concatenate(outputs)
+
+    def step_progress(self, rows: int, batch_size: int):
+        if self.progress is not None:
+            self.progress.step(rows, steps=int(math.ceil(rows / batch_size)))
+
+    def close_parallel_predictor(self):
+        if self.parallel_predictor is not None:
+            self.parallel_predictor.close()
+            self.parallel_predictor = None
+
+    def fit_sparse(self, dataset: Dataset, initial_epoch: int = 0, callbacks: list = None):
+        self.logger.info('Sparse data training by minibatches')
+        rows = dataset.train_x_dataset.shape[0]
+        # last rows are used for validation as keras validation_split does
+        split_at = int(rows * (1. - dataset.validation_split))
+        train = MinibatchSequence(dataset.train_x_dataset, dataset.train_y_dataset,
+                                  batch_size=dataset.batch_size, end=split_at)
+        validation = None
+        if split_at < rows:
+            validation = MinibatchSequence(dataset.train_x_dataset, dataset.train_y_dataset,
+                                           batch_size=dataset.batch_size, start=split_at)
+        self.model.fit_generator(train,
+                                 steps_per_epoch=len(train),
+                                 epochs=dataset.epochs,
+                                 validation_data=validation,
+                                 validation_steps=len(validation) if validation else None,
+                                 shuffle=dataset.shuffle,
+                                 initial_epoch=initial_epoch,
+                                 callbacks=callbacks)
+
 
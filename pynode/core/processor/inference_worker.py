@@ -0,0 +1,217 @@
+import os
+import time
+import logging
+import resource
+import multiprocessing
+import numpy as np
+
+from core.manager import Manager
+from core.patterns.pynode_logger import LogSocketHandler
+from core.patterns.exceptions import ModelInconsistencyError
+
+
+def process_memory() -> int:
+    # resident memory of current process in bytes
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # max resident memory in kilobytes on linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def make_entities(params: dict) -> tuple:
+    # kernel and dataset of worker process are created from plain parameters, files are already downloaded
+    from core.processor.entities.kernel import Kernel
+    from core.processor.entities.dataset import Dataset
+    kernel = Kernel(kernel_file={}, ipfs_api=None)
+    kernel.model_address = params['model']
+    kernel.weights_address = params['weights']
+    dataset = Dataset(dataset_file={}, ipfs_api=None, batch_no=params['batches_no'])
+    dataset.process = 'predict'
+    # batch size declared by dataset options has priority over batch tuning of worker
+    dataset.predict_batch_size = params['predict_batch_size']
+    return kernel, dataset
+
+
+def load_model(kernel, dataset) -> float:
+    # returns warm up time of newly loaded model, 0 for cached model
+    if kernel.read_model(dataset) is None:
+        raise ModelInconsistencyError('Error reading kernel model')
+    if kernel.model_ready:
+        return 0.0
+    kernel.prepare_model(dataset)
+    input_shape = kernel.model.input_shape
+    if not isinstance(input_shape, tuple) or None in input_shape[1:]:
+        return 0.0
+    # first predict call builds prediction function, so it is done before job data
+    start = time.time()
+    kernel.model.predict(np.zeros((1,) + tuple(input_shape[1:])), batch_size=1)
+    return time.time() - start
+
+
+def time_twice(run) -> tuple:
+    # first run includes functions building, second run is steady state time
+    start = time.time()
+    run()
+    middle = time.time()
+    run()
+    return middle - start, time.time() - middle
+
+
+def serve(connection, settings: dict):
+    # worker process loop, backend and cached models are kept between requests
+    manager = Manager.get_instance()
+    for name, value in settings.items():
+        setattr(manager, name, value)
+    # models are kept warm by models cache of worker process
+    manager.processor_model_cache_size = max(1, manager.processor_model_cache_size)
+    # daemon process can not start processes for parallel prediction
+    manager.processor_predict_workers = 1
+    logger = logging.getLogger("InferenceWorkerProcess")
+    logger.addHandler(LogSocketHandler.get_instance())
+    logger.info('Inference worker process started, pid : %d', os.getpid())
+
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+        if request['command'] == 'stop':
+            break
+        manager.job_metrics = {}
+        try:
+            kernel, dataset = make_entities(request)
+            reply = {'status': 'ok', 'warmup_time': load_model(kernel, dataset)}
+            if request['command'] == 'predict':
+                dataset.datasets = request['datasets']
+                reply['result'] = kernel.inference_prediction(dataset)
+            elif request['command'] == 'probe':
+                block = request['block']
+                outputs = []
+                reply['build_time'], reply['run_time'] = time_twice(
+                    lambda: outputs.append(kernel.model.predict_on_batch(block)))
+                reply['output'] = outputs[-1]
+        except Exception as ex:
+            logger.error("Inference worker request failed: %s", type(ex))
+            logger.error(ex.args)
+            reply = {'status': 'error', 'error': str(type(ex)), 'args': [str(arg) for arg in ex.args]}
+        reply['memory'] = process_memory()
+        reply['metrics'] = manager.job_metrics
+        connection.send(reply)
+    connection.close()
+
+
+class InferenceWorker:
+    """
+    InferenceWorker is long lived computing process keeping backend runtime and compiled
+    models warm between jobs, pynode talks to it by local pipe.
+    Process is recycled after configured count of jobs or on memory threshold.
+    """
+
+    __instance = None
+
+    def __init__(self, max_jobs: int = 100, max_memory: int = 4096):
+        if InferenceWorker.__instance is not None:
+            raise Exception("This class is a singleton!")
+        else:
+            InferenceWorker.__instance = self
+        # Initializing logger object
+        self.logger = logging.getLogger("InferenceWorker")
+        self.logger.addHandler(LogSocketHandler.get_instance())
+        self.manager = Manager.get_instance()
+
+        self.max_jobs = max_jobs
+        # memory threshold in megabytes
+        self.max_memory = max_memory * 1024 * 1024
+        self.process = None
+        self.connection = None
+        self.jobs = 0
+        self.recycles = 0
+
+    @staticmethod
+    def get_instance():
+        """ Static access method. """
+        if InferenceWorker.__instance is None:
+            manager = Manager.get_instance()
+            InferenceWorker(max_jobs=manager.processor_worker_max_jobs,
+                            max_memory=manager.processor_worker_max_memory)
+        return InferenceWorker.__instance
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self):
+        # spawned process does not inherit backend state of pynode process
+        context = multiprocessing.get_context('spawn')
+        self.connection, worker_connection = context.Pipe()
+        settings = {name: getattr(self.manager, name) for name in dir(self.manager) if name.startswith('processor_')}
+        self.process = context.Process(target=serve, args=(worker_connection, settings),
+                                       name='InferenceWorker', daemon=True)
+        self.process.start()
+        worker_connection.close()
+        self.jobs = 0
+        self.logger.info('Inference worker started, pid : %d', self.process.pid)
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            self.connection.send({'command': 'stop'})
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=10)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.connection.close()
+        self.process = None
+        self.connection = None
+
+    def request(self, command: str, kernel, dataset, **params) -> dict:
+        if not self.alive:
+            self.start()
+        start = time.time()
+        try:
+            self.connection.send(dict(params,
+                                      command=command,
+                                      model=os.path.abspath(kernel.model_address),
+                                      weights=os.path.abspath(kernel.weights_address)
+                                      if kernel.weights_address else kernel.weights_address,
+                                      batches_no=dataset.batches_no,
+                                      predict_batch_size=dataset.predict_batch_size))
+            reply = self.connection.recv()
+        except (EOFError, OSError) as ex:
+            # worker process is died, new one is started for next request
+            self.stop()
+            raise ModelInconsistencyError('Inference worker process failure', *ex.args)
+        for name, metrics in reply['metrics'].items():
+            self.manager.set_job_metrics(name, metrics)
+        self.logger.info('Inference worker %s time : %s, warm up time : %s, memory : %d',
+                         command, str(time.time() - start), str(reply.get('warmup_time', 0)), reply['memory'])
+        if reply['status'] != 'ok':
+            raise ModelInconsistencyError(reply['error'], *reply['args'])
+        return reply
+
+    def load(self, kernel, dataset):
+        # model is loaded, compiled and warmed up in worker process before computing
+        self.request('load', kernel, dataset)
+
+    def probe(self, kernel, dataset, block) -> tuple:
+        # dry run of model on few rows in worker process, returns build and run times and output
+        reply = self.request('probe', kernel, dataset, block=block)
+        return reply['build_time'], reply['run_time'], reply['output']
+
+    def predict(self, kernel, dataset) -> list:
+        reply = self.request('predict', kernel, dataset, datasets=dataset.datasets)
+        self.jobs += 1
+        self.recycle(reply['memory'])
+        return reply['result']
+
+    def recycle(self, memory: int):
+        if self.jobs < self.max_jobs and memory < self.max_memory:
+            return
+        self.logger.info('Recycling inference worker, jobs : %d, memory : %d', self.jobs, memory)
+        self.stop()
+        self.recycles += 1
+        self.manager.set_job_metrics('inference_worker', {'recycles': self.recycles})
@@ -0,0 +1,94 @@
+import logging
+
+from collections import OrderedDict
+from threading import Lock
+from core.manager import Manager
+from core.patterns.pynode_logger import LogSocketHandler
+
+
+class ModelCache:
+    """
+    ModelCache is global LRU cache of prediction models with loaded weights
+    keyed by (model address, weights address),
+    models are evicted by entries count and by memory of models weights.
+    """
+
+    __instance = None
+
+    def __init__(self, size: int = 4, memory: int = 1024):
+        if ModelCache.__instance is not None:
+            raise Exception("This class is a singleton!")
+        else:
+            ModelCache.__instance = self
+        # Initializing logger object
+        self.logger = logging.getLogger("ModelCache")
+        self.logger.addHandler(LogSocketHandler.get_instance())
+
+        # max entries count (0 = cache is disabled) and max memory of models in megabytes
+        self.size = size
+        self.memory = memory * 1024 * 1024
+        self.models = OrderedDict()
+        self.models_bytes = {}
+        # keys of models ever cached, for misses breakdown
+        self.known_keys = set()
+        self.stats = {'hits': 0, 'misses': 0, 'cold_misses': 0, 'evicted_misses': 0, 'evictions': 0}
+        self.lock = Lock()
+
+    @staticmethod
+    def get_instance():
+        """ Static access method. """
+        if ModelCache.__instance is None:
+            manager = Manager.get_instance()
+            ModelCache(size=manager.processor_model_cache_size, memory=manager.processor_model_cache_memory)
+        return ModelCache.__instance
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    @property
+    def used_bytes(self) -> int:
+        return sum(self.models_bytes.values())
+
+    def get(self, key: tuple):
+        with self.lock:
+            model = self.models.get(key)
+            if model is None:
+                self.stats['misses'] += 1
+                self.stats['evicted_misses' if key in self.known_keys else 'cold_misses'] += 1
+            else:
+                self.stats['hits'] += 1
+                self.models.move_to_end(key)
+            self.report()
+            return model
+
+    def put(self, key: tuple, model):
+        if not self.enabled:
+            return
+        # memory of weights values, float32 is keras default
+        model_bytes = model.count_params() * 4
+        if model_bytes > self.memory:
+            self.logger.info('Model %s size %d exceeds cache memory, not cached', str(key), model_bytes)
+            return
+        with self.lock:
+            self.models[key] = model
+            self.models_bytes[key] = model_bytes
+            self.known_keys.add(key)
+            self.models.move_to_end(key)
+            # least recently used models are evicted
+            while len(self.models) > self.size or self.used_bytes > self.memory:
+                evicted, _ = self.models.popitem(last=False)
+                del self.models_bytes[evicted]
+                self.stats['evictions'] += 1
+                self.logger.info('Model %s evicted from cache', str(evicted))
+            self.report()
+
+    def clear(self):
+        with self.lock:
+            self.models.clear()
+            self.models_bytes.clear()
+
+    def report(self):
+        Manager.get_instance().set_job_metrics('model_cache', dict(self.stats,
+                                                                   models=len(self.models),
+                                                                   used_bytes=self.used_bytes))
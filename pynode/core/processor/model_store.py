@@ -0,0 +1,137 @@
+import os
+import json
+import struct
+import hashlib
+import logging
+import numpy as np
+
+from threading import Lock
+from core.manager import Manager
+from core.patterns.pynode_logger import LogSocketHandler
+
+
+class ModelStore:
+    """
+    ModelStore is persistent disk cache of prediction models keyed by (model address, weights address).
+    Each model is stored as single file with architecture json and raw weights arrays,
+    weights are memory mapped on loading, so hdf5 weights file is not parsed after node restart.
+    Least recently used models are evicted by store size.
+    """
+
+    __instance = None
+
+    # file signature and alignment of weights arrays in file
+    magic = b'PYNODEMS'
+    alignment = 64
+
+    def __init__(self, directory: str = '', size: int = 4096):
+        if ModelStore.__instance is not None:
+            raise Exception("This class is a singleton!")
+        else:
+            ModelStore.__instance = self
+        # Initializing logger object
+        self.logger = logging.getLogger("ModelStore")
+        self.logger.addHandler(LogSocketHandler.get_instance())
+
+        # store is disabled if directory is empty or size is 0, size in megabytes
+        self.directory = directory
+        self.size = size * 1024 * 1024
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+        self.lock = Lock()
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def get_instance():
+        """ Static access method. """
+        if ModelStore.__instance is None:
+            manager = Manager.get_instance()
+            ModelStore(directory=manager.processor_model_store_dir, size=manager.processor_model_store_size)
+        return ModelStore.__instance
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and self.size > 0
+
+    def model_file(self, key: tuple) -> str:
+        # ipfs addresses are used without local paths, so inference worker absolute paths have same key
+        name = ':'.join(os.path.basename(str(address)) for address in key)
+        return os.path.join(self.directory, hashlib.sha256(name.encode('utf8')).hexdigest() + '.model')
+
+    def load(self, key: tuple):
+        # returns architecture json and memory mapped weights list, or (None, None) if model is not stored
+        if not self.enabled:
+            return None, None
+        file = self.model_file(key)
+        try:
+            with open(file, 'rb') as model_file:
+                if model_file.read(len(self.magic)) != self.magic:
+                    raise ValueError('Wrong model file signature')
+                header_size, = struct.unpack('<Q', model_file.read(8))
+                header = json.loads(model_file.read(header_size).decode('utf8'))
+            data = np.memmap(file, dtype=np.uint8, mode='r')
+            weights = [np.ndarray(shape=tuple(shape), dtype=np.dtype(dtype), buffer=data, offset=offset)
+                       for dtype, shape, offset in header['weights']]
+        except (OSError, ValueError, KeyError) as ex:
+            with self.lock:
+                self.stats['misses'] += 1
+            if os.path.isfile(file):
+                self.logger.info('Stored model %s is not readable : %s', str(key), str(ex.args))
+            return None, None
+        with self.lock:
+            self.stats['hits'] += 1
+        # modification time is last use time for eviction
+        os.utime(file)
+        return header['architecture'], weights
+
+    def put(self, key: tuple, architecture: str, weights: list):
+        if not self.enabled:
+            return
+        weights = [np.ascontiguousarray(array) for array in weights]
+        offsets = []
+        # offsets are counted after header, header size depends on offsets digits, so it is padded
+        entries = [[array.dtype.str, list(array.shape), 0] for array in weights]
+        header_size = len(json.dumps({'architecture': architecture, 'weights': entries})) + 32 * len(weights) + 64
+        offset = self.align(len(self.magic) + 8 + header_size)
+        for array in weights:
+            offsets.append(offset)
+            offset = self.align(offset + array.nbytes)
+        for entry, array_offset in zip(entries, offsets):
+            entry[2] = array_offset
+        header = json.dumps({'architecture': architecture, 'weights': entries}).encode('utf8')
+        header = header.ljust(header_size)
+
+        file = self.model_file(key)
+        temp_file = file + '.tmp'
+        with self.lock:
+            with open(temp_file, 'wb') as model_file:
+                model_file.write(self.magic)
+                model_file.write(struct.pack('<Q', header_size))
+                model_file.write(header)
+                for array, array_offset in zip(weights, offsets):
+                    model_file.seek(array_offset)
+                    model_file.write(array.tobytes())
+                # file is extended to end of last aligned array, empty arrays may be last
+                model_file.truncate(offset)
+            os.replace(temp_file, file)
+            self.stats['writes'] += 1
+            self.evict()
+
+    @classmethod
+    def align(cls, offset: int) -> int:
+        return (offset + cls.alignment - 1) // cls.alignment * cls.alignment
+
+    def evict(self):
+        files = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.model')]
+        files.sort(key=os.path.getmtime)
+        used = sum(os.path.getsize(file) for file in files)
+        # last written model is kept even if it exceeds store size
+        while used > self.size and len(files) > 1:
+            file = files.pop(0)
+            used -= os.path.getsize(file)
+            os.remove(file)
+            self.stats['evictions'] += 1
+            self.logger.info('Stored model %s evicted', os.path.basename(file))
+
+    def report(self, source: str, load_time: float):
+        Manager.get_instance().set_job_metrics('model_load', dict(self.stats, source=source, time=load_time))
@@ -0,0 +1,269 @@
+import h5py
+import numpy as np
+
+from core.patterns.exceptions import ModelInconsistencyError
+
+
+def softmax(block: np.ndarray) -> np.ndarray:
+    np.subtract(block, block.max(axis=-1, keepdims=True), out=block)
+    np.exp(block, out=block)
+    np.divide(block, block.sum(axis=-1, keepdims=True), out=block)
+    return block
+
+
+def elu(block: np.ndarray) -> np.ndarray:
+    negative = block < 0
+    block[negative] = np.expm1(block[negative])
+    return block
+
+
+def selu(block: np.ndarray) -> np.ndarray:
+    alpha, scale = 1.6732632423543772, 1.0507009873554805
+    negative = block < 0
+    block[negative] = alpha * np.expm1(block[negative])
+    np.multiply(block, scale, out=block)
+    return block
+
+
+def softplus(block: np.ndarray) -> np.ndarray:
+    # log(1 + exp(x)) without overflow for large x
+    np.logaddexp(block, 0, out=block)
+    return block
+
+
+def softsign(block: np.ndarray) -> np.ndarray:
+    np.divide(block, 1 + np.abs(block), out=block)
+    return block
+
+
+def sigmoid(block: np.ndarray) -> np.ndarray:
+    np.negative(block, out=block)
+    np.exp(block, out=block)
+    np.add(block, 1, out=block)
+    np.reciprocal(block, out=block)
+    return block
+
+
+# in place activations by keras names
+activations = {
+    'linear': lambda block: block,
+    'relu': lambda block: np.maximum(block, 0, out=block),
+    'sigmoid': sigmoid,
+    'tanh': lambda block: np.tanh(block, out=block),
+    'softmax': softmax,
+    'softplus': softplus,
+    'softsign': softsign,
+    'elu': elu,
+    'selu': selu
+}
+
+
+def get_activation(name) -> tuple:
+    if not isinstance(name, str) or name not in activations:
+        raise ModelInconsistencyError('Activation %s is not supported by numpy executor' % str(name))
+    return name, activations[name]
+
+
+class NumpyLayer:
+    # layer of numpy executor, output shape is without rows dimension
+
+    weights_count = 0
+
+    def __init__(self, config: dict, input_shape: tuple):
+        self.name = config['name']
+        self.input_shape = input_shape
+        self.output_shape = (None,) + self.output_dims(input_shape)
+
+    def output_dims(self, input_shape: tuple) -> tuple:
+        return tuple(input_shape)
+
+    def set_weights(self, weights: list):
+        if len(weights) != self.weights_count:
+            raise ModelInconsistencyError('Layer %s needs %d weights, got %d'
+                                          % (self.name, self.weights_count, len(weights)))
+
+    def get_weights(self) -> list:
+        return []
+
+    def count_params(self) -> int:
+        return 0
+
+    def forward(self, block: np.ndarray, buffer: np.ndarray) -> np.ndarray:
+        return block
+
+
+class Dense(NumpyLayer):
+
+    def __init__(self, config: dict, input_shape: tuple):
+        # units are named output_dim in keras 1 configs
+        self.units = int(config.get('units', config.get('output_dim')))
+        self.use_bias = config.get('use_bias', config.get('bias', True))
+        self.weights_count = 2 if self.use_bias else 1
+        self.activation_name, self.activation = get_activation(config.get('activation', 'linear'))
+        self.kernel = None
+        self.bias = None
+        super().__init__(config, input_shape)
+
+    def output_dims(self, input_shape: tuple) -> tuple:
+        return tuple(input_shape[:-1]) + (self.units,)
+
+    def set_weights(self, weights: list):
+        super().set_weights(weights)
+        self.kernel = np.ascontiguousarray(weights[0], dtype=np.float32)
+        if self.kernel.shape != (self.input_shape[-1], self.units):
+            raise ModelInconsistencyError('Layer %s kernel shape %s does not match architecture'
+                                          % (self.name, str(self.kernel.shape)))
+        self.bias = np.asarray(weights[1], dtype=np.float32) if self.use_bias else None
+
+    def get_weights(self) -> list:
+        return [self.kernel, self.bias] if self.use_bias else [self.kernel]
+
+    def count_params(self) -> int:
+        return self.kernel.size + (self.bias.size if self.bias is not None else 0)
+
+    def forward(self, block: np.ndarray, buffer: np.ndarray) -> np.ndarray:
+        np.dot(block, self.kernel, out=buffer)
+        if self.bias is not None:
+            np.add(buffer, self.bias, out=buffer)
+        return self.activation(buffer)
+
+
+class Activation(NumpyLayer):
+
+    def __init__(self, config: dict, input_shape: tuple):
+        self.activation_name, self.activation = get_activation(config['activation'])
+        super().__init__(config, input_shape)
+
+    def forward(self, block: np.ndarray, buffer: np.ndarray) -> np.ndarray:
+        np.copyto(buffer, block)
+        return self.activation(buffer)
+
+
+class Dropout(NumpyLayer):
+    # dropout is not active on prediction
+    pass
+
+
+class Flatten(NumpyLayer):
+
+    def output_dims(self, input_shape: tuple) -> tuple:
+        return int(np.prod(input_shape)),
+
+    def forward(self, block: np.ndarray, buffer: np.ndarray) -> np.ndarray:
+        return block.reshape((block.shape[0], -1))
+
+
+# supported layers by keras class names
+layers = {
+    'Dense': Dense,
+    'Activation': Activation,
+    'Dropout': Dropout,
+    'Flatten': Flatten
+}
+
+
+class NumpyExecutor:
+    """
+    NumpyExecutor runs prediction of simple Sequential kernels (Dense, Activation,
+    Dropout, Flatten layers) by numpy without backend graph or session building.
+    Activations buffers are allocated once for batch size.
+    Interface follows keras model methods used by kernel for prediction.
+    """
+
+    def __init__(self, model_config: dict):
+        if model_config.get('class_name') != 'Sequential':
+            raise ModelInconsistencyError('Only Sequential models are supported by numpy executor')
+        config = model_config['config']
+        # keras 2.0 Sequential model stores layers list directly in config
+        layers_config = config if isinstance(config, list) else config['layers']
+        if not layers_config:
+            raise ModelInconsistencyError('Model has no layers')
+        first = layers_config[0]['config']
+        if 'batch_input_shape' in first:
+            input_shape = tuple(first['batch_input_shape'][1:])
+        elif 'input_dim' in first:
+            input_shape = (first['input_dim'],)
+        else:
+            raise ModelInconsistencyError('Unable to determinate model input shape')
+        if None in input_shape:
+            raise ModelInconsistencyError('Variable input shape is not supported by numpy executor')
+        self.input_shape = (None,) + input_shape
+
+        self.layers = []
+        shape = input_shape
+        for layer_config in layers_config:
+            if layer_config['class_name'] == 'InputLayer':
+                continue
+            if layer_config['class_name'] not in layers:
+                raise ModelInconsistencyError('Layer %s is not supported by numpy executor'
+                                              % layer_config['class_name'])
+            layer = layers[layer_config['class_name']](layer_config['config'], shape)
+            self.layers.append(layer)
+            shape = layer.output_shape[1:]
+        self.output_shape = (None,) + tuple(shape)
+        self.buffers = []
+        self.buffers_rows = 0
+        self.weights_loaded = False
+
+    def load_weights(self, weights_address: str):
+        # keras hdf5 weights file, weights of full model file are stored in model_weights group
+        with h5py.File(weights_address, 'r') as h5f:
+            group = h5f['model_weights'] if 'model_weights' in h5f else h5f
+            for layer in self.layers:
+                if layer.weights_count == 0:
+                    continue
+                if layer.name not in group:
+                    raise ModelInconsistencyError('Weights of layer %s are not found' % layer.name)
+                layer_group = group[layer.name]
+                names = [name.decode('utf8') if isinstance(name, bytes) else name
+                         for name in layer_group.attrs['weight_names']]
+                layer.set_weights([layer_group[name][()] for name in names])
+        self.weights_loaded = True
+
+    def get_weights(self) -> list:
+        # weights are ordered as keras model weights list
+        return [array for layer in self.layers for array in layer.get_weights()]
+
+    def set_weights(self, weights: list):
+        # float32 contiguous arrays are used without copying, so memory mapped weights stay mapped
+        position = 0
+        for layer in self.layers:
+            layer.set_weights(weights[position:position + layer.weights_count])
+            position += layer.weights_count
+        if position != len(weights):
+            raise ModelInconsistencyError('Model needs %d weights, got %d' % (position, len(weights)))
+        self.weights_loaded = True
+
+    def count_params(self) -> int:
+        return sum(layer.count_params() for layer in self.layers)
+
+    def allocate(self, batch_size: int):
+        # buffers are reused for all batches, flatten and dropout layers need no buffer
+        if self.buffers_rows >= batch_size:
+            return
+        self.buffers = [None if isinstance(layer, (Flatten, Dropout)) else
+                        np.empty((batch_size,) + layer.output_shape[1:], dtype=np.float32)
+                        for layer in self.layers]
+        self.buffers_rows = batch_size
+
+    def forward(self, block) -> np.ndarray:
+        # returned array is view of last layer buffer, it is overwritten by next batch
+        if not self.weights_loaded:
+            raise ModelInconsistencyError('Model weights are not loaded')
+        rows = block.shape[0]
+        self.allocate(rows)
+        block = np.asarray(block, dtype=np.float32)
+        for layer, buffer in zip(self.layers, self.buffers):
+            block = layer.forward(block, buffer[:rows] if buffer is not None else None)
+        return block
+
+    def predict_on_batch(self, block) -> np.ndarray:
+        return self.forward(block).copy()
+
+    def predict(self, data, batch_size: int = 32) -> np.ndarray:
+        rows = data.shape[0]
+        result = np.empty((rows,) + self.output_shape[1:], dtype=np.float32)
+        for first in range(0, rows, batch_size):
+            block = data[first:first + batch_size]
+            result[first:first + block.shape[0]] = self.forward(block)
+        return result
@@ -0,0 +1,130 @@
+import os
+import time
+import shutil
+import logging
+import tempfile
+import multiprocessing
+import numpy as np
+
+from core.patterns.pynode_logger import LogSocketHandler
+
+logger = logging.getLogger("ParallelPredictor")
+logger.addHandler(LogSocketHandler.get_instance())
+
+# worker process state, initialized once per process of pool
+worker_state = {}
+# scaling measurements by workers count, kept for all jobs of node
+scaling = {}
+
+
+def split_shards(rows: int, parts: int, align: int = 1) -> list:
+    # contiguous rows shards of nearly equal size, all shards except last are multiples of align rows
+    chunks = int(np.ceil(rows / align))
+    bounds = np.minimum(np.linspace(0, chunks, parts + 1).astype(int) * align, rows)
+    return [(int(first), int(last)) for first, last in zip(bounds[:-1], bounds[1:]) if last > first]
+
+
+def init_worker(model_address: str, weights_address: str):
+    # model is loaded once per worker process, prediction model is not compiled
+    import keras
+    with open(model_address, 'r') as json_file:
+        model = keras.models.model_from_json(json_file.read())
+    if weights_address and weights_address != model_address:
+        model.load_weights(weights_address)
+    worker_state['model'] = model
+
+
+def predict_shard(task: tuple) -> int:
+    # input and output are memory mapped files, so pool is reused for data of any size
+    input_file, input_shape, output_file, output_shape, first, last, batch_size = task
+    data = np.memmap(input_file, dtype=np.float32, mode='r', shape=input_shape)
+    output = np.memmap(output_file, dtype=np.float32, mode='r+', shape=output_shape)
+    output[first:last] = worker_state['model'].predict(np.asarray(data[first:last]), batch_size=batch_size)
+    output.flush()
+    return last - first
+
+
+class ParallelPredictor:
+    """
+    ParallelPredictor predicts rows shards of data in pool of spawned processes,
+    pool and models of workers are kept for all batches of job.
+    Speedup is measured end to end (processes start, models loading and data copying
+    are included) against single process throughput of loaded model.
+    """
+
+    def __init__(self, model_address: str, weights_address: str, workers: int = 4):
+        self.model_address = os.path.abspath(model_address)
+        self.weights_address = os.path.abspath(weights_address) if weights_address else weights_address
+        self.workers = workers
+        self.pool = None
+        self.directory = None
+        self.serial_throughput = None
+        # rows and wall time of all parallel predictions of job
+        self.rows = 0
+        self.time = 0.0
+
+    def start(self):
+        # spawned processes do not inherit backend state of pynode process
+        context = multiprocessing.get_context('spawn')
+        self.pool = context.Pool(processes=self.workers,
+                                 initializer=init_worker,
+                                 initargs=(self.model_address, self.weights_address))
+        self.directory = tempfile.mkdtemp(prefix='pynode_predict_')
+
+    def measure_serial(self, model, data, batch_size: int):
+        # single process throughput is measured by loaded model on first rows
+        probe = np.asarray(data[:min(data.shape[0], batch_size * 4)], dtype=np.float32)
+        model.predict(probe[:1], batch_size=1)
+        start = time.time()
+        model.predict(probe, batch_size=batch_size)
+        self.serial_throughput = probe.shape[0] / max(time.time() - start, 1e-9)
+
+    def predict(self, model, data, batch_size: int, progress=None) -> np.ndarray:
+        # progress is called by rows count of each predicted shard
+        if self.serial_throughput is None:
+            self.measure_serial(model, data, batch_size)
+        start = time.time()
+        if self.pool is None:
+            self.start()
+        rows = data.shape[0]
+        input_shape = (rows,) + tuple(data.shape[1:])
+        output_shape = (rows,) + tuple(model.output_shape[1:])
+        input_file = os.path.join(self.directory, 'input')
+        output_file = os.path.join(self.directory, 'output')
+        input_data = np.memmap(input_file, dtype=np.float32, mode='w+', shape=input_shape)
+        input_data[:] = data
+        input_data.flush()
+        output_data = np.memmap(output_file, dtype=np.float32, mode='w+', shape=output_shape)
+        shards = split_shards(rows, self.workers, align=batch_size)
+        for shard_rows in self.pool.imap_unordered(predict_shard, [(input_file, input_shape, output_file, output_shape,
+                                                                    first, last, batch_size)
+                                                                   for first, last in shards]):
+            if progress is not None:
+                progress(shard_rows)
+        result = np.array(output_data)
+        del input_data, output_data
+        self.rows += rows
+        self.time += time.time() - start
+        self.report()
+        return result
+
+    def report(self):
+        parallel_throughput = self.rows / max(self.time, 1e-9)
+        speedup = parallel_throughput / self.serial_throughput
+        scaling[self.workers] = {'rows': self.rows,
+                                 'serial_throughput': self.serial_throughput,
+                                 'parallel_throughput': parallel_throughput,
+                                 'speedup': speedup,
+                                 'efficiency': speedup / self.workers}
+        logger.info('Parallel prediction by %d workers, rows : %d, speedup : %g, efficiency : %g',
+                    self.workers, self.rows, speedup, speedup / self.workers)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
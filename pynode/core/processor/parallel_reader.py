@@ -0,0 +1,104 @@
+import os
+import math
+import time
+import shutil
+import logging
+import tempfile
+import multiprocessing
+import h5py
+import numpy as np
+
+from core.manager import Manager
+from core.patterns.pynode_logger import LogSocketHandler
+
+
+def split_rows(start: int, end: int, chunk_rows: int, parts: int) -> list:
+    # splits rows range to parts aligned by dataset chunks grid,
+    # so each chunk is decompressed by one worker only
+    bounds = [start] + list(range(start - start % chunk_rows + chunk_rows, end, chunk_rows)) + [end]
+    slabs_count = len(bounds) - 1
+    per_part = int(math.ceil(slabs_count / parts))
+    return [(bounds[idx], bounds[min(idx + per_part, slabs_count)]) for idx in range(0, slabs_count, per_part)]
+
+
+def read_hyperslab(task: tuple) -> int:
+    # destination is memory mapped file, so pool is reused for datasets of any shape
+    file_address, name, output_file, shape, start, first, last = task
+    data = np.memmap(output_file, dtype=np.float64, mode='r+', shape=shape)
+    with h5py.File(file_address, 'r') as h5f:
+        h5f[name].read_direct(dest=data, source_sel=np.s_[first:last], dest_sel=np.s_[first - start:last - start])
+    data.flush()
+    return last - first
+
+
+class ParallelReader:
+    """
+    ParallelReader decompresses hyperslabs of chunked hdf5 datasets in pool of spawned processes.
+    Spawned process imports backend modules on start, so pool is started on first large read
+    and kept for all reads of job, it is closed after job data is loaded.
+    """
+
+    __instance = None
+
+    def __init__(self, min_size: int = 64):
+        if ParallelReader.__instance is not None:
+            raise Exception("This class is a singleton!")
+        else:
+            ParallelReader.__instance = self
+        # Initializing logger object
+        self.logger = logging.getLogger("ParallelReader")
+        self.logger.addHandler(LogSocketHandler.get_instance())
+
+        # min size of decompressed data in megabytes for parallel reading
+        self.min_size = min_size * 1024 * 1024
+        self.pool = None
+        self.workers = 0
+        self.directory = None
+        self.reads = 0
+
+    @staticmethod
+    def get_instance():
+        """ Static access method. """
+        if ParallelReader.__instance is None:
+            ParallelReader(min_size=Manager.get_instance().processor_read_parallel_min_size)
+        return ParallelReader.__instance
+
+    def accepts(self, shape: tuple) -> bool:
+        # smaller data is read serially faster than processes are started
+        return int(np.prod(shape)) * np.dtype(np.float64).itemsize >= self.min_size
+
+    def start(self, workers: int):
+        # forked processes may inherit locks held by backend, broker and socket threads, so workers are spawned
+        context = multiprocessing.get_context('spawn')
+        self.pool = context.Pool(processes=workers)
+        self.workers = workers
+        self.directory = tempfile.mkdtemp(prefix='pynode_read_')
+
+    def read(self, file_address: str, name: str, shape: tuple, start: int, chunk_rows: int,
+             workers: int = 4) -> np.ndarray:
+        # reads rows [start:start + shape[0]] of chunked dataset, data is float64 as for serial hdf5 reading
+        start_time = time.time()
+        if self.pool is not None and self.workers != workers:
+            self.close()
+        if self.pool is None:
+            self.start(workers)
+        # each read has own file, data of previous reads of job stays mapped
+        output_file = os.path.join(self.directory, 'data_%d' % self.reads)
+        self.reads += 1
+        data = np.memmap(output_file, dtype=np.float64, mode='w+', shape=shape)
+        slabs = split_rows(start, start + shape[0], chunk_rows, workers * 2)
+        self.pool.map(read_hyperslab, [(os.path.abspath(file_address), name, output_file, shape, start, first, last)
+                                       for first, last in slabs])
+        self.logger.info('Parallel read of %s by %d workers, hyperslabs : %d, time : %s',
+                         name, workers, len(slabs), str(time.time() - start_time))
+        return data
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.directory is not None:
+            # mapped data of removed files stays readable until arrays are released
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
@@ -0,0 +1,136 @@
+import numpy as np
+
+from abc import ABCMeta, abstractmethod
+from core.patterns.exceptions import DataInconsistencyError
+
+
+class Transform(metaclass=ABCMeta):
+    """
+    Base class for vectorized preprocessing transforms applied to blocks of data rows.
+    Element wise transforms are performed in place.
+    """
+
+    def output_shape(self, shape: tuple) -> tuple:
+        return tuple(shape)
+
+    @abstractmethod
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        pass
+
+
+class Scale(Transform):
+    # x * scale + shift
+
+    def __init__(self, scale: float = 1.0, shift: float = 0.0):
+        self.scale = float(scale)
+        self.shift = float(shift)
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        np.multiply(block, self.scale, out=block)
+        np.add(block, self.shift, out=block)
+        return block
+
+
+class Standardize(Transform):
+    # (x - mean) / std with per feature mean and std
+
+    def __init__(self, mean, std):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.std = np.asarray(std, dtype=np.float32)
+        if (self.std == 0).any():
+            raise DataInconsistencyError('Standardize std values can not be zero')
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        np.subtract(block, self.mean, out=block)
+        np.divide(block, self.std, out=block)
+        return block
+
+
+class Reshape(Transform):
+    # reshape of each row, rows count is kept
+
+    def __init__(self, shape):
+        self.shape = tuple(int(dim) for dim in shape)
+
+    def output_shape(self, shape: tuple) -> tuple:
+        if int(np.prod(shape[1:])) != int(np.prod(self.shape)):
+            raise DataInconsistencyError('Unable to reshape rows %s to %s' % (str(shape[1:]), str(self.shape)))
+        return (shape[0],) + self.shape
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        return block.reshape((block.shape[0],) + self.shape)
+
+
+class OneHot(Transform):
+    # integer class labels to one hot vectors
+
+    def __init__(self, classes: int):
+        self.classes = int(classes)
+
+    def output_shape(self, shape: tuple) -> tuple:
+        if int(np.prod(shape[1:])) != 1:
+            raise DataInconsistencyError('One hot encoding needs single label per row, got %s' % str(shape))
+        return shape[0], self.classes
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        labels = block.reshape(block.shape[0]).astype(np.int64)
+        if labels.size and (labels.min() < 0 or labels.max() >= self.classes):
+            raise DataInconsistencyError('Labels are out of %d classes' % self.classes)
+        encoded = np.zeros((block.shape[0], self.classes), dtype=block.dtype)
+        encoded[np.arange(block.shape[0]), labels] = 1
+        return encoded
+
+
+class Clip(Transform):
+
+    def __init__(self, min=None, max=None):
+        self.min = min
+        self.max = max
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        return np.clip(block, self.min, self.max, out=block)
+
+
+# known transforms by name of operation in dataset options
+transforms = {
+    'scale': Scale,
+    'standardize': Standardize,
+    'reshape': Reshape,
+    'one_hot': OneHot,
+    'clip': Clip
+}
+
+
+class Preprocessor:
+    """
+    Preprocessor applies declared in dataset options chain of transforms
+    to data while it is read by rows blocks, so only one block copy exists
+    in addition to result array.
+    """
+
+    def __init__(self, steps: list):
+        self.transforms = []
+        for step in steps:
+            params = dict(step)
+            operation = params.pop('op')
+            if operation not in transforms:
+                raise DataInconsistencyError('Unknown preprocessing operation : ' + str(operation))
+            self.transforms.append(transforms[operation](**params))
+
+    def output_shape(self, shape: tuple) -> tuple:
+        for transform in self.transforms:
+            shape = transform.output_shape(shape)
+        return tuple(shape)
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        for transform in self.transforms:
+            block = transform.apply(block)
+        return block
+
+    def transform(self, data, block_rows: int) -> np.ndarray:
+        # data may be any array like object with rows slicing (h5py dataset, memmap, ndarray)
+        result = np.empty(self.output_shape(data.shape), dtype=np.float32)
+        for start in range(0, data.shape[0], block_rows):
+            block = np.array(data[start:start + block_rows], dtype=np.float32)
+            result[start:start + block.shape[0]] = self.apply(block)
+        return result
@@ -1,11 +1,17 @@
 import logging
-import h5py
 import os
 
+from collections import OrderedDict
 from abc import ABCMeta, abstractmethod
+from typing import Union, Iterable
 from threading import Thread
 from core.processor.entities.kernel import Kernel
 from core.processor.entities.dataset import Dataset
+from core.processor.validator import Validator
+from core.processor.result_writer import ResultWriter
+from core.processor.inference_worker import InferenceWorker
+from core.processor.result_cache import ResultCache
+from core.processor.parallel_reader import ParallelReader
 from core.manager import Manager
 from core.patterns.pynode_logger import LogSocketHandler
 
@@ -39,6 +45,7 @@ class Processor(Thread):
         # Configuring
         self.id = processor_id
         self.results_file = None
+        self.result_key = None
         # variables for kernel and dataset objects
         self.kernel = None
         self.kernel_init_result = None
@@ -49,7 +56,7 @@ class Processor(Thread):
         self.delegate = delegate
         # root files pth
 
-    def prepare(self, kernel_file, dataset_file, batch: int) -> bool:
+    def prepare(self, kernel_file, dataset_file, batch: Union[int, Iterable[int]]) -> bool:
         try:
             self.kernel = Kernel(kernel_file=kernel_file,
                                  ipfs_api=self.ipfs_api)
@@ -74,16 +81,25 @@ class Processor(Thread):
         return False
 
     def load(self):
-        if self.__load() is False:
+        if self.__validate() is False:
             self.delegate.processor_load_failure(processor_id=self.id)
         else:
             self.delegate.processor_load_complete(processor_id=self.id)
 
+    def __validate(self) -> bool:
+        # full mode reads all data for validation, header mode checks files headers only
+        if self.manager.processor_validation_mode == 'full':
+            return self.__load()
+        return Validator(kernel=self.kernel, dataset=self.dataset).validate()
+
     def __load(self) -> bool:
         # load data sets for computing
         try:
-            # reading kernel data
-            self.kernel.read_model()
+            # reading kernel data, prediction model is loaded by inference worker process if it is used
+            if self.use_inference_worker():
+                InferenceWorker.get_instance().load(self.kernel, self.dataset)
+            else:
+                self.kernel.read_model(self.dataset)
             # prepare data for prediction or training
             if self.dataset.process == 'predict':
                 self.dataset.read_dataset()
@@ -94,9 +110,26 @@ class Processor(Thread):
             self.logger.error("Error reading entities: %s", type(ex))
             self.logger.error(ex.args)
             return False
+        finally:
+            # reading processes are kept for all data files of job
+            ParallelReader.get_instance().close()
         return True
 
+    def use_inference_worker(self) -> bool:
+        return self.manager.processor_inference_worker and self.dataset.process == 'predict'
+
     def compute(self):
+        # job with same inputs was computed and published before
+        result_cache = ResultCache.get_instance()
+        self.result_key = ResultCache.job_key(self.kernel, self.dataset) if result_cache.enabled else None
+        if self.result_key:
+            ipfs_result_address = result_cache.get(self.result_key)
+            if ipfs_result_address:
+                self.logger.info('Computing skipped, cached result : ' + str(ipfs_result_address))
+                self.delegate.processor_computing_complete(self.id, ipfs_result_address)
+                self.clean_up()
+                return
+
         if self.__load() is False:
             self.delegate.processor_computing_failure(self.id)
             return
@@ -104,7 +137,10 @@ class Processor(Thread):
         try:
             if self.dataset.process == 'predict':
                 # return prediction result
-                out = self.kernel.inference_prediction(self.dataset)
+                if self.use_inference_worker():
+                    out = InferenceWorker.get_instance().predict(self.kernel, self.dataset)
+                else:
+                    out = self.kernel.inference_prediction(self.dataset)
             elif self.dataset.process == 'fit':
                 # return model instance after training
                 out = self.kernel.inference_training(self.dataset)
@@ -121,10 +157,17 @@ class Processor(Thread):
         self.results_file = str(self.manager.job_contract_address) + '.out.hdf5'
         try:
             if self.dataset.process == 'predict':
-                h5w = h5py.File(self.results_file, 'w')
-                h5w.create_dataset('dataset', data=out)
+                if len(out) == 1:
+                    results = {'dataset': out[0]}
+                else:
+                    # each batch result stored as separate dataset named by batch number
+                    results = OrderedDict(('dataset_' + str(batch_no), batch_out)
+                                          for batch_no, batch_out in zip(self.dataset.batches_no, out))
+                ResultWriter.from_config().write(self.results_file, results, reducer=self.dataset.reducer)
             elif self.dataset.process == 'fit':
                 out.save_weights(self.results_file)
+                # graph of training is not kept between jobs of node process
+                self.kernel.clear_training_session()
         except Exception as ex:
             self.logger.error("Error saving results of cognitive work: %s", type(ex))
             self.logger.error(ex.args)
@@ -132,6 +175,8 @@ class Processor(Thread):
             return
         # need to return file address
         ipfs_result_address = self.ipfs_api.upload_file(self.results_file)
+        if self.result_key:
+            ResultCache.get_instance().put(self.result_key, ipfs_result_address)
         self.delegate.processor_computing_complete(self.id, ipfs_result_address)
         self.clean_up()
 
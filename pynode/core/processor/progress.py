@@ -0,0 +1,122 @@
+import math
+import time
+import keras
+
+from core.manager import Manager
+
+
+class ProgressMonitor(keras.callbacks.Callback):
+    """
+    ProgressMonitor records batches and epochs timings, samples per second, loss
+    and estimated time of completion of training or prediction into job metrics.
+    Metrics are sent not more often than once per interval seconds,
+    epochs ends and completion are always sent.
+    """
+
+    def __init__(self, name: str, epochs: int = 1, steps: int = None, batch_size: int = None,
+                 samples: int = None, interval: float = 1.0):
+        super().__init__()
+        self.manager = Manager.get_instance()
+
+        self.name = name
+        self.epochs = epochs
+        self.steps = steps
+        self.batch_size = batch_size
+        self.samples = samples
+        self.interval = interval
+        self.first_epoch = None
+        self.epoch = 0
+        self.batch = 0
+        self.steps_done = 0
+        self.samples_done = 0
+        self.loss = None
+        self.val_loss = None
+        self.batch_time = 0.0
+        self.epoch_times = []
+        self.start = self.step_start = self.epoch_start = time.time()
+        self.last_report = 0.0
+
+    @property
+    def total_steps(self):
+        if not self.steps:
+            return None
+        return self.steps * (self.epochs - (self.first_epoch or 0))
+
+    def begin(self):
+        self.start = self.step_start = self.epoch_start = time.time()
+
+    def step(self, samples: int, loss=None, steps: int = 1):
+        # several steps are completed at once by parallel prediction shards
+        now = time.time()
+        self.batch_time = (now - self.step_start) / max(steps, 1)
+        self.step_start = now
+        self.batch += steps
+        self.steps_done += steps
+        self.samples_done += samples
+        if loss is not None:
+            self.loss = float(loss)
+        self.report()
+
+    def metrics(self) -> dict:
+        elapsed = time.time() - self.start
+        total_steps = self.total_steps
+        eta = None
+        if total_steps and self.steps_done:
+            eta = max(total_steps - self.steps_done, 0) * elapsed / self.steps_done
+        return {'epoch': self.epoch,
+                'epochs': self.epochs,
+                'batch': self.batch,
+                'steps': self.steps,
+                'batch_time': self.batch_time,
+                'epoch_times': list(self.epoch_times),
+                'samples_per_sec': self.samples_done / max(elapsed, 1e-9),
+                'loss': self.loss,
+                'val_loss': self.val_loss,
+                'elapsed': elapsed,
+                'eta': eta}
+
+    def report(self, force: bool = False):
+        now = time.time()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        self.manager.set_job_metrics(self.name, self.metrics())
+
+    def on_train_begin(self, logs=None):
+        params = self.params or {}
+        # keras 2.0 fit declares samples and batch size, generators and later keras versions declare steps
+        if not self.steps:
+            if params.get('steps'):
+                self.steps = params['steps']
+            elif params.get('samples') and params.get('batch_size'):
+                self.steps = int(math.ceil(params['samples'] / params['batch_size']))
+        self.batch_size = self.batch_size or params.get('batch_size')
+        self.begin()
+
+    def on_epoch_begin(self, epoch, logs=None):
+        if self.first_epoch is None:
+            self.first_epoch = epoch
+        self.epoch = epoch
+        self.batch = 0
+        self.epoch_start = self.step_start = time.time()
+
+    def on_batch_end(self, batch, logs=None):
+        logs = logs or {}
+        samples = logs.get('size', self.batch_size or 0)
+        if self.samples and self.steps and self.batch + 1 == self.steps:
+            # last batch of epoch may be incomplete
+            samples = self.samples - (self.steps - 1) * (self.batch_size or 0)
+        self.step(samples, logs.get('loss'))
+
+    def on_epoch_end(self, epoch, logs=None):
+        logs = logs or {}
+        self.epoch = epoch + 1
+        self.epoch_times.append(time.time() - self.epoch_start)
+        if logs.get('loss') is not None:
+            self.loss = float(logs['loss'])
+        if logs.get('val_loss') is not None:
+            self.val_loss = float(logs['val_loss'])
+        self.report(force=True)
+
+    def on_train_end(self, logs=None):
+        self.report(force=True)
@@ -0,0 +1,117 @@
+import copy
+import numpy as np
+
+from core.patterns.exceptions import ModelInconsistencyError
+from core.processor.numpy_executor import NumpyExecutor, Dense
+
+# supported quantization modes
+modes = ('int8', 'float16')
+
+
+# columns count of weights tile expanded to float32 at once
+tile_columns = 128
+
+
+class Scratch:
+    # float32 buffers shared by quantized layers of model, layers are run one by one
+
+    def __init__(self, weights_size: int):
+        self.weights = np.empty(weights_size, dtype=np.float32)
+        self.output = np.empty(0, dtype=np.float32)
+
+    @property
+    def nbytes(self) -> int:
+        return self.weights.nbytes + self.output.nbytes
+
+    def weights_tile(self, rows: int, columns: int) -> np.ndarray:
+        return self.weights[:rows * columns].reshape((rows, columns))
+
+    def output_tile(self, rows: int, columns: int) -> np.ndarray:
+        if self.output.size < rows * columns:
+            self.output = np.empty(rows * columns, dtype=np.float32)
+        return self.output[:rows * columns].reshape((rows, columns))
+
+
+class QuantizedDense(Dense):
+    """
+    Dense layer with weights stored as int8 with per output channel scales or as float16.
+    Weights are expanded to float32 by tiles of columns in scratch buffer shared by model layers,
+    so resident model memory is quantized weights and one tile, matrix product is computed by float32 BLAS.
+    Scales are taken from weights ranges, data is not used for them.
+    """
+
+    @staticmethod
+    def from_dense(layer: Dense, mode: str, scratch: Scratch):
+        quantized = QuantizedDense.__new__(QuantizedDense)
+        quantized.__dict__.update(layer.__dict__)
+        quantized.mode = mode
+        if mode == 'int8':
+            # symmetric per channel quantization, each output channel has own scale
+            max_abs = np.abs(layer.kernel).max(axis=0)
+            quantized.scales = np.where(max_abs > 0, max_abs / 127., 1.).astype(np.float32)
+            quantized.weights = np.rint(layer.kernel / quantized.scales).astype(np.int8)
+        else:
+            quantized.scales = None
+            quantized.weights = layer.kernel.astype(np.float16)
+        quantized.kernel = None
+        quantized.scratch = scratch
+        return quantized
+
+    @property
+    def nbytes(self) -> int:
+        return self.weights.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def get_weights(self) -> list:
+        raise ModelInconsistencyError('Weights of quantized layer %s are not exported' % self.name)
+
+    def count_params(self) -> int:
+        return self.weights.size + (self.bias.size if self.bias is not None else 0)
+
+    def forward(self, block: np.ndarray, buffer: np.ndarray) -> np.ndarray:
+        inputs = self.weights.shape[0]
+        for first in range(0, self.units, tile_columns):
+            last = min(first + tile_columns, self.units)
+            kernel = self.scratch.weights_tile(inputs, last - first)
+            np.copyto(kernel, self.weights[:, first:last], casting='unsafe')
+            if self.scales is not None:
+                np.multiply(kernel, self.scales[first:last], out=kernel)
+            if last - first == self.units:
+                np.dot(block, kernel, out=buffer)
+            else:
+                # output columns slice is not contiguous, tile product is computed in scratch
+                output = self.scratch.output_tile(block.shape[0], last - first)
+                np.dot(block, kernel, out=output)
+                buffer[:, first:last] = output
+        if self.bias is not None:
+            np.add(buffer, self.bias, out=buffer)
+        return self.activation(buffer)
+
+
+def weights_bytes(executor: NumpyExecutor) -> int:
+    # scratch buffers of quantized model are resident with weights
+    scratch = getattr(executor, 'scratch', None)
+    return sum(layer.nbytes if isinstance(layer, QuantizedDense) else layer.kernel.nbytes
+               for layer in executor.layers if isinstance(layer, Dense)) + (scratch.nbytes if scratch else 0)
+
+
+def quantize(executor: NumpyExecutor, mode: str) -> NumpyExecutor:
+    # quantized copy of executor, original executor is not changed and may stay in models cache
+    if mode not in modes:
+        raise ModelInconsistencyError('Unknown quantization mode : ' + str(mode))
+    dense = [layer for layer in executor.layers if isinstance(layer, Dense)]
+    scratch = Scratch(max([layer.kernel.shape[0] * min(layer.units, tile_columns) for layer in dense] or [0]))
+    quantized = copy.copy(executor)
+    quantized.layers = [QuantizedDense.from_dense(layer, mode, scratch) if isinstance(layer, Dense) else layer
+                        for layer in executor.layers]
+    quantized.scratch = scratch
+    quantized.buffers = []
+    quantized.buffers_rows = 0
+    return quantized
+
+
+def accuracy_delta(reference: NumpyExecutor, quantized: NumpyExecutor, sample, batch_size: int) -> float:
+    # max absolute difference of outputs of quantized and full precision models
+    if sample.shape[0] == 0:
+        return 0.0
+    expected = reference.predict(sample, batch_size=batch_size)
+    return float(np.abs(quantized.predict(sample, batch_size=batch_size) - expected).max())
@@ -0,0 +1,231 @@
+import io
+import os
+import zipfile
+import h5py
+import numpy as np
+
+from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
+from core.manager import Manager
+from core.patterns.exceptions import DataInconsistencyError
+from core.processor.parallel_reader import ParallelReader
+from core.processor.sparse import is_sparse_group, sparse_header, read_sparse
+
+
+class RowsRange:
+    """
+    Array like view of rows range [start:end] of data (h5py dataset, memmap, ndarray)
+    without reading it, supports rows slicing only
+    """
+
+    def __init__(self, data, rows: tuple):
+        self.data = data
+        self.start, self.end = rows
+        self.shape = (self.end - self.start,) + tuple(data.shape[1:])
+        self.dtype = data.dtype
+
+    def __getitem__(self, item: slice):
+        start, stop, step = item.indices(self.shape[0])
+        return self.data[self.start + start:self.start + stop:step]
+
+
+def rows_shape(shape: tuple, rows: tuple = None) -> tuple:
+    # shape of rows range of data, range must be inside of data
+    if rows is None:
+        return tuple(shape)
+    start, end = rows
+    if len(shape) == 0 or not 0 <= start < end <= shape[0]:
+        raise DataInconsistencyError('Rows range %s is out of data shape %s' % (str(rows), str(shape)))
+    return (end - start,) + tuple(shape[1:])
+
+
+class DatasetReader(metaclass=ABCMeta):
+    """
+    Base class for dataset file format readers.
+    Reader is chosen by `format` field of dataset options or by file signature.
+    All methods may be limited by rows range (start, end) of data.
+    """
+
+    # format name used in dataset options
+    format = None
+    # magic bytes at the beginning of the file
+    signature = None
+
+    @abstractmethod
+    def read_header(self, file_address: str, name: str, rows: tuple = None) -> tuple:
+        pass
+
+    @abstractmethod
+    def read(self, file_address: str, name: str, rows: tuple = None) -> np.ndarray:
+        pass
+
+    @contextmanager
+    def open(self, file_address: str, name: str, rows: tuple = None):
+        # yields array like object for reading rows ranges without loading all the data
+        yield self.read(file_address, name, rows)
+
+    def check_head(self, head: bytes):
+        # checks first bytes of file content while it is downloading
+        if not head.startswith(self.signature):
+            raise DataInconsistencyError('Data file is not %s, content starts with %s' % (self.format, head[:16]))
+
+
+class Hdf5Reader(DatasetReader):
+
+    format = 'hdf5'
+    signature = b'\x89HDF\r\n\x1a\n'
+
+    def __init__(self):
+        # count of processes for parallel decompression of chunked datasets, limited by cpu count
+        self.workers = min(Manager.get_instance().processor_read_workers, os.cpu_count() or 1)
+
+    def read_header(self, file_address: str, name: str, rows: tuple = None) -> tuple:
+        with h5py.File(file_address, 'r') as h5f:
+            h5ds = h5f[name]
+            if is_sparse_group(h5ds):
+                shape, dtype = sparse_header(h5ds)
+                return rows_shape(shape, rows), dtype
+            return rows_shape(h5ds.shape, rows), h5ds.dtype
+
+    def read(self, file_address: str, name: str, rows: tuple = None) -> np.ndarray:
+        with h5py.File(file_address, 'r') as h5f:
+            # magic internal variable can not be empty (for more easy performance named as structure variable)
+            h5ds = h5f[name]
+            if is_sparse_group(h5ds):
+                # sparse data stays compressed in memory, rows are densified by minibatches
+                rows_shape(sparse_header(h5ds)[0], rows)
+                return read_sparse(h5ds, rows)
+            shape = rows_shape(h5ds.shape, rows)
+            chunk_rows = h5ds.chunks[0] if h5ds.chunks else None
+            # large compressed data with more than one chunk of rows is decompressed by processes pool
+            parallel = self.workers > 1 and h5ds.compression is not None and chunk_rows and shape[0] > chunk_rows \
+                and ParallelReader.get_instance().accepts(shape)
+            if not parallel:
+                data = np.ndarray(shape=shape)
+                # only hyperslab of rows range is read from file
+                h5ds.read_direct(dest=data, source_sel=np.s_[rows[0]:rows[1]] if rows else None)
+                return data
+        return ParallelReader.get_instance().read(file_address, name, shape, rows[0] if rows else 0, chunk_rows,
+                                                  self.workers)
+
+    @contextmanager
+    def open(self, file_address: str, name: str, rows: tuple = None):
+        with h5py.File(file_address, 'r') as h5f:
+            h5ds = h5f[name]
+            if is_sparse_group(h5ds):
+                rows_shape(sparse_header(h5ds)[0], rows)
+                yield read_sparse(h5ds, rows)
+            elif rows is None:
+                yield h5ds
+            else:
+                rows_shape(h5ds.shape, rows)
+                yield RowsRange(h5ds, rows)
+
+
+class NpyReader(DatasetReader):
+
+    format = 'npy'
+    signature = b'\x93NUMPY'
+
+    def read_header(self, file_address: str, name: str, rows: tuple = None) -> tuple:
+        with open(file_address, 'rb') as npy_file:
+            shape, fortran_order, dtype = read_npy_header(npy_file)
+        return rows_shape(shape, rows), dtype
+
+    def read(self, file_address: str, name: str, rows: tuple = None) -> np.ndarray:
+        # file contains single array, so name is not used
+        # memory mapping gives data without copying and parsing
+        data = np.load(file_address, mmap_mode='r')
+        if rows is None:
+            return data
+        rows_shape(data.shape, rows)
+        return data[rows[0]:rows[1]]
+
+    def check_head(self, head: bytes):
+        super().check_head(head)
+        # header is parsed if it fits into checked bytes
+        if len(head) < 10 or len(head) < 10 + int.from_bytes(head[8:10], 'little') or head[6] != 1:
+            return
+        try:
+            shape, fortran_order, dtype = read_npy_header(io.BytesIO(head))
+        except ValueError as ex:
+            raise DataInconsistencyError('Wrong npy file header', *ex.args)
+        if not (np.issubdtype(dtype, np.number) or np.issubdtype(dtype, np.bool_)):
+            raise DataInconsistencyError('Data type %s is not numeric' % str(dtype))
+
+
+class NpzReader(DatasetReader):
+
+    format = 'npz'
+    signature = b'PK\x03\x04'
+
+    def read_header(self, file_address: str, name: str, rows: tuple = None) -> tuple:
+        with zipfile.ZipFile(file_address) as npz_file:
+            with npz_file.open(name + '.npy') as npy_file:
+                shape, fortran_order, dtype = read_npy_header(npy_file)
+        return rows_shape(shape, rows), dtype
+
+    def read(self, file_address: str, name: str, rows: tuple = None) -> np.ndarray:
+        with np.load(file_address) as npz_file:
+            data = npz_file[name]
+        if rows is None:
+            return data
+        rows_shape(data.shape, rows)
+        return data[rows[0]:rows[1]]
+
+
+def read_npy_header(npy_file) -> tuple:
+    # returns shape, fortran order flag and dtype, file position is set to data start
+    version = np.lib.format.read_magic(npy_file)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(npy_file)
+    return np.lib.format.read_array_header_2_0(npy_file)
+
+
+# registry of known readers by format name
+readers = {}
+
+
+def register_reader(reader_class):
+    readers[reader_class.format] = reader_class
+    return reader_class
+
+
+register_reader(Hdf5Reader)
+register_reader(NpyReader)
+register_reader(NpzReader)
+
+
+def get_reader(file_address: str, data_format: str = None) -> DatasetReader:
+    # format declared in dataset options has priority over file signature
+    if data_format:
+        if data_format not in readers:
+            raise DataInconsistencyError('Unknown dataset format : ' + str(data_format))
+        return readers[data_format]()
+    signature_length = max(len(reader.signature) for reader in readers.values())
+    with open(file_address, 'rb') as data_file:
+        head = data_file.read(signature_length)
+    for reader in readers.values():
+        if head.startswith(reader.signature):
+            return reader()
+    # unknown signature, hdf5 stays as default format
+    return Hdf5Reader()
+
+
+def check_data_head(head: bytes, data_format: str = None):
+    # download validator for data files, format declared in dataset options has priority
+    if data_format:
+        if data_format not in readers:
+            raise DataInconsistencyError('Unknown dataset format : ' + str(data_format))
+        return readers[data_format]().check_head(head)
+    for reader in readers.values():
+        if head.startswith(reader.signature):
+            return reader().check_head(head)
+    raise DataInconsistencyError('Unknown data file signature, content starts with %s' % head[:16])
+
+
+def check_json_head(head: bytes):
+    # download validator for json descriptors, html error pages of getaway are rejected early
+    content = head.lstrip(b'\xef\xbb\xbf \t\r\n')
+    if not content.startswith(b'{'):
+        raise DataInconsistencyError('File is not json object, content starts with %s' % content[:16])
@@ -0,0 +1,163 @@
+import numpy as np
+
+from abc import ABCMeta, abstractmethod
+from core.patterns.exceptions import DataInconsistencyError
+
+
+def index_dtype(size: int) -> np.dtype:
+    # smallest unsigned type for indices of axis with given size
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if size <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+class Reducer(metaclass=ABCMeta):
+    """
+    Base class for vectorized reducers of prediction output applied to blocks of result rows.
+    Reducers work with last axis of output (classes, outputs).
+    """
+
+    def output_shape(self, shape: tuple) -> tuple:
+        return tuple(shape)
+
+    def output_dtype(self, shape: tuple, dtype: np.dtype) -> np.dtype:
+        return np.dtype(dtype)
+
+    @abstractmethod
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        pass
+
+
+class ArgMax(Reducer):
+    # index of max output
+
+    def output_shape(self, shape: tuple) -> tuple:
+        return tuple(shape[:-1])
+
+    def output_dtype(self, shape: tuple, dtype: np.dtype) -> np.dtype:
+        return index_dtype(shape[-1])
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        return np.argmax(block, axis=-1)
+
+
+def take_last(data: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    # values by indices along last axis, np.take_along_axis is not available in numpy 1.13
+    leading = indices.shape[:-1]
+    grid = tuple(np.arange(size).reshape((-1,) + (1,) * (len(leading) - axis))
+                 for axis, size in enumerate(leading))
+    return data[grid + (indices,)]
+
+
+class TopK(Reducer):
+    # indices or values of k max outputs in descending order
+
+    outputs = ('indices', 'values')
+
+    def __init__(self, k: int, output: str = 'indices'):
+        self.k = int(k)
+        self.output = output
+        if self.k < 1:
+            raise DataInconsistencyError('Top k count must be positive, got %d' % self.k)
+        if output not in self.outputs:
+            raise DataInconsistencyError('Unknown top k output : ' + str(output))
+
+    def output_shape(self, shape: tuple) -> tuple:
+        if shape[-1] < self.k:
+            raise DataInconsistencyError('Top %d of %d outputs is not possible' % (self.k, shape[-1]))
+        return tuple(shape[:-1]) + (self.k,)
+
+    def output_dtype(self, shape: tuple, dtype: np.dtype) -> np.dtype:
+        return index_dtype(shape[-1]) if self.output == 'indices' else np.dtype(dtype)
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        # partial sort selects top k, then only k values are sorted
+        indices = np.argpartition(-block, self.k - 1, axis=-1)[..., :self.k]
+        values = take_last(block, indices)
+        order = np.argsort(-values, axis=-1)
+        if self.output == 'values':
+            return take_last(values, order)
+        return take_last(indices, order)
+
+
+class Threshold(Reducer):
+    # 1 for outputs greater or equal to threshold value, 0 otherwise
+
+    def __init__(self, value: float = 0.5):
+        self.value = float(value)
+
+    def output_dtype(self, shape: tuple, dtype: np.dtype) -> np.dtype:
+        return np.dtype(np.uint8)
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        return block >= self.value
+
+
+class Round(Reducer):
+    # rounding to decimals count, improves compression of results
+
+    def __init__(self, decimals: int = 0):
+        self.decimals = int(decimals)
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        return np.round(block, self.decimals)
+
+
+class Quantize(Reducer):
+    # outputs in range [min, max] to integer levels 0..levels
+
+    def __init__(self, levels: int = 255, min: float = 0.0, max: float = 1.0):
+        self.levels = int(levels)
+        self.min = float(min)
+        self.max = float(max)
+        if self.levels < 1 or self.max <= self.min:
+            raise DataInconsistencyError('Wrong quantization levels %d or range [%g, %g]'
+                                         % (self.levels, self.min, self.max))
+
+    def output_dtype(self, shape: tuple, dtype: np.dtype) -> np.dtype:
+        return index_dtype(self.levels + 1)
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        scaled = (block - self.min) * (self.levels / (self.max - self.min))
+        return np.rint(np.clip(scaled, 0, self.levels, out=scaled), out=scaled)
+
+
+# known reducers by name of operation in dataset options
+reducers = {
+    'argmax': ArgMax,
+    'top_k': TopK,
+    'threshold': Threshold,
+    'round': Round,
+    'quantize': Quantize
+}
+
+
+class OutputReducer:
+    """
+    OutputReducer applies declared in dataset options chain of reducers
+    to prediction results while they are written by rows blocks.
+    """
+
+    def __init__(self, steps: list):
+        self.reducers = []
+        for step in steps:
+            params = dict(step)
+            operation = params.pop('op')
+            if operation not in reducers:
+                raise DataInconsistencyError('Unknown output operation : ' + str(operation))
+            self.reducers.append(reducers[operation](**params))
+
+    def output(self, shape: tuple, dtype) -> tuple:
+        # shape and type of reduced result
+        dtype = np.dtype(dtype)
+        for reducer in self.reducers:
+            if len(shape) < 2:
+                raise DataInconsistencyError('Output %s has no outputs axis to reduce' % str(shape))
+            shape, dtype = reducer.output_shape(shape), reducer.output_dtype(shape, dtype)
+        return tuple(shape), dtype
+
+    def apply(self, block: np.ndarray) -> np.ndarray:
+        for reducer in self.reducers:
+            block = reducer.apply(block)
+        return block
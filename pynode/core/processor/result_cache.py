@@ -0,0 +1,117 @@
+import os
+import json
+import time
+import hashlib
+import logging
+
+from threading import Lock
+from core.manager import Manager
+from core.patterns.pynode_logger import LogSocketHandler
+
+
+class ResultCache:
+    """
+    ResultCache is persistent cache of published results addresses keyed by hash of job inputs,
+    job repeated with same kernel, weights, data batches and options is not computed again.
+    Each entry is stored as small json file, least recently used entries are evicted by entries count.
+    Cache directory must be outside of job workspace, which is cleaned after each job.
+    """
+
+    __instance = None
+
+    def __init__(self, directory: str = '', size: int = 1000):
+        if ResultCache.__instance is not None:
+            raise Exception("This class is a singleton!")
+        else:
+            ResultCache.__instance = self
+        # Initializing logger object
+        self.logger = logging.getLogger("ResultCache")
+        self.logger.addHandler(LogSocketHandler.get_instance())
+
+        # cache is disabled if directory is empty or size is 0
+        self.directory = directory
+        self.size = size
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self.lock = Lock()
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def get_instance():
+        """ Static access method. """
+        if ResultCache.__instance is None:
+            manager = Manager.get_instance()
+            ResultCache(directory=manager.processor_result_cache_dir, size=manager.processor_result_cache_size)
+        return ResultCache.__instance
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and self.size > 0
+
+    @staticmethod
+    def job_key(kernel, dataset) -> str:
+        # ipfs addresses are content hashes, so inputs are identified by addresses without files reading;
+        # node settings changing predicted values are part of key
+        manager = Manager.get_instance()
+        inputs = {'kernel': kernel.json_kernel,
+                  'options': dataset.json_dataset.get('options', {}),
+                  'process': dataset.process,
+                  'data': dataset.data_addresses,
+                  'rows': dataset.data_rows,
+                  'train': [dataset.train_x_address, dataset.train_y_address],
+                  'backend': manager.processor_backend,
+                  'quantization': [manager.processor_quantization, manager.processor_quantization_tolerance],
+                  'float16': manager.processor_result_float16}
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode('utf8')).hexdigest()
+
+    def entry_file(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key: str):
+        if not self.enabled:
+            return None
+        with self.lock:
+            try:
+                with open(self.entry_file(key)) as entry_file:
+                    entry = json.load(entry_file)
+            except (OSError, ValueError):
+                self.stats['misses'] += 1
+                self.report()
+                return None
+            # modification time is last use time for eviction
+            os.utime(self.entry_file(key))
+            self.stats['hits'] += 1
+            self.report()
+            return entry['result']
+
+    def put(self, key: str, result_address: str):
+        if not self.enabled:
+            return
+        with self.lock:
+            temp_file = self.entry_file(key) + '.tmp'
+            with open(temp_file, 'w') as entry_file:
+                json.dump({'result': result_address, 'time': time.time()}, entry_file)
+            os.replace(temp_file, self.entry_file(key))
+            self.evict()
+            self.report()
+
+    def evict(self):
+        entries = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.json')]
+        if len(entries) <= self.size:
+            return
+        entries.sort(key=os.path.getmtime)
+        for entry in entries[:len(entries) - self.size]:
+            os.remove(entry)
+            self.stats['evictions'] += 1
+            self.logger.info('Result %s evicted from cache', os.path.basename(entry))
+
+    def clear(self):
+        if not self.enabled:
+            return
+        with self.lock:
+            for name in os.listdir(self.directory):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.directory, name))
+
+    def report(self):
+        Manager.get_instance().set_job_metrics('result_cache', dict(self.stats))
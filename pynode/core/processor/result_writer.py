@@ -0,0 +1,107 @@
+import os
+import time
+import logging
+import h5py
+import numpy as np
+
+from core.manager import Manager
+from core.patterns.pynode_logger import LogSocketHandler
+from core.processor.reducers import OutputReducer
+
+
+class ResultWriter:
+    """
+    ResultWriter stores prediction results into hdf5 file with configurable
+    chunks shape, compression and shuffle filters and optional float16 precision,
+    and reports write time and size savings of uploaded file.
+    """
+
+    compressions = ['gzip', 'lzf']
+    # rows count of results block for reducing while writing
+    block_rows = 4096
+
+    def __init__(self, chunks: str = 'auto', compression: str = 'gzip', compression_level: int = 4,
+                 shuffle: bool = True, float16: bool = False):
+        # Initializing logger object
+        self.logger = logging.getLogger("ResultWriter")
+        self.logger.addHandler(LogSocketHandler.get_instance())
+        self.manager = Manager.get_instance()
+
+        self.chunks = chunks
+        self.compression = compression if compression in self.compressions else None
+        self.compression_level = compression_level
+        self.shuffle = shuffle
+        self.float16 = float16
+
+    @staticmethod
+    def from_config():
+        manager = Manager.get_instance()
+        return ResultWriter(chunks=manager.processor_result_chunks,
+                            compression=manager.processor_result_compression,
+                            compression_level=manager.processor_result_compression_level,
+                            shuffle=manager.processor_result_shuffle,
+                            float16=manager.processor_result_float16)
+
+    def write(self, file_name: str, results: dict, reducer: OutputReducer = None) -> dict:
+        start = time.time()
+        raw_bytes = 0
+        with h5py.File(file_name, 'w') as h5w:
+            for name, data in results.items():
+                data = np.asarray(data)
+                raw_bytes += data.nbytes
+                if reducer is not None:
+                    self.write_reduced(h5w, name, data, reducer)
+                    continue
+                if self.float16 and np.issubdtype(data.dtype, np.floating):
+                    data = data.astype(np.float16)
+                h5w.create_dataset(name, data=data, **self.dataset_options(data.shape))
+        write_time = time.time() - start
+
+        file_bytes = os.path.getsize(file_name)
+        report = {'write_time': write_time,
+                  'raw_bytes': raw_bytes,
+                  'file_bytes': file_bytes,
+                  'saved_bytes': raw_bytes - file_bytes,
+                  'compression_ratio': raw_bytes / file_bytes if file_bytes else 0}
+        self.logger.info('Results write time  : ' + str(write_time))
+        self.logger.info('Results raw size    : ' + str(raw_bytes))
+        self.logger.info('Results file size   : ' + str(file_bytes))
+        self.logger.info('Upload bytes saved  : ' + str(raw_bytes - file_bytes))
+        self.manager.set_job_metrics('result', report)
+        return report
+
+    def write_reduced(self, h5w, name: str, data: np.ndarray, reducer: OutputReducer):
+        # results are reduced and written block by block, so only one reduced block exists in memory
+        shape, dtype = reducer.output(data.shape, data.dtype)
+        if self.float16 and np.issubdtype(dtype, np.floating):
+            dtype = np.dtype(np.float16)
+        self.logger.info('Reducing %s results %s to %s %s', name, str(data.shape), str(shape), str(dtype))
+        h5ds = h5w.create_dataset(name, shape=shape, dtype=dtype, **self.dataset_options(shape))
+        for first in range(0, data.shape[0], self.block_rows):
+            block = data[first:first + self.block_rows]
+            h5ds[first:first + block.shape[0]] = reducer.apply(block).astype(dtype, copy=False)
+
+    def dataset_options(self, shape: tuple) -> dict:
+        # filters and chunks are not applicable for empty and scalar datasets
+        if len(shape) == 0 or 0 in shape:
+            return {}
+        options = {'chunks': self.chunk_shape(shape)}
+        if self.compression:
+            options['compression'] = self.compression
+            if self.compression == 'gzip':
+                options['compression_opts'] = self.compression_level
+        if self.shuffle:
+            options['shuffle'] = True
+        return options
+
+    def chunk_shape(self, shape: tuple):
+        # auto = chunks guessed by h5py, none = contiguous storage (if no filters used)
+        # rows count (1024) or full chunk shape (1024,10) may be set
+        if self.chunks in ('auto', '', None):
+            return True
+        if self.chunks == 'none':
+            return None
+        dims = [int(dim) for dim in str(self.chunks).split(',')]
+        dims = dims + list(shape[len(dims):])
+        # chunk can not exceed dataset shape
+        return tuple(max(1, min(dim, size)) for dim, size in zip(dims, shape))
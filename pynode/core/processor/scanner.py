@@ -0,0 +1,137 @@
+import hashlib
+import logging
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
+from core.patterns.pynode_logger import LogSocketHandler
+
+
+class ChunkStatistics:
+    """
+    Per feature statistics of data rows, mergeable between chunks
+    (pairwise mean and variance combination by Chan et al.)
+    """
+
+    def __init__(self, features: int):
+        self.rows = 0
+        self.nan_count = np.zeros(features, dtype=np.int64)
+        self.inf_count = np.zeros(features, dtype=np.int64)
+        self.count = np.zeros(features, dtype=np.int64)
+        self.min = np.full(features, np.inf)
+        self.max = np.full(features, -np.inf)
+        self.mean = np.zeros(features)
+        self.m2 = np.zeros(features)
+
+    @staticmethod
+    def from_block(block: np.ndarray):
+        stats = ChunkStatistics(block.shape[1])
+        stats.rows = block.shape[0]
+        finite = np.isfinite(block)
+        stats.nan_count = np.isnan(block).sum(axis=0)
+        stats.inf_count = np.isinf(block).sum(axis=0)
+        stats.count = finite.sum(axis=0)
+        stats.min = np.where(finite, block, np.inf).min(axis=0)
+        stats.max = np.where(finite, block, -np.inf).max(axis=0)
+        # mean and variance are calculated for finite values only
+        values = np.where(finite, block, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            stats.mean = np.where(stats.count > 0, values.sum(axis=0) / stats.count, 0.0)
+        stats.m2 = (((values - stats.mean) * finite) ** 2).sum(axis=0)
+        return stats
+
+    def merge(self, other):
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratio = np.where(count > 0, other.count / count, 0.0)
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * ratio
+        self.mean = self.mean + delta * ratio
+        self.count = count
+        self.rows += other.rows
+        self.nan_count += other.nan_count
+        self.inf_count += other.inf_count
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 0, self.m2 / self.count, 0.0)
+
+
+class DataScanner:
+    """
+    DataScanner walks dataset by rows chunks with bounded memory usage
+    and collects NaN/Inf counts and per feature min/max, mean and variance.
+    Chunks are processed in parallel, numpy reductions release GIL.
+    """
+
+    def __init__(self, chunk_rows: int = 4096, workers: int = 4, value_limit: float = None):
+        # Initializing logger object
+        self.logger = logging.getLogger("DataScanner")
+        self.logger.addHandler(LogSocketHandler.get_instance())
+
+        self.chunk_rows = chunk_rows
+        self.workers = workers
+        self.value_limit = value_limit
+
+    def sample_chunks(self, rows: int, sample: str, seed: str = '') -> list:
+        # random reproducible sample of chunks starts, sample is chunks count (16),
+        # percent of chunks (5%) or 'all' for full scan
+        chunks = list(range(0, rows, self.chunk_rows))
+        if not sample or sample == 'all':
+            return chunks
+        if sample.endswith('%'):
+            count = int(np.ceil(len(chunks) * float(sample[:-1]) / 100.))
+        else:
+            count = int(sample)
+        if count >= len(chunks):
+            return chunks
+        # the same job is sampled equally on all worker nodes
+        random = np.random.RandomState(int(hashlib.sha256(str(seed).encode()).hexdigest()[:8], 16))
+        return sorted(int(start) for start in random.choice(chunks, size=max(1, count), replace=False))
+
+    @staticmethod
+    def sample_confidence(sampled: int, total: int, level: float = 0.95) -> float:
+        # upper bound of anomalous chunks fraction at confidence level when sample has no anomalies
+        if sampled >= total:
+            return 0.0
+        return 1. - (1. - level) ** (1. / sampled)
+
+    def scan(self, data, chunks: list = None) -> ChunkStatistics:
+        # data may be any array like object with rows slicing (h5py dataset, memmap, ndarray)
+        rows = data.shape[0]
+        if chunks is None:
+            chunks = list(range(0, rows, self.chunk_rows))
+        features = int(np.prod(data.shape[1:]))
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            chunk_stats = executor.map(lambda start: self.scan_chunk(data, start, features), chunks)
+            stats = ChunkStatistics(features)
+            for chunk_stat in chunk_stats:
+                stats.merge(chunk_stat)
+        return stats
+
+    def scan_chunk(self, data, start: int, features: int) -> ChunkStatistics:
+        block = np.asarray(data[start:start + self.chunk_rows], dtype=np.float64)
+        return ChunkStatistics.from_block(block.reshape((block.shape[0], features)))
+
+    def check(self, name: str, stats: ChunkStatistics) -> list:
+        # returns list of found anomalies, empty list for valid data
+        anomalies = []
+        nan_count = int(stats.nan_count.sum())
+        inf_count = int(stats.inf_count.sum())
+        if nan_count:
+            anomalies.append('%s contains %d NaN values' % (name, nan_count))
+        if inf_count:
+            anomalies.append('%s contains %d Inf values' % (name, inf_count))
+        # magnitude of values is checked only if limit is set, large finite values are valid data
+        if self.value_limit is not None and stats.count.any():
+            low, high = float(stats.min.min()), float(stats.max.max())
+            if max(abs(low), abs(high)) > self.value_limit:
+                anomalies.append('%s values range [%g, %g] exceeds limit %g' % (name, low, high, self.value_limit))
+        self.logger.info('%s scanned rows : %d, NaN : %d, Inf : %d, min : %g, max : %g, mean : %g, variance : %g',
+                         name, stats.rows, nan_count, inf_count,
+                         float(stats.min.min()), float(stats.max.max()),
+                         float(stats.mean.mean()), float(stats.variance.mean()))
+        return anomalies
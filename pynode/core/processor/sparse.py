@@ -0,0 +1,89 @@
+import h5py
+import numpy as np
+
+from core.patterns.exceptions import DataInconsistencyError
+
+# names of members of sparse dataset group in data file
+SPARSE_MEMBERS = ('data', 'indices', 'indptr')
+
+
+class CsrMatrix:
+    """
+    Compressed sparse rows matrix (data, indices, indptr layout as in scipy),
+    array like object with rows slicing only, rows slice is returned densified,
+    so only requested block of rows exists in dense form
+    """
+
+    def __init__(self, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray, shape: tuple):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = tuple(int(dim) for dim in shape)
+        self.dtype = data.dtype
+        if len(self.shape) != 2 or len(indptr) != self.shape[0] + 1:
+            raise DataInconsistencyError('Sparse indptr length %d does not match shape %s'
+                                         % (len(indptr), str(self.shape)))
+        if len(indices) != len(data) or (len(indptr) and indptr[-1] != len(data)):
+            raise DataInconsistencyError('Sparse data length %d does not match indices length %d'
+                                         % (len(data), len(indices)))
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    @property
+    def density(self) -> float:
+        cells = self.shape[0] * self.shape[1]
+        return self.nnz / cells if cells else 0.0
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, item: slice) -> np.ndarray:
+        start, stop, step = item.indices(self.shape[0])
+        if step != 1:
+            raise DataInconsistencyError('Sparse rows slicing supports step 1 only')
+        stop = max(start, stop)
+        return self.dense(start, stop)
+
+    def dense(self, start: int, stop: int) -> np.ndarray:
+        block = np.zeros((stop - start, self.shape[1]), dtype=self.dtype)
+        first, last = self.indptr[start], self.indptr[stop]
+        # row number of each stored value
+        rows = np.repeat(np.arange(stop - start), np.diff(self.indptr[start:stop + 1]))
+        block[rows, self.indices[first:last]] = self.data[first:last]
+        return block
+
+
+def is_sparse_group(node) -> bool:
+    # sparse dataset is stored as group with data, indices and indptr datasets and shape attribute
+    if not isinstance(node, h5py.Group):
+        return False
+    return all(member in node for member in SPARSE_MEMBERS) and 'shape' in node.attrs
+
+
+def sparse_header(group) -> tuple:
+    return tuple(int(dim) for dim in group.attrs['shape']), group['data'].dtype
+
+
+def read_sparse(group, rows: tuple = None) -> CsrMatrix:
+    # only stored values of rows range are read from file
+    shape, dtype = sparse_header(group)
+    start, end = rows if rows is not None else (0, shape[0])
+    shape = (end - start,) + shape[1:]
+    indptr = group['indptr'][start:end + 1]
+    first, last = int(indptr[0]), int(indptr[-1])
+    return CsrMatrix(data=group['data'][first:last],
+                     indices=group['indices'][first:last],
+                     indptr=indptr - first,
+                     shape=shape)
+
+
+def write_sparse(group, dense: np.ndarray):
+    # stores dense 2d array as sparse group, used for dataset publishing and tests
+    dense = np.asarray(dense)
+    mask = dense != 0
+    group.create_dataset('data', data=dense[mask])
+    group.create_dataset('indices', data=np.nonzero(mask)[1].astype(np.int32))
+    group.create_dataset('indptr', data=np.concatenate(([0], np.cumsum(mask.sum(axis=1)))).astype(np.int64))
+    group.attrs['shape'] = dense.shape
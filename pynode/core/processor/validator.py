@@ -0,0 +1,189 @@
+import logging
+import time
+import numpy as np
+
+from core.manager import Manager
+from core.patterns.pynode_logger import LogSocketHandler
+from core.patterns.exceptions import DataInconsistencyError, ModelInconsistencyError
+from core.processor.entities.kernel import Kernel
+from core.processor.entities.dataset import Dataset
+from core.processor.scanner import DataScanner
+from core.processor.inference_worker import InferenceWorker, time_twice
+
+
+class Validator:
+    """
+    Validator performs VALIDATING_DATA stage checks for kernel and dataset pair.
+    Checks are working with files headers, architecture json and dry run of model
+    on few first rows, so validation does not depend on dataset size.
+    """
+
+    def __init__(self, kernel: Kernel, dataset: Dataset):
+        # Initializing logger object
+        self.logger = logging.getLogger("Validator")
+        self.logger.addHandler(LogSocketHandler.get_instance())
+        self.manager = Manager.get_instance()
+
+        self.kernel = kernel
+        self.dataset = dataset
+
+    def validate(self) -> bool:
+        start = time.time()
+        try:
+            headers = self.check_schema()
+            if self.manager.processor_scan_values:
+                self.check_values()
+            if self.manager.processor_probe_rows > 0:
+                self.probe(headers)
+        except Exception as ex:
+            self.logger.error("Dataset validation failed: %s", type(ex))
+            self.logger.error(ex.args)
+            return False
+        self.logger.info('Dataset validation success. time : ' + str(time.time() - start))
+        return True
+
+    def check_schema(self):
+        input_shape, input_dtype = self.kernel.read_input_layer()
+        headers = self.dataset.inspect_dataset()
+        self.logger.info('Kernel input shape : %s, dtype : %s', str(input_shape), str(input_dtype))
+
+        if self.dataset.process == 'predict':
+            for shape, dtype in headers['batches']:
+                self.check_input(shape, dtype, input_shape)
+        elif self.dataset.process == 'fit':
+            self.kernel.check_compile_options(self.dataset)
+            x_shape, x_dtype = headers['train_x']
+            y_shape, y_dtype = headers['train_y']
+            self.check_input(x_shape, x_dtype, input_shape)
+            self.check_dtype(y_dtype)
+            if len(y_shape) == 0 or y_shape[0] != x_shape[0]:
+                raise DataInconsistencyError('train_x rows %s does not match train_y rows %s'
+                                             % (str(x_shape), str(y_shape)))
+        else:
+            raise DataInconsistencyError('Unknown computing mode : ' + str(self.dataset.process))
+        return headers
+
+    def probe(self, headers: dict):
+        # dry run of model on first rows, so incompatible kernel and dataset fail validation instead of computing
+        try:
+            if self.dataset.process == 'predict':
+                block = self.read_probe(*self.dataset.data_files()[0])
+                total_rows = sum(shape[0] for shape, _ in headers['batches'])
+                build_time, run_time, output = self.probe_predict(block)
+                self.check_output(output)
+            else:
+                x_block = self.read_probe(self.dataset.train_x_address, 'train_x')
+                y_block = self.read_probe(self.dataset.train_y_address, 'train_y')
+                build_time, run_time = self.probe_fit(x_block, y_block)
+                epochs = max((self.dataset.epochs or 1) - (self.dataset.initial_epoch or 0), 0)
+                total_rows = int(headers['train_x'][0][0] * (1. - self.dataset.validation_split)) * epochs
+                block = x_block
+        except (DataInconsistencyError, ModelInconsistencyError):
+            raise
+        except Exception as ex:
+            raise ModelInconsistencyError('Kernel dry run failed', *ex.args)
+        # runtime is extrapolated linearly by rows count, probe is timed by single minibatch call as computing
+        # runs minibatches, so per call overhead of keras predict is not multiplied by rows count
+        estimated_time = run_time / block.shape[0] * total_rows
+        self.logger.info('Kernel dry run on %d rows : %g sec, build : %g sec, estimated job time : %g sec',
+                         block.shape[0], run_time, build_time, estimated_time)
+        self.manager.set_job_metrics('probe', {'rows': block.shape[0],
+                                               'build_time': build_time,
+                                               'run_time': run_time,
+                                               'total_rows': total_rows,
+                                               'estimated_time': estimated_time})
+
+    def probe_predict(self, block: np.ndarray) -> tuple:
+        # prediction model is kept by process computing job, so it is loaded by inference worker if it is used
+        if self.manager.processor_inference_worker:
+            return InferenceWorker.get_instance().probe(self.kernel, self.dataset, block)
+        model = self.read_model()
+        self.kernel.prepare_model(self.dataset)
+        outputs = []
+        build_time, run_time = time_twice(lambda: outputs.append(model.predict_on_batch(block)))
+        return build_time, run_time, outputs[-1]
+
+    def check_output(self, output):
+        # output reducers of dataset options are applied to dry run output, so reducer not fitting
+        # model output fails validation instead of results writing after computing
+        if self.dataset.reducer is None:
+            return
+        for data in (output if isinstance(output, list) else [output]):
+            data = np.asarray(data)
+            shape, dtype = self.dataset.reducer.output(data.shape, data.dtype)
+            reduced = self.dataset.reducer.apply(data)
+            if reduced.shape != shape:
+                raise DataInconsistencyError('Reduced output shape %s does not match expected %s'
+                                             % (str(reduced.shape), str(shape)))
+
+    def probe_fit(self, x_block: np.ndarray, y_block: np.ndarray) -> tuple:
+        model = self.read_model()
+        # trained model is returned to initial weights, optimizer is created again by training compilation
+        weights = model.get_weights()
+        try:
+            model.compile(loss=self.dataset.loss, optimizer=self.dataset.optimizer)
+            return time_twice(lambda: model.train_on_batch(x_block, y_block))
+        finally:
+            model.set_weights(weights)
+
+    def read_model(self):
+        model = self.kernel.read_model(self.dataset)
+        if model is None:
+            raise ModelInconsistencyError('Kernel model can not be built')
+        return model
+
+    def read_probe(self, file_address: str, name: str, rows: tuple = None) -> np.ndarray:
+        with self.dataset.open_data(file_address, name, rows) as data:
+            block = np.array(data[:self.manager.processor_probe_rows])
+        preprocessor = self.dataset.preprocessor(name)
+        if preprocessor is None:
+            return block
+        return preprocessor.apply(block.astype(np.float32))
+
+    def check_values(self):
+        scanner = DataScanner(chunk_rows=self.manager.processor_scan_chunk_rows,
+                              workers=self.manager.processor_scan_workers,
+                              value_limit=self.manager.processor_scan_value_limit)
+        anomalies = []
+        for file_address, name, rows in self.dataset.data_files():
+            with self.dataset.open_data(file_address, name, rows) as data:
+                anomalies += self.scan_data(scanner, name, data)
+        if anomalies:
+            raise DataInconsistencyError(*anomalies)
+
+    def scan_data(self, scanner: DataScanner, name: str, data) -> list:
+        # sample of chunks is scanned first, full scan is performed only if sample has anomalies
+        total = len(range(0, data.shape[0], scanner.chunk_rows))
+        chunks = scanner.sample_chunks(data.shape[0], self.manager.processor_scan_sample,
+                                       seed=self.manager.job_contract_address)
+        if len(chunks) < total:
+            self.logger.info('%s sampled chunks : %d of %d, anomalous chunks fraction below %g '
+                             'with 95%% confidence', name, len(chunks), total,
+                             scanner.sample_confidence(len(chunks), total))
+        anomalies = scanner.check(name, scanner.scan(data, chunks))
+        if anomalies and len(chunks) < total:
+            self.logger.info('%s sample has anomalies, escalating to full scan', name)
+            anomalies = scanner.check(name, scanner.scan(data))
+        self.manager.set_job_metrics('validation', dict(self.manager.job_metrics.get('validation', {}),
+                                                        **{name: {'chunks': total, 'sampled': len(chunks)}}))
+        return anomalies
+
+    def check_input(self, shape: tuple, dtype, input_shape: tuple):
+        self.logger.info('Dataset shape : %s, dtype : %s', str(shape), str(dtype))
+        self.check_dtype(dtype)
+        if len(shape) != len(input_shape):
+            raise DataInconsistencyError('Dataset rank %s does not match kernel input %s'
+                                         % (str(shape), str(input_shape)))
+        if shape[0] == 0:
+            raise DataInconsistencyError('Dataset is empty')
+        # first dimension is rows count, rest of dimensions must be equal if declared by kernel
+        for data_dim, input_dim in zip(shape[1:], input_shape[1:]):
+            if input_dim is not None and data_dim != input_dim:
+                raise DataInconsistencyError('Dataset shape %s does not match kernel input %s'
+                                             % (str(shape), str(input_shape)))
+
+    @staticmethod
+    def check_dtype(dtype):
+        # any numeric data may be casted to kernel input type
+        if not (np.issubdtype(dtype, np.number) or np.issubdtype(dtype, np.bool_)):
+            raise DataInconsistencyError('Dataset type %s is not numeric' % str(dtype))
@@ -9,7 +9,10 @@ class IpfsConnectorDummy(IpfsAbstract):
     def connect(self, server='localhost', port=5001, data_dir='../tmp'):
         pass
 
-    def download_file(self, file_address: str):
+    def download_file(self, file_address: str, validator=None):
+        pass
+
+    def download_range(self, file_address: str, offset: int, length: int):
         pass
 
     def upload_file(self, file_name: str):
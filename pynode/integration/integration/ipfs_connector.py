@@ -13,6 +13,8 @@ class IpfsConnector(IpfsAbstract):
     connector = None
     data_dir = None
     chunk_size = 4096
+    # count of first content bytes passed to download validator
+    head_size = 512
 
     logger = logging.getLogger("IpfsConnector")
 
@@ -23,7 +25,10 @@ class IpfsConnector(IpfsAbstract):
         return self.connector
 
     # new version for data downloader implementation
-    def download_file(self, file_address: str):
+    # validator is callable checking first bytes of content, it raises exception to abort transfer
+    def download_file(self, file_address: str, validator=None):
+        head_check = HeadCheck(validator, self.head_size)
+        response = None
         try:
             # for downloading use https getaway
             host_remote = 'https://gateway.ipfs.io/ipfs/'
@@ -37,38 +42,70 @@ class IpfsConnector(IpfsAbstract):
                         str_exception = ex.args[0].args[0]
                         if 'Read timed out' in str(str_exception):
                             self.logger.info('Get file by getaway timed out try get by ipfs API')
-                            return self.connector.get(file_address)
+                            return self.get_checked(file_address, head_check)
 
                 total_length = response.headers.get('content-length')
-
-                if total_length is None:  # no content length header
-                    f.write(response.content)
-                else:
-                    total_iterations = math.ceil(int(total_length) / self.chunk_size)
-                    if total_iterations > 1:
-                        self.print_progress_bar(0,
-                                                total_iterations,
-                                                prefix='Progress:',
-                                                suffix='Complete',
-                                                length=50)
-                    current_iteration = 0
-                    for data in response.iter_content(chunk_size=self.chunk_size):
-                        f.write(data)
-                        current_iteration = current_iteration + 1
+                # content is streamed in both cases, so invalid content is aborted after first chunks
+                total_iterations = math.ceil(int(total_length) / self.chunk_size) if total_length else 0
+                if total_iterations > 1:
+                    self.print_progress_bar(0,
+                                            total_iterations,
+                                            prefix='Progress:',
+                                            suffix='Complete',
+                                            length=50)
+                current_iteration = 0
+                for data in response.iter_content(chunk_size=self.chunk_size):
+                    head_check.feed(data)
+                    f.write(data)
+                    current_iteration = current_iteration + 1
+                    # no content length header, progress is unknown
+                    if total_iterations:
                         self.print_progress_bar(current_iteration,
                                                 total_iterations,
                                                 prefix='Progress:',
                                                 suffix='Complete',
                                                 length=50)
-                    end = time.time()
-                    elapse = end - start
-                    self.logger.info("File size                        : " + str(total_length))
-                    self.logger.info("Operation complete success. time : " + str(elapse))
+                head_check.finish()
+                end = time.time()
+                elapse = end - start
+                self.logger.info("File size                        : " + str(total_length))
+                self.logger.info("Operation complete success. time : " + str(elapse))
         except Exception as ex:
+            if head_check.failed:
+                # invalid content is not kept, transfer is aborted as soon as content is known
+                if response is not None:
+                    response.close()
+                if os.path.isfile(file_address):
+                    os.remove(file_address)
+                self.logger.info("Transfer aborted, invalid content : " + file_address)
+                raise
             self.logger.info("Operation exception.")
             self.logger.info(ex.args)
         return f
 
+    def get_checked(self, file_address: str, head_check):
+        # file downloaded by ipfs API is checked by the same validator after download
+        result = self.connector.get(file_address)
+        with open(file_address, 'rb') as content:
+            head_check.feed(content.read(self.head_size))
+        head_check.finish()
+        return result
+
+    # ranged read of file bytes, returns None if getaway does not support ranges
+    def download_range(self, file_address: str, offset: int, length: int):
+        host_remote = 'https://gateway.ipfs.io/ipfs/'
+        try:
+            headers = {'Range': 'bytes=%d-%d' % (offset, offset + length - 1)}
+            response = requests.get(host_remote + file_address, headers=headers, stream=True, timeout=30)
+            if response.status_code != 206:  # partial content
+                response.close()
+                return None
+            return response.content
+        except Exception as ex:
+            self.logger.info("Ranged read exception.")
+            self.logger.info(ex.args)
+        return None
+
 # old download impl by sync library
 #    def download_file(self, file_address: str):
 #        return self.connector.get(file_address)
@@ -98,3 +135,32 @@ class IpfsConnector(IpfsAbstract):
         # Print New Line on Complete
         #if iteration == total:
             #self.logger.info('\r\n')
+
+
+class HeadCheck:
+    # collects first bytes of downloading content and passes them to validator once
+
+    def __init__(self, validator, head_size: int):
+        self.validator = validator
+        self.head_size = head_size
+        self.head = b''
+        self.checked = validator is None
+        self.failed = False
+
+    def feed(self, data: bytes):
+        if self.checked:
+            return
+        self.head += data[:self.head_size - len(self.head)]
+        if len(self.head) >= self.head_size:
+            self.finish()
+
+    def finish(self):
+        # content is shorter than head size
+        if self.checked:
+            return
+        self.checked = True
+        try:
+            self.validator(self.head)
+        except Exception:
+            self.failed = True
+            raise
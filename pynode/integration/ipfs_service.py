@@ -8,7 +8,11 @@ class IpfsAbstract(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def download_file(self, file_address: str):
+    def download_file(self, file_address: str, validator=None):
+        pass
+
+    @abstractmethod
+    def download_range(self, file_address: str, offset: int, length: int):
         pass
 
     @abstractmethod
@@ -24,8 +28,11 @@ class IpfsService(IpfsAbstract):
     def connect(self, server='localhost', port=5001, data_dir='../tmp'):
         self.strategy.connect(server=server, port=port, data_dir=data_dir)
 
-    def download_file(self, file_address: str):
-        return self.strategy.download_file(file_address=file_address)
+    def download_file(self, file_address: str, validator=None):
+        return self.strategy.download_file(file_address=file_address, validator=validator)
+
+    def download_range(self, file_address: str, offset: int, length: int):
+        return self.strategy.download_range(file_address=file_address, offset=offset, length=length)
 
     def upload_file(self, file_name: str):
         return self.strategy.upload_file(file_name=file_name)
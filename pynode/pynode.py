@@ -166,6 +166,49 @@ def main(argv):
             socket_host = web_section['host']
             socket_port = web_section['port']
             socket_listen = web_section['connections']
+            # processor section is not necessary, defaults are used if absent
+            processor_section = config['Processor'] if config.has_section('Processor') else {}
+            processor_validation_mode = processor_section.get('validation_mode', 'header')
+            processor_scan_values = processor_section.get('scan_values', 'True') == 'True'
+            processor_scan_chunk_rows = int(processor_section.get('scan_chunk_rows', '4096'))
+            processor_scan_workers = int(processor_section.get('scan_workers', '4'))
+            processor_scan_value_limit = processor_section.get('scan_value_limit', 'none')
+            if processor_scan_value_limit == 'none':
+                processor_scan_value_limit = None
+            else:
+                processor_scan_value_limit = float(processor_scan_value_limit)
+            processor_scan_sample = processor_section.get('scan_sample', '16')
+            processor_probe_rows = int(processor_section.get('probe_rows', '8'))
+            processor_read_workers = int(processor_section.get('read_workers', '4'))
+            processor_read_parallel_min_size = int(processor_section.get('read_parallel_min_size', '64'))
+            processor_backend = processor_section.get('backend', 'keras')
+            processor_quantization = processor_section.get('quantization', 'none')
+            processor_quantization_tolerance = float(processor_section.get('quantization_tolerance', '0.01'))
+            processor_quantization_check_rows = int(processor_section.get('quantization_check_rows', '256'))
+            processor_checkpoint_interval = int(processor_section.get('checkpoint_interval', '1'))
+            processor_progress_interval = float(processor_section.get('progress_interval', '1.0'))
+            processor_predict_batch_size = processor_section.get('predict_batch_size', 'auto')
+            processor_batch_memory_limit = int(processor_section.get('batch_memory_limit', '512'))
+            processor_predict_workers = int(processor_section.get('predict_workers', '1'))
+            processor_parallel_min_rows = int(processor_section.get('parallel_min_rows', '10000'))
+            processor_dedup_rows = processor_section.get('dedup_rows', 'False') == 'True'
+            processor_model_cache_size = int(processor_section.get('model_cache_size', '4'))
+            processor_model_cache_memory = int(processor_section.get('model_cache_memory', '1024'))
+            processor_model_store_dir = processor_section.get('model_store_dir', 'model_store')
+            processor_model_store_dir = os.path.abspath(processor_model_store_dir) if processor_model_store_dir else ''
+            processor_model_store_size = int(processor_section.get('model_store_size', '4096'))
+            processor_inference_worker = processor_section.get('inference_worker', 'False') == 'True'
+            processor_worker_max_jobs = int(processor_section.get('worker_max_jobs', '100'))
+            processor_worker_max_memory = int(processor_section.get('worker_max_memory', '4096'))
+            processor_result_chunks = processor_section.get('result_chunks', 'auto')
+            processor_result_compression = processor_section.get('result_compression', 'gzip')
+            processor_result_compression_level = int(processor_section.get('result_compression_level', '4'))
+            processor_result_shuffle = processor_section.get('result_shuffle', 'True') == 'True'
+            processor_result_float16 = processor_section.get('result_float16', 'False') == 'True'
+            # cache directory is resolved before ipfs storage becomes working directory
+            processor_result_cache_dir = processor_section.get('result_cache_dir', 'result_cache')
+            processor_result_cache_dir = os.path.abspath(processor_result_cache_dir) if processor_result_cache_dir else ''
+            processor_result_cache_size = int(processor_section.get('result_cache_size', '1000'))
         except Exception as ex:
             print("Error reading config: %s, exiting", type(ex))
             logging.error(ex.args)
@@ -200,6 +243,40 @@ def main(argv):
     manager.web_socket_host = socket_host
     manager.web_socket_port = socket_port
     manager.web_socket_listeners = socket_listen
+    manager.processor_validation_mode = processor_validation_mode
+    manager.processor_scan_values = processor_scan_values
+    manager.processor_scan_chunk_rows = processor_scan_chunk_rows
+    manager.processor_scan_workers = processor_scan_workers
+    manager.processor_scan_value_limit = processor_scan_value_limit
+    manager.processor_scan_sample = processor_scan_sample
+    manager.processor_probe_rows = processor_probe_rows
+    manager.processor_read_workers = processor_read_workers
+    manager.processor_read_parallel_min_size = processor_read_parallel_min_size
+    manager.processor_backend = processor_backend
+    manager.processor_quantization = processor_quantization
+    manager.processor_quantization_tolerance = processor_quantization_tolerance
+    manager.processor_quantization_check_rows = processor_quantization_check_rows
+    manager.processor_checkpoint_interval = processor_checkpoint_interval
+    manager.processor_progress_interval = processor_progress_interval
+    manager.processor_predict_batch_size = processor_predict_batch_size
+    manager.processor_batch_memory_limit = processor_batch_memory_limit
+    manager.processor_predict_workers = processor_predict_workers
+    manager.processor_parallel_min_rows = processor_parallel_min_rows
+    manager.processor_dedup_rows = processor_dedup_rows
+    manager.processor_model_cache_size = processor_model_cache_size
+    manager.processor_model_cache_memory = processor_model_cache_memory
+    manager.processor_model_store_dir = processor_model_store_dir
+    manager.processor_model_store_size = processor_model_store_size
+    manager.processor_inference_worker = processor_inference_worker
+    manager.processor_worker_max_jobs = processor_worker_max_jobs
+    manager.processor_worker_max_memory = processor_worker_max_memory
+    manager.processor_result_chunks = processor_result_chunks
+    manager.processor_result_compression = processor_result_compression
+    manager.processor_result_compression_level = processor_result_compression_level
+    manager.processor_result_shuffle = processor_result_shuffle
+    manager.processor_result_float16 = processor_result_float16
+    manager.processor_result_cache_dir = processor_result_cache_dir
+    manager.processor_result_cache_size = processor_result_cache_size
 
     print("Pynode production launch")
     print("Node launch mode             : " + str(manager.launch_mode))
@@ -215,6 +292,25 @@ def main(argv):
     print("IPFS port                    : " + str(ipfs_port))
     print("IPFS file storage            : " + str(ipfs_storage))
     print("Web socket enable            : " + str(socket_enable))
+    print("Processor configuration")
+    print("Validation mode              : " + str(processor_validation_mode))
+    print("Scan data values             : " + str(processor_scan_values))
+    print("Scan data sample             : " + str(processor_scan_sample))
+    print("Dry run rows                 : " + str(processor_probe_rows))
+    print("Data read workers            : " + str(processor_read_workers))
+    print("Parallel read min size, MB   : " + str(processor_read_parallel_min_size))
+    print("Prediction backend           : " + str(processor_backend))
+    print("Quantization                 : " + str(processor_quantization))
+    print("Checkpoint interval          : " + str(processor_checkpoint_interval))
+    print("Prediction batch size        : " + str(processor_predict_batch_size))
+    print("Prediction workers           : " + str(processor_predict_workers))
+    print("Rows deduplication           : " + str(processor_dedup_rows))
+    print("Model cache size             : " + str(processor_model_cache_size))
+    print("Model store directory        : " + str(processor_model_store_dir))
+    print("Inference worker process     : " + str(processor_inference_worker))
+    print("Result compression           : " + str(processor_result_compression))
+    print("Result float16 precision     : " + str(processor_result_float16))
+    print("Result cache directory       : " + str(processor_result_cache_dir))
     # inst contracts
     instantiate_contracts(results.abi_path, eth_hooks)
     # launch socket web listener
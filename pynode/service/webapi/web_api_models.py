@@ -117,6 +117,8 @@ class PynodeStatus:
     dataset_address = None
     # ipfs result address from last job
     job_result_address = None
+    # processing metrics of current or last job
+    job_metrics = None
 
     def define_object(self,
                       state: str,
@@ -130,7 +132,8 @@ class PynodeStatus:
                       job_status: str,
                       kernel_address: str,
                       dataset_address: str,
-                      job_result_address: str):
+                      job_result_address: str,
+                      job_metrics: dict = None):
         self.state = state
         self.ethereum_host = ethereum_host
         self.ipfs_host = ipfs_host
@@ -142,5 +145,6 @@ class PynodeStatus:
         self.kernel_address = kernel_address
         self.dataset_address = dataset_address
         self.job_result_address = job_result_address
+        self.job_metrics = job_metrics
 
 
@@ -77,7 +77,8 @@ class WebSocketHandler:
                                job_status=self.manager.job_contract_state,
                                kernel_address=self.manager.job_kernel_ipfs_address,
                                dataset_address=self.manager.job_dataset_ipfs_address,
-                               job_result_address=self.manager.job_result_ipfs_address)
+                               job_result_address=self.manager.job_result_ipfs_address,
+                               job_metrics=self.manager.job_metrics)
         return response
 
 
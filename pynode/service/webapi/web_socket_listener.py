@@ -72,7 +72,8 @@ class WebSocket(threading.Thread):
                                    job_status=manager.job_contract_state,
                                    kernel_address=manager.job_kernel_ipfs_address,
                                    dataset_address=manager.job_dataset_ipfs_address,
-                                   job_result_address=manager.job_result_ipfs_address)
+                                   job_result_address=manager.job_result_ipfs_address,
+                                   job_metrics=manager.job_metrics)
             if self.client is not None:
                 self.client.send(str.encode(ClassApiSerializer().serialize(response)))
         except Exception as ex:
@@ -0,0 +1,103 @@
+import os
+import sys
+import types
+import tempfile
+import unittest
+import requests
+
+from unittest import mock
+
+# ipfsapi is only necessary for production ipfs connections, connector is tested without it
+sys.modules.setdefault('ipfsapi', types.ModuleType('ipfsapi'))
+
+from pynode.integration.ipfs_service import IpfsService
+from pynode.integration.integration.ipfs_connector import IpfsConnector, HeadCheck
+
+
+class TestIpfsConnector(unittest.TestCase):
+
+    def setUp(self):
+        # downloaded files are written to working directory
+        self.cwd = os.getcwd()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        os.chdir(self.temp_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def validator(head: bytes):
+        if not head.startswith(b'HEAD'):
+            raise ValueError('wrong head')
+
+    def test_instantiate(self):
+        connector = IpfsConnector()
+        service = IpfsService(strategic=connector)
+        assert service is not None
+        connector.connector = mock.Mock()
+        connector.connector.add.return_value = {'Hash': 'QmResult'}
+        assert connector.upload_file('result.out.hdf5') == 'QmResult'
+
+    def test_head_check(self):
+        heads = []
+        head_check = HeadCheck(heads.append, head_size=4)
+        head_check.feed(b'ab')
+        head_check.feed(b'cdef')
+        head_check.finish()
+        assert heads == [b'abcd']
+
+    def test_head_check_failure(self):
+        def validator(head):
+            raise ValueError('wrong head')
+        head_check = HeadCheck(validator, head_size=4)
+        with self.assertRaises(ValueError):
+            head_check.feed(b'abcdef')
+        assert head_check.failed
+
+    def test_download_chunked_aborted(self):
+        connector = IpfsConnector()
+        connector.head_size = 8
+        chunks = []
+
+        def iter_content(chunk_size):
+            for chunk in (b'WRONG---', b'content1', b'content2'):
+                chunks.append(chunk)
+                yield chunk
+
+        response = mock.Mock(headers={})
+        response.iter_content = iter_content
+        with mock.patch('requests.get', return_value=response):
+            with self.assertRaises(ValueError):
+                connector.download_file('QmData', validator=self.validator)
+        # response without content length is streamed and aborted on first chunk
+        assert chunks == [b'WRONG---']
+        assert response.close.called
+        assert not os.path.exists('QmData')
+
+    def test_download_chunked(self):
+        connector = IpfsConnector()
+        connector.head_size = 8
+        response = mock.Mock(headers={})
+        response.iter_content = lambda chunk_size: iter((b'HEAD----', b'content'))
+        with mock.patch('requests.get', return_value=response):
+            connector.download_file('QmData', validator=self.validator)
+        with open('QmData', 'rb') as data_file:
+            assert data_file.read() == b'HEAD----content'
+
+    def test_download_timeout_checked(self):
+        connector = IpfsConnector()
+        connector.connector = mock.Mock()
+
+        def get(file_address):
+            with open(file_address, 'wb') as data_file:
+                data_file.write(b'WRONG content')
+
+        connector.connector.get.side_effect = get
+        timeout = requests.exceptions.ConnectionError(Exception('Read timed out'))
+        with mock.patch('requests.get', side_effect=timeout):
+            # file downloaded by ipfs API is checked by validator too
+            with self.assertRaises(ValueError):
+                connector.download_file('QmData', validator=self.validator)
+        assert connector.connector.get.called
+        assert not os.path.exists('QmData')
@@ -0,0 +1,33 @@
+import unittest
+import keras
+import numpy as np
+
+from pynode.core.processor.batch_tuner import BatchTuner
+
+
+class TestBatchTuner(unittest.TestCase):
+
+    def setUp(self):
+        self.model = keras.models.Sequential([keras.layers.Dense(64, input_shape=(32,)),
+                                              keras.layers.Dense(10)])
+        self.data = np.random.RandomState(0).rand(5000, 32).astype(np.float32)
+        BatchTuner.sizes = {}
+
+    def test_row_bytes(self):
+        assert BatchTuner.row_bytes(self.model) == (64 + 10) * 4
+
+    def test_tune(self):
+        tuner = BatchTuner(memory_limit=512)
+        size = tuner.tune(self.model, self.data, 'QmModel')
+        assert BatchTuner.min_size <= size <= 2048
+        # chosen size is cached by model address
+        assert tuner.tune(None, None, 'QmModel') == size
+
+    def test_tune_memory_limit(self):
+        tuner = BatchTuner(memory_limit=1)
+        tuner.memory_limit = 64 * BatchTuner.row_bytes(self.model)
+        assert tuner.tune(self.model, self.data, 'QmModel') <= 64
+
+    def test_tune_small_data(self):
+        assert BatchTuner().tune(self.model, self.data[:20], 'QmModel') <= 32
+        assert 'QmModel' not in BatchTuner.sizes
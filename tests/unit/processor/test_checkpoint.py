@@ -0,0 +1,66 @@
+import unittest
+import tempfile
+import os
+import keras
+import numpy as np
+
+from pynode.core.processor.checkpoint import EpochCheckpoint
+from pynode.core.processor.entities.kernel import Kernel, Dataset
+
+
+class TestEpochCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.temp_dir.name)
+        random = np.random.RandomState(0)
+        self.x = random.normal(size=(64, 4)).astype(np.float32)
+        self.y = random.normal(size=(64, 1)).astype(np.float32)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.temp_dir.cleanup()
+
+    @staticmethod
+    def make_model():
+        model = keras.models.Sequential([keras.layers.Dense(3, input_shape=(4,)), keras.layers.Dense(1)])
+        model.compile(loss='mse', optimizer='adam')
+        return model
+
+    def test_interval(self):
+        model = self.make_model()
+        checkpoint = EpochCheckpoint(EpochCheckpoint.job_file(), epochs=5, interval=2)
+        model.fit(self.x, self.y, batch_size=16, epochs=5, verbose=0, callbacks=[checkpoint])
+        # epochs 2, 4 and last epoch are saved
+        assert checkpoint.stats['writes'] == 3
+        assert checkpoint.stats['last_epoch'] == 5
+        assert checkpoint.stats['bytes'] > 0
+        assert 'out' not in checkpoint.file
+
+        restored, epoch = EpochCheckpoint(checkpoint.file, epochs=5).restore()
+        assert epoch == 5
+        assert np.allclose(restored.predict(self.x), model.predict(self.x))
+        # optimizer state is restored with model
+        assert int(keras.backend.get_value(restored.optimizer.iterations)) == 20
+
+    def test_no_checkpoint(self):
+        model, epoch = EpochCheckpoint(EpochCheckpoint.job_file(), epochs=5).restore()
+        assert model is None and epoch == 0
+
+    def test_kernel_resume(self):
+        dataset = Dataset(dataset_file={}, ipfs_api=None, batch_no=0)
+        dataset.process = 'fit'
+        dataset.loss, dataset.optimizer = 'mse', 'adam'
+        dataset.batch_size, dataset.epochs = 16, 3
+        dataset.train_x_dataset, dataset.train_y_dataset = self.x, self.y
+        # node restart after second epoch
+        model = self.make_model()
+        model.fit(self.x, self.y, batch_size=16, epochs=2, verbose=0,
+                  callbacks=[EpochCheckpoint(EpochCheckpoint.job_file(), epochs=3)])
+
+        kernel = Kernel(kernel_file={}, ipfs_api=None)
+        kernel.model = self.make_model()
+        trained = kernel.inference_training(dataset)
+        assert trained.history.epoch == [2]
+        assert trained.history.history['loss'][0] < model.history.history['loss'][0]
@@ -1,12 +1,39 @@
 import unittest
+import tempfile
 import json
 import os
+import h5py
+import numpy as np
 
 from pynode.core.processor.entities.kernel import Kernel, Dataset
-from pynode.integration.ipfs_service import IpfsService
+from pynode.integration.ipfs_service import IpfsService, IpfsAbstract
 from pynode.integration.dummy.ipfs_connector import IpfsConnectorDummy
 
 
+class IpfsConnectorLocal(IpfsAbstract):
+    # serves ranged reads from local files
+
+    def __init__(self):
+        self.ranges = []
+
+    def connect(self, server='localhost', port=5001, data_dir='../tmp'):
+        pass
+
+    def download_file(self, file_address: str, validator=None):
+        if validator is not None:
+            with open(file_address, 'rb') as data_file:
+                validator(data_file.read(512))
+
+    def download_range(self, file_address: str, offset: int, length: int):
+        self.ranges.append((offset, length))
+        with open(file_address, 'rb') as data_file:
+            data_file.seek(offset)
+            return data_file.read(length)
+
+    def upload_file(self, file_name: str):
+        pass
+
+
 class TestDataset(unittest.TestCase):
 
     # test_dataset_1.json - simple dataset for training
@@ -76,3 +103,138 @@ class TestDataset(unittest.TestCase):
                           ipfs_api=self.test_ipfs_instance,
                           batch_no=0)
         assert dataset.init_dataset() is True  # inference predict strategy
+
+    def test_init_dataset_for_multiple_batches(self):
+        dataset = Dataset(dataset_file=self.dataset_2_file,
+                          ipfs_api=self.test_ipfs_instance,
+                          batch_no=range(0, 2))
+        assert dataset.init_dataset() is True
+        assert dataset.batches_no == [0, 1]
+        assert dataset.data_addresses == ['QmYhL15VowVXhUPms1VhTcmeVBjxWZhNEQ5kpdo5kBoPYY',
+                                          'QmWFKhJK4fuE2ixnyysRVnRk4WAcvGVpHPpvsUTNn4zKLW']
+        assert dataset.data_address == 'QmYhL15VowVXhUPms1VhTcmeVBjxWZhNEQ5kpdo5kBoPYY'
+        assert dataset.process == 'predict'
+
+    def test_fail_init_dataset_for_wrong_batch(self):
+        dataset = Dataset(dataset_file=self.dataset_2_file,
+                          ipfs_api=self.test_ipfs_instance,
+                          batch_no=[1, 2])
+        assert dataset.init_dataset() is False
+
+    def test_read_multiple_batches(self):
+        dataset = Dataset(dataset_file=self.dataset_2_file,
+                          ipfs_api=self.test_ipfs_instance,
+                          batch_no=[0, 1])
+        dataset.init_dataset()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            addresses = []
+            for batch_no in dataset.batches_no:
+                address = os.path.join(temp_dir, 'batch_' + str(batch_no))
+                with h5py.File(address, 'w') as h5f:
+                    h5f.create_dataset('batches', data=np.full((3, 4), batch_no))
+                addresses.append(address)
+            dataset.data_addresses = addresses
+            datasets = dataset.read_dataset()
+        assert len(datasets) == 2
+        assert np.array_equal(datasets[0], np.zeros((3, 4)))
+        assert np.array_equal(datasets[1], np.ones((3, 4)))
+
+    def test_init_dataset_for_rows_ranges(self):
+        dataset = Dataset(dataset_file={'batches': {'file': 'QmYhL15VowVXhUPms1VhTcmeVBjxWZhNEQ5kpdo5kBoPYY',
+                                                    'ranges': [[0, 10], [10, 20], [20, 25]]}},
+                          ipfs_api=self.test_ipfs_instance,
+                          batch_no=[0, 2])
+        assert dataset.init_dataset() is True
+        assert dataset.data_addresses == ['QmYhL15VowVXhUPms1VhTcmeVBjxWZhNEQ5kpdo5kBoPYY',
+                                          'QmYhL15VowVXhUPms1VhTcmeVBjxWZhNEQ5kpdo5kBoPYY']
+        assert dataset.data_rows == [(0, 10), (20, 25)]
+        assert dataset.process == 'predict'
+
+    def test_read_rows_ranges(self):
+        data = np.arange(100).reshape((25, 4))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            address = os.path.join(temp_dir, 'shared')
+            with h5py.File(address, 'w') as h5f:
+                h5f.create_dataset('batches', data=data)
+            dataset = Dataset(dataset_file={'batches': {'file': address, 'ranges': [[0, 10], [10, 20], [20, 25]]}},
+                              ipfs_api=self.test_ipfs_instance,
+                              batch_no=[1, 2])
+            dataset.init_dataset()
+            headers = dataset.inspect_dataset()
+            datasets = dataset.read_dataset()
+        assert headers['batches'] == [((10, 4), data.dtype), ((5, 4), data.dtype)]
+        assert np.array_equal(datasets[0], data[10:20])
+        assert np.array_equal(datasets[1], data[20:25])
+
+    def test_read_rows_ranges_out_of_data(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            address = os.path.join(temp_dir, 'shared')
+            with h5py.File(address, 'w') as h5f:
+                h5f.create_dataset('batches', data=np.zeros((25, 4)))
+            dataset = Dataset(dataset_file={'batches': {'file': address, 'ranges': [[20, 30]]}},
+                              ipfs_api=self.test_ipfs_instance,
+                              batch_no=0)
+            dataset.init_dataset()
+            with self.assertRaises(Exception):
+                dataset.inspect_dataset()
+
+    def test_read_rows_ranges_remotely(self):
+        data = np.arange(100, dtype=np.float32).reshape((25, 2, 2))
+        connector = IpfsConnectorLocal()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            address = os.path.join(temp_dir, 'shared')
+            with open(address, 'wb') as npy_file:
+                np.save(npy_file, data)
+            dataset = Dataset(dataset_file={'batches': {'file': address, 'ranges': [[0, 10], [10, 20], [20, 25]]}},
+                              ipfs_api=IpfsService(strategic=connector),
+                              batch_no=1)
+            assert dataset.init_dataset() is True
+            # batch rows are stored in separate local file
+            assert dataset.data_address == address + '.10-20'
+            assert dataset.data_rows == [None]
+            datasets = dataset.read_dataset()
+            assert np.array_equal(datasets[0], data[10:20])
+        # only rows range of data is transferred
+        assert connector.ranges[-1] == (128 + 10 * 16, 10 * 16)
+
+    def test_invalid_download(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            address = os.path.join(temp_dir, 'batch')
+            with open(address, 'wb') as data_file:
+                data_file.write(b'<html><body>404 Not Found</body></html>')
+            dataset = Dataset(dataset_file={'batches': [address]},
+                              ipfs_api=IpfsService(strategic=IpfsConnectorLocal()),
+                              batch_no=0)
+            assert dataset.init_dataset() is False
+
+    def test_read_preprocessed_dataset(self):
+        data = np.arange(32).reshape((2, 16))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            address = os.path.join(temp_dir, 'batch')
+            with h5py.File(address, 'w') as h5f:
+                h5f.create_dataset('batches', data=data)
+            dataset = Dataset(dataset_file={'batches': [address],
+                                            'options': {'preprocessing': {
+                                                'x': [{'op': 'scale', 'scale': 0.5},
+                                                      {'op': 'reshape', 'shape': [4, 4]}]}}},
+                              ipfs_api=self.test_ipfs_instance,
+                              batch_no=0)
+            assert dataset.init_dataset() is True
+            headers = dataset.inspect_dataset()
+            datasets = dataset.read_dataset()
+        assert headers['batches'] == [((2, 4, 4), np.float32)]
+        assert np.array_equal(datasets[0], (data * 0.5).reshape((2, 4, 4)))
+
+    def test_fail_init_dataset_wrong_preprocessing(self):
+        dataset = Dataset(dataset_file={'batches': [''],
+                                        'options': {'preprocessing': {'x': [{'op': 'unknown'}]}}},
+                          ipfs_api=self.test_ipfs_instance,
+                          batch_no=0)
+        assert dataset.init_dataset() is False
+
+    def test_fail_init_dataset_wrong_output(self):
+        dataset = Dataset(dataset_file={'batches': [''],
+                                        'options': {'output': [{'op': 'top_k'}]}},
+                          ipfs_api=self.test_ipfs_instance,
+                          batch_no=0)
+        assert dataset.init_dataset() is False
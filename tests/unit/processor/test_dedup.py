@@ -0,0 +1,61 @@
+import unittest
+import tempfile
+import os
+import keras
+import numpy as np
+
+from pynode.core.processor.dedup import unique_rows
+from pynode.core.processor.entities.kernel import Kernel
+
+
+class TestDedup(unittest.TestCase):
+
+    def setUp(self):
+        random = np.random.RandomState(0)
+        # 100 rows with 10 distinct values
+        self.data = random.rand(10, 4, 3)[random.randint(0, 10, size=100)]
+
+    def test_unique_rows(self):
+        indices, inverse = unique_rows(self.data)
+        assert indices.shape[0] == 10
+        # unique rows are in order of first occurrence
+        assert np.array_equal(indices, np.sort(indices))
+        assert np.array_equal(self.data[indices][inverse], self.data)
+
+    def test_unique_rows_blocks(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            data = np.memmap(os.path.join(temp_dir, 'data'), dtype=np.float64, mode='w+', shape=self.data.shape)
+            data[:] = self.data
+            # duplicates are found across blocks of rows
+            indices, inverse = unique_rows(data, block_rows=7)
+            expected_indices, expected_inverse = unique_rows(self.data)
+            assert np.array_equal(indices, expected_indices)
+            assert np.array_equal(inverse, expected_inverse)
+            del data
+
+    def test_unique_rows_all_unique(self):
+        data = np.arange(12, dtype=np.float32).reshape((4, 3))
+        indices, inverse = unique_rows(data)
+        assert np.array_equal(indices, np.arange(4))
+        assert np.array_equal(inverse, np.arange(4))
+
+    def test_predict_unique(self):
+        kernel = Kernel(kernel_file={}, ipfs_api=None)
+        kernel.model = keras.models.Sequential([keras.layers.Flatten(input_shape=(4, 3)),
+                                                keras.layers.Dense(2)])
+        result = kernel.predict_unique(self.data, batch_size=32)
+        assert np.allclose(result, kernel.model.predict(self.data, batch_size=32), atol=1e-6)
+        assert kernel.dedup_stats == {'rows': 100, 'unique_rows': 10}
+
+    def test_predict_unique_several_outputs(self):
+        kernel = Kernel(kernel_file={}, ipfs_api=None)
+        inputs = keras.layers.Input(shape=(4, 3))
+        flatten = keras.layers.Flatten()(inputs)
+        kernel.model = keras.models.Model(inputs=inputs, outputs=[keras.layers.Dense(2)(flatten),
+                                                                  keras.layers.Dense(1)(flatten)])
+        result = kernel.predict_unique(self.data, batch_size=32)
+        expected = kernel.model.predict(self.data, batch_size=32)
+        assert len(result) == 2
+        assert all(np.allclose(output, expected_output, atol=1e-6) for output, expected_output in zip(result, expected))
+        # model with several outputs is run on all rows
+        assert kernel.dedup_stats == {'rows': 0, 'unique_rows': 0}
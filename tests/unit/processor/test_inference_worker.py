@@ -0,0 +1,72 @@
+import unittest
+import tempfile
+import os
+import keras
+import numpy as np
+
+from pynode.core.processor.entities.kernel import Kernel, Dataset
+from pynode.core.processor.inference_worker import InferenceWorker
+
+
+class TestInferenceWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        model = keras.models.Sequential([keras.layers.Dense(3, input_shape=(8,))])
+        self.model_file = os.path.join(self.temp_dir.name, 'model')
+        self.weights_file = os.path.join(self.temp_dir.name, 'weights.h5')
+        with open(self.model_file, 'w') as json_file:
+            json_file.write(model.to_json())
+        model.save_weights(self.weights_file)
+        self.data = np.random.RandomState(0).rand(20, 8).astype(np.float32)
+        self.expected = model.predict(self.data)
+        InferenceWorker._InferenceWorker__instance = None
+        self.worker = InferenceWorker(max_jobs=2)
+
+    def tearDown(self):
+        self.worker.stop()
+        InferenceWorker._InferenceWorker__instance = None
+        self.temp_dir.cleanup()
+
+    def make_entities(self) -> tuple:
+        kernel = Kernel(kernel_file={}, ipfs_api=None)
+        kernel.model_address = self.model_file
+        kernel.weights_address = self.weights_file
+        dataset = Dataset(dataset_file={}, ipfs_api=None, batch_no=0)
+        dataset.process = 'predict'
+        dataset.loss = 'mse'
+        dataset.optimizer = 'sgd'
+        dataset.datasets = [self.data]
+        return kernel, dataset
+
+    def test_predict_and_recycle(self):
+        kernel, dataset = self.make_entities()
+        self.worker.load(kernel, dataset)
+        pid = self.worker.process.pid
+        for _ in range(2):
+            result = self.worker.predict(kernel, dataset)
+            assert np.allclose(result[0], self.expected, atol=1e-5)
+        # model is loaded once in worker process
+        assert self.worker.manager.job_metrics['model_cache']['hits'] == 2
+        # worker is recycled after max jobs count, new process is started on demand
+        assert self.worker.process is None
+        self.worker.load(kernel, dataset)
+        assert self.worker.process.pid != pid
+
+    def test_predict_failure(self):
+        kernel, dataset = self.make_entities()
+        kernel.model_address = os.path.join(self.temp_dir.name, 'missing')
+        with self.assertRaises(Exception) as context:
+            self.worker.predict(kernel, dataset)
+        assert type(context.exception).__name__ == 'ModelInconsistencyError'
+        # worker process survives failed request
+        assert self.worker.alive
+
+    def test_predict_batch_size(self):
+        kernel, dataset = self.make_entities()
+        dataset.predict_batch_size = 5
+        result = self.worker.predict(kernel, dataset)
+        assert np.allclose(result[0], self.expected, atol=1e-5)
+        # batch size of dataset options is used by worker process
+        metrics = self.worker.manager.job_metrics['prediction_progress']
+        assert metrics['steps'] == 4 and metrics['batch'] == 4
@@ -0,0 +1,67 @@
+import unittest
+
+from pynode.core.processor.model_cache import ModelCache
+from pynode.core.processor.entities import kernel as kernel_module
+
+
+class ModelStub:
+
+    def __init__(self, params: int):
+        self.params = params
+
+    def count_params(self):
+        return self.params
+
+
+class TestModelCache(unittest.TestCase):
+
+    def setUp(self):
+        # new cache instance for each test
+        ModelCache._ModelCache__instance = None
+        self.cache = ModelCache(size=2, memory=1)
+
+    def tearDown(self):
+        ModelCache._ModelCache__instance = None
+
+    def test_lru_eviction(self):
+        models = [ModelStub(10) for _ in range(3)]
+        self.cache.put(('m0', 'w0'), models[0])
+        self.cache.put(('m1', 'w1'), models[1])
+        # m0 becomes recently used, so m1 is evicted
+        assert self.cache.get(('m0', 'w0')) is models[0]
+        self.cache.put(('m2', 'w2'), models[2])
+        assert self.cache.get(('m1', 'w1')) is None
+        assert self.cache.get(('m2', 'w2')) is models[2]
+        # other weights is other model
+        assert self.cache.get(('m2', 'w0')) is None
+        assert self.cache.stats == {'hits': 2, 'misses': 2, 'cold_misses': 1, 'evicted_misses': 1, 'evictions': 1}
+
+    def test_memory_eviction(self):
+        # 1 megabyte of memory holds 262144 float32 parameters
+        self.cache.put(('m0', 'w0'), ModelStub(200000))
+        self.cache.put(('m1', 'w1'), ModelStub(100000))
+        assert list(self.cache.models) == [('m1', 'w1')]
+        assert self.cache.used_bytes == 400000
+        # model larger than cache memory is not cached
+        self.cache.put(('m2', 'w2'), ModelStub(300000))
+        assert ('m2', 'w2') not in self.cache.models
+
+    def test_disabled_cache(self):
+        self.cache.size = 0
+        self.cache.put(('m0', 'w0'), ModelStub(10))
+        assert self.cache.enabled is False
+        assert self.cache.get(('m0', 'w0')) is None
+
+    def test_kernel_training_session(self):
+        kernel_module.ModelCache._ModelCache__instance = None
+        cache = kernel_module.ModelCache(size=2, memory=1)
+        try:
+            cache.put(('m0', 'w0'), ModelStub(10))
+            kernel = kernel_module.Kernel(kernel_file={}, ipfs_api=None)
+            kernel.model = ModelStub(10)
+            # enabled cache does not keep graph of training job
+            kernel.clear_training_session()
+            assert cache.get(('m0', 'w0')) is None
+            assert kernel.model is None
+        finally:
+            kernel_module.ModelCache._ModelCache__instance = None
@@ -0,0 +1,74 @@
+import unittest
+import tempfile
+import os
+import keras
+import numpy as np
+
+# store and cache singletons are taken from kernel module, so tests reset instances used by kernel
+from pynode.core.processor.entities.kernel import Kernel, Dataset, ModelStore, ModelCache
+
+
+class TestModelStore(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = ModelStore(directory=os.path.join(self.temp_dir.name, 'store'), size=1)
+
+    def tearDown(self):
+        ModelStore._ModelStore__instance = None
+        ModelCache.get_instance().clear()
+        self.temp_dir.cleanup()
+
+    def test_put_load(self):
+        weights = [np.arange(12, dtype=np.float32).reshape((3, 4)), np.zeros(0, dtype=np.float32),
+                   np.arange(5, dtype=np.int64)]
+        self.store.put(('QmModel', 'QmWeights'), '{"class_name": "Sequential"}', weights)
+        # local paths of same ipfs addresses have same key
+        architecture, loaded = self.store.load(('/tmp/QmModel', '/data/QmWeights'))
+        assert architecture == '{"class_name": "Sequential"}'
+        assert all(np.array_equal(expected, array) and expected.dtype == array.dtype
+                   for expected, array in zip(weights, loaded))
+        assert isinstance(loaded[0].base, np.memmap)
+        assert self.store.load(('QmModel', 'QmOther')) == (None, None)
+
+    def test_eviction(self):
+        weights = [np.zeros((400, 1000), dtype=np.float32)]
+        self.store.put(('QmModel1', 'QmWeights'), '{}', weights)
+        self.store.put(('QmModel2', 'QmWeights'), '{}', weights)
+        assert self.store.load(('QmModel1', 'QmWeights')) == (None, None)
+        assert self.store.load(('QmModel2', 'QmWeights'))[0] == '{}'
+        assert self.store.stats['evictions'] == 1
+
+    def load_kernel(self, model_file: str, weights_file: str, dataset: Dataset) -> Kernel:
+        kernel = Kernel(kernel_file={}, ipfs_api=None)
+        kernel.model_address = model_file
+        kernel.weights_address = weights_file
+        kernel.read_model(dataset)
+        kernel.prepare_model(dataset)
+        return kernel
+
+    def test_kernel_cold_load(self):
+        model = keras.models.Sequential([keras.layers.Dense(8, input_shape=(4,), activation='relu'),
+                                         keras.layers.Dense(2)])
+        model_file = os.path.join(self.temp_dir.name, 'QmModel')
+        weights_file = os.path.join(self.temp_dir.name, 'QmWeights')
+        with open(model_file, 'w') as json_file:
+            json_file.write(model.to_json())
+        model.save_weights(weights_file)
+        data = np.random.RandomState(0).normal(size=(10, 4)).astype(np.float32)
+        dataset = Dataset(dataset_file={}, ipfs_api=None, batch_no=0)
+        dataset.process = 'predict'
+
+        kernel = self.load_kernel(model_file, weights_file, dataset)
+        assert kernel.model_source == 'ipfs'
+        for backend in ('keras', 'numpy'):
+            # node restart drops memory cache
+            ModelCache.get_instance().clear()
+            kernel.manager.processor_backend = backend
+            try:
+                kernel = self.load_kernel(model_file, weights_file, dataset)
+            finally:
+                kernel.manager.processor_backend = 'keras'
+            assert kernel.model_source == 'disk'
+            assert np.allclose(kernel.model.predict(data, batch_size=10), model.predict(data), atol=1e-5)
+            assert kernel.manager.job_metrics['model_load']['source'] == 'disk'
@@ -0,0 +1,120 @@
+import unittest
+import tempfile
+import json
+import os
+import keras
+import numpy as np
+
+from unittest import mock
+
+from pynode.core.processor.numpy_executor import NumpyExecutor
+from pynode.core.processor.entities.kernel import Kernel, Dataset, MinibatchSequence
+from pynode.core.processor.sparse import CsrMatrix
+
+
+class TestNumpyExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.weights_file = os.path.join(self.temp_dir.name, 'weights.h5')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_executor(self, model) -> NumpyExecutor:
+        model.save_weights(self.weights_file)
+        executor = NumpyExecutor(json.loads(model.to_json()))
+        executor.load_weights(self.weights_file)
+        return executor
+
+    def test_parity_dense(self):
+        model = keras.models.Sequential([keras.layers.Dense(32, input_shape=(20,), activation='relu'),
+                                         keras.layers.Dropout(0.5),
+                                         keras.layers.Dense(16, activation='tanh'),
+                                         keras.layers.Dense(8, activation='elu'),
+                                         keras.layers.Dense(10),
+                                         keras.layers.Activation('softmax')])
+        data = np.random.RandomState(0).normal(size=(130, 20)).astype(np.float32)
+        executor = self.make_executor(model)
+        assert executor.output_shape == model.output_shape
+        assert executor.count_params() == model.count_params()
+        assert np.allclose(executor.predict(data, batch_size=64), model.predict(data), atol=1e-5)
+
+    def test_parity_flatten(self):
+        model = keras.models.Sequential([keras.layers.Flatten(input_shape=(4, 5)),
+                                         keras.layers.Dense(6, activation='sigmoid'),
+                                         keras.layers.Dense(3, activation='softplus', use_bias=False),
+                                         keras.layers.Activation('selu')])
+        data = np.random.RandomState(1).normal(size=(50, 4, 5)).astype(np.float32)
+        executor = self.make_executor(model)
+        assert np.allclose(executor.predict(data, batch_size=16), model.predict(data), atol=1e-5)
+
+    def test_parity_sparse(self):
+        model = keras.models.Sequential([keras.layers.Dense(6, input_shape=(5,), activation='relu'),
+                                         keras.layers.Dense(3)])
+        random = np.random.RandomState(2)
+        dense = random.normal(size=(10, 5)).astype(np.float32) * (random.uniform(size=(10, 5)) > 0.5)
+        rows, columns = np.nonzero(dense)
+        sparse = CsrMatrix(dense[rows, columns], columns, np.searchsorted(rows, np.arange(11)), dense.shape)
+        executor = self.make_executor(model)
+        kernel = Kernel(kernel_file={}, ipfs_api=None)
+        kernel.model = executor
+        # each minibatch result is kept, buffers are reused by next minibatch
+        result = kernel.predict_sequence(MinibatchSequence(sparse, batch_size=4))
+        assert np.allclose(result, model.predict(dense), atol=1e-5)
+        first = executor.predict_on_batch(dense[:4])
+        executor.predict_on_batch(dense[4:8])
+        assert np.allclose(first, model.predict(dense[:4]), atol=1e-5)
+
+    def test_unsupported_layer(self):
+        model = keras.models.Sequential([keras.layers.Conv1D(2, 3, input_shape=(8, 1)),
+                                         keras.layers.Flatten(),
+                                         keras.layers.Dense(2)])
+        with self.assertRaises(Exception) as context:
+            NumpyExecutor(json.loads(model.to_json()))
+        assert type(context.exception).__name__ == 'ModelInconsistencyError'
+
+    def test_kernel_backend(self):
+        dataset = Dataset(dataset_file={}, ipfs_api=None, batch_no=0)
+        dataset.process = 'predict'
+        model_file = os.path.join(self.temp_dir.name, 'model')
+        for model, backend in ((keras.models.Sequential([keras.layers.Dense(2, input_shape=(3,))]), 'NumpyExecutor'),
+                               (keras.models.Sequential([keras.layers.Conv1D(2, 3, input_shape=(8, 1))]), 'Sequential')):
+            with open(model_file, 'w') as json_file:
+                json_file.write(model.to_json())
+            model.save_weights(self.weights_file)
+            kernel = Kernel(kernel_file={}, ipfs_api=None)
+            kernel.model_address = model_file
+            kernel.weights_address = self.weights_file
+            kernel.manager.processor_backend = 'numpy'
+            try:
+                # unsupported model falls back to keras
+                assert type(kernel.read_model(dataset)).__name__ == backend
+            finally:
+                kernel.manager.processor_backend = 'keras'
+
+    def test_kernel_parallel_fallback(self):
+        dataset = Dataset(dataset_file={}, ipfs_api=None, batch_no=0)
+        dataset.process = 'predict'
+        model = keras.models.Sequential([keras.layers.Dense(2, input_shape=(3,))])
+        model_file = os.path.join(self.temp_dir.name, 'model')
+        with open(model_file, 'w') as json_file:
+            json_file.write(model.to_json())
+        model.save_weights(self.weights_file)
+        data = np.random.RandomState(3).rand(20, 3).astype(np.float32)
+        kernel = Kernel(kernel_file={}, ipfs_api=None)
+        kernel.model_address = model_file
+        kernel.weights_address = self.weights_file
+        kernel.manager.processor_backend = 'numpy'
+        kernel.manager.processor_predict_workers = 2
+        kernel.manager.processor_parallel_min_rows = 10
+        try:
+            kernel.read_model(dataset)
+            # numpy executed model is not reloaded by keras workers
+            with mock.patch('os.cpu_count', return_value=4):
+                assert np.allclose(kernel.forward(data, batch_size=8), model.predict(data), atol=1e-5)
+            assert kernel.parallel_predictor is None
+        finally:
+            kernel.manager.processor_backend = 'keras'
+            kernel.manager.processor_predict_workers = 1
+            kernel.manager.processor_parallel_min_rows = 10000
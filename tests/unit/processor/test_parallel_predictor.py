@@ -0,0 +1,85 @@
+import unittest
+import tempfile
+import os
+import keras
+import numpy as np
+
+from unittest import mock
+from pynode.core.processor.entities.kernel import Kernel
+from pynode.core.processor.parallel_predictor import split_shards, scaling, ParallelPredictor
+
+
+class TestParallelPredictor(unittest.TestCase):
+
+    def test_split_shards(self):
+        assert split_shards(10, 3) == [(0, 3), (3, 6), (6, 10)]
+        assert split_shards(2, 4) == [(0, 1), (1, 2)]
+        # shards are split by whole minibatches
+        assert split_shards(100, 3, align=32) == [(0, 32), (32, 64), (64, 100)]
+
+    def test_predict_parallel(self):
+        model = keras.models.Sequential([keras.layers.Dense(4, input_shape=(6,))])
+        data = np.random.RandomState(0).rand(300, 6).astype(np.float32)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            model_file = os.path.join(temp_dir, 'model')
+            weights_file = os.path.join(temp_dir, 'weights.h5')
+            with open(model_file, 'w') as json_file:
+                json_file.write(model.to_json())
+            model.save_weights(weights_file)
+            predictor = ParallelPredictor(model_file, weights_file, workers=2)
+            try:
+                result = predictor.predict(model, data, batch_size=50)
+            finally:
+                predictor.close()
+        assert np.allclose(result, model.predict(data), atol=1e-5)
+        assert scaling[2]['rows'] == 300
+        assert scaling[2]['efficiency'] > 0
+
+    def test_pool_reused(self):
+        model = keras.models.Sequential([keras.layers.Dense(3, input_shape=(5,))])
+        random = np.random.RandomState(1)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            model_file = os.path.join(temp_dir, 'model')
+            weights_file = os.path.join(temp_dir, 'weights.h5')
+            with open(model_file, 'w') as json_file:
+                json_file.write(model.to_json())
+            model.save_weights(weights_file)
+            predictor = ParallelPredictor(model_file, weights_file, workers=2)
+            try:
+                # batches of different sizes are predicted by one pool
+                for rows in (120, 77):
+                    data = random.rand(rows, 5).astype(np.float32)
+                    assert np.allclose(predictor.predict(model, data, batch_size=32), model.predict(data), atol=1e-5)
+                pool = predictor.pool
+                predictor.predict(model, random.rand(10, 5).astype(np.float32), batch_size=32)
+                assert predictor.pool is pool
+            finally:
+                predictor.close()
+        assert predictor.pool is None and predictor.directory is None
+        # efficiency includes processes start and model loading
+        assert scaling[2]['rows'] == 207
+
+    def test_kernel_parallel(self):
+        model = keras.models.Sequential([keras.layers.Dense(3, input_shape=(5,))])
+        data = np.random.RandomState(2).rand(100, 5).astype(np.float32)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            kernel = Kernel(kernel_file={}, ipfs_api=None)
+            kernel.model = model
+            kernel.model_address = os.path.join(temp_dir, 'model')
+            kernel.weights_address = os.path.join(temp_dir, 'weights.h5')
+            with open(kernel.model_address, 'w') as json_file:
+                json_file.write(model.to_json())
+            model.save_weights(kernel.weights_address)
+            kernel.manager.processor_predict_workers = 2
+            kernel.manager.processor_parallel_min_rows = 50
+            try:
+                # job batches are predicted by parallel predictor of kernel
+                with mock.patch('os.cpu_count', return_value=4):
+                    assert np.allclose(kernel.forward(data, batch_size=32), model.predict(data), atol=1e-5)
+                    assert kernel.parallel_predictor is not None
+                    assert kernel.manager.job_metrics['parallel_predict']['2']['rows'] >= 100
+            finally:
+                kernel.close_parallel_predictor()
+                kernel.manager.processor_predict_workers = 1
+                kernel.manager.processor_parallel_min_rows = 10000
+        assert kernel.parallel_predictor is None
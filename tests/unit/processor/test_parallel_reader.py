@@ -0,0 +1,67 @@
+import unittest
+import tempfile
+import os
+import h5py
+import numpy as np
+
+from pynode.core.processor.parallel_reader import split_rows
+from pynode.core.processor.readers import Hdf5Reader, ParallelReader
+
+
+class TestParallelReader(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data = np.random.RandomState(0).normal(size=(1000, 8)).astype(np.float32)
+        self.file_address = os.path.join(self.temp_dir.name, 'batches.h5')
+        with h5py.File(self.file_address, 'w') as h5f:
+            h5f.create_dataset('batches', data=self.data, chunks=(64, 8), compression='gzip')
+        ParallelReader._ParallelReader__instance = None
+        self.reader = ParallelReader(min_size=0)
+
+    def tearDown(self):
+        self.reader.close()
+        ParallelReader._ParallelReader__instance = None
+        self.temp_dir.cleanup()
+
+    def test_split_rows(self):
+        assert split_rows(0, 256, 64, 2) == [(0, 128), (128, 256)]
+        # parts bounds are aligned by chunks grid
+        assert split_rows(10, 200, 64, 4) == [(10, 64), (64, 128), (128, 192), (192, 200)]
+        assert split_rows(10, 20, 64, 4) == [(10, 20)]
+
+    def test_read_parallel(self):
+        data = self.reader.read(self.file_address, 'batches', (1000, 8), 0, 64, workers=3)
+        assert data.dtype == np.float64
+        assert np.array_equal(data, self.data)
+
+    def test_read_parallel_rows(self):
+        data = self.reader.read(self.file_address, 'batches', (300, 8), 100, 64, workers=2)
+        assert np.array_equal(data, self.data[100:400])
+
+    def test_pool_reused(self):
+        first = self.reader.read(self.file_address, 'batches', (300, 8), 0, 64, workers=2)
+        pool = self.reader.pool
+        second = self.reader.read(self.file_address, 'batches', (500, 8), 500, 64, workers=2)
+        # data of job files is read by one pool, earlier data is not overwritten
+        assert self.reader.pool is pool
+        assert np.array_equal(first, self.data[:300])
+        assert np.array_equal(second, self.data[500:])
+        self.reader.close()
+        assert self.reader.pool is None and self.reader.directory is None
+        assert np.array_equal(first, self.data[:300])
+
+    def test_reader_parallel(self):
+        reader = Hdf5Reader()
+        reader.workers = 2
+        assert np.array_equal(reader.read(self.file_address, 'batches'), self.data)
+        assert np.array_equal(reader.read(self.file_address, 'batches', (500, 1000)), self.data[500:])
+        assert self.reader.pool is not None
+
+    def test_reader_small_data_serial(self):
+        reader = Hdf5Reader()
+        reader.workers = 2
+        self.reader.min_size = 1024 * 1024
+        # processes are not started for data smaller than min size
+        assert np.array_equal(reader.read(self.file_address, 'batches'), self.data)
+        assert self.reader.pool is None
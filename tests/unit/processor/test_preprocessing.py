@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+
+from pynode.core.processor.preprocessing import Preprocessor
+
+
+class TestPreprocessing(unittest.TestCase):
+
+    def setUp(self):
+        self.data = np.random.RandomState(0).randint(0, 256, size=(100, 16)).astype(np.uint8)
+
+    def test_scale_and_clip(self):
+        preprocessor = Preprocessor([{'op': 'scale', 'scale': 1 / 255, 'shift': -0.5},
+                                     {'op': 'clip', 'min': -0.25, 'max': 0.25}])
+        result = preprocessor.transform(self.data, block_rows=7)
+        expected = np.clip(self.data / 255 - 0.5, -0.25, 0.25)
+        assert result.shape == (100, 16)
+        assert np.allclose(result, expected, atol=1e-6)
+
+    def test_standardize(self):
+        mean = self.data.mean(axis=0)
+        std = self.data.std(axis=0)
+        preprocessor = Preprocessor([{'op': 'standardize', 'mean': mean.tolist(), 'std': std.tolist()}])
+        result = preprocessor.transform(self.data, block_rows=30)
+        assert np.allclose(result.mean(axis=0), 0, atol=1e-4)
+        assert np.allclose(result.std(axis=0), 1, atol=1e-4)
+
+    def test_reshape(self):
+        preprocessor = Preprocessor([{'op': 'reshape', 'shape': [4, 4, 1]}])
+        assert preprocessor.output_shape((100, 16)) == (100, 4, 4, 1)
+        result = preprocessor.transform(self.data, block_rows=30)
+        assert np.array_equal(result, self.data.reshape((100, 4, 4, 1)))
+
+    def test_wrong_reshape(self):
+        preprocessor = Preprocessor([{'op': 'reshape', 'shape': [5, 5]}])
+        with self.assertRaises(Exception):
+            preprocessor.output_shape((100, 16))
+
+    def test_one_hot(self):
+        labels = np.array([[0], [2], [1], [2]])
+        preprocessor = Preprocessor([{'op': 'one_hot', 'classes': 3}])
+        result = preprocessor.transform(labels, block_rows=3)
+        assert np.array_equal(result, np.eye(3)[[0, 2, 1, 2]])
+
+    def test_one_hot_out_of_classes(self):
+        preprocessor = Preprocessor([{'op': 'one_hot', 'classes': 2}])
+        with self.assertRaises(Exception):
+            preprocessor.transform(np.array([0, 1, 2]), block_rows=3)
+
+    def test_unknown_operation(self):
+        with self.assertRaises(Exception):
+            Preprocessor([{'op': 'fft'}])
@@ -0,0 +1,78 @@
+import unittest
+import keras
+import numpy as np
+
+from pynode.core.processor.progress import ProgressMonitor
+from pynode.core.processor.entities.kernel import Kernel
+
+
+class CountingMonitor(ProgressMonitor):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.reports = 0
+
+    def report(self, force: bool = False):
+        last_report = self.last_report
+        super().report(force)
+        if self.last_report != last_report:
+            self.reports += 1
+
+
+class TestProgressMonitor(unittest.TestCase):
+
+    def setUp(self):
+        random = np.random.RandomState(0)
+        self.x = random.normal(size=(100, 4)).astype(np.float32)
+        self.y = random.normal(size=(100, 1)).astype(np.float32)
+        self.model = keras.models.Sequential([keras.layers.Dense(1, input_shape=(4,))])
+        self.model.compile(loss='mse', optimizer='sgd')
+
+    def test_training(self):
+        monitor = CountingMonitor('training_progress', epochs=3, steps=4, batch_size=32, samples=100, interval=0)
+        self.model.fit(self.x, self.y, batch_size=32, epochs=3, verbose=0, callbacks=[monitor])
+        metrics = monitor.manager.job_metrics['training_progress']
+        assert metrics['epoch'] == 3
+        assert len(metrics['epoch_times']) == 3
+        assert metrics['loss'] is not None
+        assert metrics['eta'] == 0
+        assert metrics['samples_per_sec'] > 0
+        # last batch of each epoch has 4 rows
+        assert monitor.samples_done == 300
+        # each batch, epoch end and train end are reported
+        assert monitor.reports == 12 + 3 + 1
+
+    def test_rate_limit(self):
+        monitor = CountingMonitor('training_progress', epochs=3, interval=3600)
+        self.model.fit(self.x, self.y, batch_size=10, epochs=3, verbose=0, callbacks=[monitor])
+        assert monitor.steps == 10
+        # first batch is reported, later batches are within interval
+        assert monitor.reports == 1 + 3 + 1
+
+    def test_eta(self):
+        monitor = ProgressMonitor('prediction_progress', steps=4, interval=3600)
+        monitor.begin()
+        monitor.step(10)
+        metrics = monitor.metrics()
+        assert metrics['eta'] >= 0 and monitor.samples_done == 10
+        assert monitor.total_steps == 4
+
+    def test_prediction_minibatches(self):
+        kernel = Kernel(kernel_file={}, ipfs_api=None)
+        kernel.model = self.model
+        kernel.progress = CountingMonitor('prediction_progress', steps=4, batch_size=32, interval=0)
+        result = kernel.forward(self.x, batch_size=32)
+        assert np.allclose(result, self.model.predict(self.x, batch_size=32), atol=1e-6)
+        # progress is recorded during batch prediction by each minibatch
+        assert kernel.progress.steps_done == 4
+        assert kernel.progress.samples_done == 100
+        assert kernel.progress.reports == 4
+        assert kernel.progress.metrics()['eta'] == 0
+
+    def test_metrics_reset(self):
+        monitor = ProgressMonitor('prediction_progress', steps=4, interval=0)
+        monitor.step(10)
+        assert 'prediction_progress' in monitor.manager.job_metrics
+        # progress of completed job is not reported for next job
+        monitor.manager.set_complete_reset()
+        assert monitor.manager.job_metrics == {}
@@ -0,0 +1,64 @@
+import unittest
+import tempfile
+import json
+import os
+import keras
+import numpy as np
+
+# executor classes are taken from kernel module, so kernel type checks see the same classes
+from pynode.core.processor.entities.kernel import Kernel, Dataset, NumpyExecutor
+from pynode.core.processor.entities.kernel import quantize, accuracy_delta, weights_bytes
+
+
+class TestQuantization(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.weights_file = os.path.join(self.temp_dir.name, 'weights.h5')
+        self.model = keras.models.Sequential([keras.layers.Dense(512, input_shape=(256,), activation='relu'),
+                                              keras.layers.Dense(256, activation='tanh'),
+                                              keras.layers.Dense(4),
+                                              keras.layers.Activation('softmax')])
+        self.model.save_weights(self.weights_file)
+        self.executor = NumpyExecutor(json.loads(self.model.to_json()))
+        self.executor.load_weights(self.weights_file)
+        self.data = np.random.RandomState(0).normal(size=(200, 256)).astype(np.float32)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_int8(self):
+        quantized = quantize(self.executor, 'int8')
+        assert accuracy_delta(self.executor, quantized, self.data, batch_size=64) < 0.01
+        # scratch tiles are counted with quantized weights
+        assert weights_bytes(quantized) < weights_bytes(self.executor) / 1.5
+        # original executor keeps full precision weights
+        assert self.executor.layers[0].kernel.dtype == np.float32
+
+    def test_float16(self):
+        quantized = quantize(self.executor, 'float16')
+        assert accuracy_delta(self.executor, quantized, self.data, batch_size=64) < 1e-3
+        assert weights_bytes(quantized) < weights_bytes(self.executor)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(Exception) as context:
+            quantize(self.executor, 'int4')
+        assert type(context.exception).__name__ == 'ModelInconsistencyError'
+
+    def test_kernel_tolerance(self):
+        dataset = Dataset(dataset_file={}, ipfs_api=None, batch_no=0)
+        dataset.datasets = [self.data]
+        for tolerance, quantized in ((0.05, True), (0.0, False)):
+            kernel = Kernel(kernel_file={}, ipfs_api=None)
+            kernel.model = self.executor
+            kernel.manager.processor_quantization = 'int8'
+            kernel.manager.processor_quantization_tolerance = tolerance
+            kernel.manager.processor_predict_workers = 2
+            try:
+                kernel.quantize_model(dataset)
+                assert (kernel.model is not self.executor) == quantized
+                assert kernel.manager.job_metrics['quantization']['parallel_disabled'] == quantized
+            finally:
+                kernel.manager.processor_quantization = 'none'
+                kernel.manager.processor_quantization_tolerance = 0.01
+                kernel.manager.processor_predict_workers = 1
@@ -0,0 +1,113 @@
+import unittest
+import tempfile
+import os
+import h5py
+import numpy as np
+
+from pynode.core.processor.readers import get_reader, check_data_head, check_json_head, Hdf5Reader, NpyReader, NpzReader
+
+
+class TestReaders(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data = np.arange(60, dtype=np.float32).reshape((20, 3))
+        # files without extensions as they are stored by ipfs addresses
+        self.hdf5_file = os.path.join(self.temp_dir.name, 'hdf5_data')
+        with h5py.File(self.hdf5_file, 'w') as h5f:
+            h5f.create_dataset('batches', data=self.data)
+        self.npy_file = os.path.join(self.temp_dir.name, 'npy_data')
+        with open(self.npy_file, 'wb') as npy_file:
+            np.save(npy_file, self.data)
+        self.npz_file = os.path.join(self.temp_dir.name, 'npz_data')
+        with open(self.npz_file, 'wb') as npz_file:
+            np.savez(npz_file, train_x=self.data, train_y=self.data[:, 0])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    # ------------------------------------
+    # reader determination
+    def test_reader_by_signature(self):
+        assert isinstance(get_reader(self.hdf5_file), Hdf5Reader)
+        assert isinstance(get_reader(self.npy_file), NpyReader)
+        assert isinstance(get_reader(self.npz_file), NpzReader)
+
+    def test_reader_by_format(self):
+        assert isinstance(get_reader(self.hdf5_file, 'npy'), NpyReader)
+
+    def test_reader_unknown_format(self):
+        with self.assertRaises(Exception) as context:
+            get_reader(self.hdf5_file, 'csv')
+        assert type(context.exception).__name__ == 'DataInconsistencyError'
+
+    def test_reader_default(self):
+        unknown_file = os.path.join(self.temp_dir.name, 'unknown')
+        with open(unknown_file, 'wb') as data_file:
+            data_file.write(b'<html></html>')
+        assert isinstance(get_reader(unknown_file), Hdf5Reader)
+
+    # ------------------------------------
+    # data reading
+    def test_read_hdf5(self):
+        reader = get_reader(self.hdf5_file)
+        assert reader.read_header(self.hdf5_file, 'batches') == ((20, 3), np.float32)
+        assert np.array_equal(reader.read(self.hdf5_file, 'batches'), self.data)
+
+    def test_read_npy(self):
+        reader = get_reader(self.npy_file)
+        assert reader.read_header(self.npy_file, 'batches') == ((20, 3), np.float32)
+        data = reader.read(self.npy_file, 'batches')
+        assert isinstance(data, np.memmap)
+        assert np.array_equal(data, self.data)
+
+    def test_read_npz(self):
+        reader = get_reader(self.npz_file)
+        assert reader.read_header(self.npz_file, 'train_y') == ((20,), np.float32)
+        assert np.array_equal(reader.read(self.npz_file, 'train_x'), self.data)
+        assert np.array_equal(reader.read(self.npz_file, 'train_y'), self.data[:, 0])
+
+    def test_read_rows(self):
+        for file_address, name in [(self.hdf5_file, 'batches'), (self.npy_file, 'batches'), (self.npz_file, 'train_x')]:
+            reader = get_reader(file_address)
+            assert reader.read_header(file_address, name, (5, 15)) == ((10, 3), np.float32)
+            assert np.array_equal(reader.read(file_address, name, (5, 15)), self.data[5:15])
+            with reader.open(file_address, name, (5, 15)) as data:
+                assert data.shape == (10, 3)
+                assert np.array_equal(data[2:4], self.data[7:9])
+
+    def test_read_rows_out_of_data(self):
+        reader = get_reader(self.hdf5_file)
+        with self.assertRaises(Exception):
+            reader.read_header(self.hdf5_file, 'batches', (15, 25))
+        with self.assertRaises(Exception):
+            reader.read(self.hdf5_file, 'batches', (5, 5))
+
+    # ------------------------------------
+    # download validation by first bytes
+    def head(self, file_path: str) -> bytes:
+        with open(file_path, 'rb') as data_file:
+            return data_file.read(512)
+
+    def assert_invalid(self, check, *args):
+        with self.assertRaises(Exception) as context:
+            check(*args)
+        assert type(context.exception).__name__ == 'DataInconsistencyError'
+
+    def test_check_data_head(self):
+        check_data_head(self.head(self.hdf5_file))
+        check_data_head(self.head(self.npy_file))
+        check_data_head(self.head(self.npz_file))
+        check_data_head(self.head(self.npy_file), 'npy')
+        self.assert_invalid(check_data_head, self.head(self.npy_file), 'hdf5')
+        self.assert_invalid(check_data_head, b'<html><body>504 Gateway Time-out</body></html>')
+        self.assert_invalid(check_data_head, b'\x89HD')
+
+    def test_check_npy_head(self):
+        with open(self.npy_file, 'wb') as npy_file:
+            np.save(npy_file, np.array(['a', 'b'], dtype=object))
+        self.assert_invalid(check_data_head, self.head(self.npy_file))
+
+    def test_check_json_head(self):
+        check_json_head(b'  \n{"model": "Qm"}')
+        self.assert_invalid(check_json_head, b'<!DOCTYPE html>')
@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+
+from pynode.core.processor.reducers import OutputReducer
+
+
+class TestReducers(unittest.TestCase):
+
+    def setUp(self):
+        self.out = np.random.RandomState(0).rand(50, 300).astype(np.float32)
+
+    def test_argmax(self):
+        reducer = OutputReducer([{'op': 'argmax'}])
+        assert reducer.output(self.out.shape, self.out.dtype) == ((50,), np.dtype(np.uint16))
+        assert np.array_equal(reducer.apply(self.out), self.out.argmax(axis=1))
+
+    def test_top_k(self):
+        indices = OutputReducer([{'op': 'top_k', 'k': 3}])
+        values = OutputReducer([{'op': 'top_k', 'k': 3, 'output': 'values'}])
+        expected = np.argsort(-self.out, axis=1)[:, :3]
+        assert indices.output(self.out.shape, self.out.dtype) == ((50, 3), np.dtype(np.uint16))
+        assert np.array_equal(indices.apply(self.out), expected)
+        assert np.array_equal(values.apply(self.out), self.out[np.arange(50)[:, None], expected])
+
+    def test_top_k_outputs_grid(self):
+        # outputs of several dimensions are reduced along last axis
+        out = self.out.reshape((50, 10, 30))
+        values = OutputReducer([{'op': 'top_k', 'k': 2, 'output': 'values'}])
+        assert np.array_equal(values.apply(out), -np.sort(-out, axis=-1)[..., :2])
+
+    def test_threshold_and_quantize(self):
+        threshold = OutputReducer([{'op': 'threshold', 'value': 0.5}])
+        assert np.array_equal(threshold.apply(self.out), self.out >= 0.5)
+        quantize = OutputReducer([{'op': 'quantize', 'levels': 255}])
+        assert quantize.output(self.out.shape, self.out.dtype)[1] == np.uint8
+        assert np.abs(quantize.apply(self.out) / 255 - self.out).max() <= 0.5 / 255 + 1e-6
+
+    def test_wrong_steps(self):
+        for steps in ([{'op': 'softmax'}], [{'op': 'top_k', 'k': 0}], [{'op': 'quantize', 'max': -1}]):
+            with self.assertRaises(Exception) as context:
+                OutputReducer(steps)
+            assert type(context.exception).__name__ == 'DataInconsistencyError'
+        with self.assertRaises(Exception) as context:
+            OutputReducer([{'op': 'argmax'}, {'op': 'argmax'}]).output((50, 300), np.float32)
+        assert type(context.exception).__name__ == 'DataInconsistencyError'
@@ -0,0 +1,86 @@
+import unittest
+import tempfile
+import json
+import os
+import time
+
+# cache singleton is taken from processor module, so tests reset instance used by processor
+from pynode.core.processor.processor import Processor, ProcessorDelegate, ResultCache
+from pynode.integration.ipfs_service import IpfsService
+from pynode.integration.dummy.ipfs_connector import IpfsConnectorDummy
+
+
+class TestResultCache(unittest.TestCase, ProcessorDelegate):
+
+    test_data_path = '../tests/data/'
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(directory=os.path.join(self.temp_dir.name, 'cache'), size=2)
+        self.completed = []
+
+    def tearDown(self):
+        ResultCache._ResultCache__instance = None
+        self.temp_dir.cleanup()
+
+    def test_put_get(self):
+        assert self.cache.get('key_1') is None
+        self.cache.put('key_1', 'QmResult1')
+        assert self.cache.get('key_1') == 'QmResult1'
+        assert self.cache.stats['hits'] == 1 and self.cache.stats['misses'] == 1
+
+    def test_eviction(self):
+        for number in range(3):
+            self.cache.put('key_%d' % number, 'QmResult%d' % number)
+            # modification time resolution of some file systems
+            time.sleep(0.01)
+            if number == 1:
+                # recently used entry is kept
+                self.cache.get('key_0')
+        assert self.cache.get('key_1') is None
+        assert self.cache.get('key_0') == 'QmResult0'
+        assert self.cache.get('key_2') == 'QmResult2'
+        assert self.cache.stats['evictions'] == 1
+
+    def test_disabled(self):
+        cache = ResultCache.__new__(ResultCache)
+        cache.directory, cache.size = '', 1000
+        assert not cache.enabled
+        assert cache.get('key_1') is None
+
+    def test_processor_cached_result(self):
+        ipfs_api = IpfsService(strategic=IpfsConnectorDummy())
+        with open(self.test_data_path + 'test_kernel_2') as json_file:
+            kernel_file = json.load(json_file)
+        with open(self.test_data_path + 'test_dataset_2.json') as json_file:
+            dataset_file = json.load(json_file)
+        processor = Processor(ipfs_api=ipfs_api, processor_id=0, delegate=self)
+        assert processor.prepare(kernel_file=kernel_file, dataset_file=dataset_file, batch=0)
+        key = ResultCache.job_key(processor.kernel, processor.dataset)
+        # other batch of same data is other job
+        other = Processor(ipfs_api=ipfs_api, processor_id=0, delegate=self)
+        other.prepare(kernel_file=kernel_file, dataset_file=dataset_file, batch=1)
+        assert ResultCache.job_key(other.kernel, other.dataset) != key
+
+        self.cache.put(key, 'QmCachedResult')
+        cwd = os.getcwd()
+        workspace = os.path.join(self.temp_dir.name, 'workspace')
+        os.makedirs(workspace)
+        os.chdir(workspace)
+        try:
+            processor.compute()
+        finally:
+            os.chdir(cwd)
+        assert self.completed == ['QmCachedResult']
+
+    def processor_load_complete(self, processor_id: str):
+        pass
+
+    def processor_load_failure(self, processor_id: str):
+        pass
+
+    def processor_computing_complete(self, processor_id: str, results_file: str):
+        self.completed.append(results_file)
+
+    def processor_computing_failure(self, processor_id: str):
+        self.completed.append(None)
@@ -0,0 +1,80 @@
+import unittest
+import tempfile
+import os
+import h5py
+import numpy as np
+
+from collections import OrderedDict
+from pynode.core.processor.result_writer import ResultWriter
+from pynode.core.processor.reducers import OutputReducer
+
+
+class TestResultWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.results_file = os.path.join(self.temp_dir.name, 'job.out.hdf5')
+        # softmax like output with repeated values is well compressible
+        self.out = np.tile(np.linspace(0, 1, 10), (1000, 1))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_write_compressed(self):
+        writer = ResultWriter(chunks='100', compression='gzip', shuffle=True)
+        report = writer.write(self.results_file, {'dataset': self.out})
+        with h5py.File(self.results_file, 'r') as h5f:
+            h5ds = h5f['dataset']
+            assert h5ds.chunks == (100, 10)
+            assert h5ds.compression == 'gzip'
+            assert h5ds.shuffle is True
+            assert np.array_equal(h5ds[()], self.out)
+        assert report['raw_bytes'] == self.out.nbytes
+        assert report['file_bytes'] == os.path.getsize(self.results_file)
+        assert report['saved_bytes'] > 0
+
+    def test_write_lzf_chunk_shape(self):
+        writer = ResultWriter(chunks='5000,4', compression='lzf', shuffle=False)
+        writer.write(self.results_file, {'dataset': self.out})
+        with h5py.File(self.results_file, 'r') as h5f:
+            h5ds = h5f['dataset']
+            # chunk shape is limited by dataset shape
+            assert h5ds.chunks == (1000, 4)
+            assert h5ds.compression == 'lzf'
+            assert h5ds.shuffle is False
+
+    def test_write_uncompressed(self):
+        writer = ResultWriter(chunks='none', compression='none', shuffle=False)
+        writer.write(self.results_file, {'dataset': self.out})
+        with h5py.File(self.results_file, 'r') as h5f:
+            h5ds = h5f['dataset']
+            assert h5ds.chunks is None
+            assert h5ds.compression is None
+            assert np.array_equal(h5ds[()], self.out)
+
+    def test_write_float16(self):
+        writer = ResultWriter(float16=True)
+        writer.write(self.results_file, {'dataset': self.out})
+        with h5py.File(self.results_file, 'r') as h5f:
+            h5ds = h5f['dataset']
+            assert h5ds.dtype == np.float16
+            assert np.allclose(h5ds[()], self.out, atol=1e-3)
+
+    def test_write_multiple_datasets(self):
+        writer = ResultWriter()
+        writer.write(self.results_file, OrderedDict([('dataset_0', self.out),
+                                                     ('dataset_2', self.out[:0])]))
+        with h5py.File(self.results_file, 'r') as h5f:
+            assert h5f['dataset_0'].shape == (1000, 10)
+            assert h5f['dataset_2'].shape == (0, 10)
+
+    def test_write_reduced(self):
+        writer = ResultWriter()
+        writer.block_rows = 64
+        report = writer.write(self.results_file, {'dataset': self.out},
+                              reducer=OutputReducer([{'op': 'top_k', 'k': 2}]))
+        with h5py.File(self.results_file, 'r') as h5f:
+            h5ds = h5f['dataset']
+            assert h5ds.dtype == np.uint8
+            assert np.array_equal(h5ds[()], np.tile([9, 8], (1000, 1)))
+        assert report['raw_bytes'] == self.out.nbytes
@@ -0,0 +1,70 @@
+import unittest
+import tempfile
+import os
+import h5py
+import numpy as np
+
+from pynode.core.processor.scanner import DataScanner
+
+
+class TestScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.data = np.random.RandomState(0).normal(5.0, 2.0, size=(1000, 3, 4))
+
+    def test_scan_statistics(self):
+        scanner = DataScanner(chunk_rows=64, workers=3)
+        stats = scanner.scan(self.data)
+        flat = self.data.reshape((1000, 12))
+        assert stats.rows == 1000
+        assert np.allclose(stats.mean, flat.mean(axis=0))
+        assert np.allclose(stats.variance, flat.var(axis=0))
+        assert np.array_equal(stats.min, flat.min(axis=0))
+        assert np.array_equal(stats.max, flat.max(axis=0))
+        assert scanner.check('batches', stats) == []
+
+    def test_scan_hdf5_dataset(self):
+        scanner = DataScanner(chunk_rows=100, workers=2)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'batches.h5')
+            with h5py.File(file_path, 'w') as h5f:
+                h5f.create_dataset('batches', data=self.data, chunks=(50, 3, 4), compression='gzip')
+            with h5py.File(file_path, 'r') as h5f:
+                stats = scanner.scan(h5f['batches'])
+        assert np.allclose(stats.mean, self.data.reshape((1000, 12)).mean(axis=0))
+
+    def test_scan_invalid_values(self):
+        self.data[10, 0, 0] = np.nan
+        self.data[20, 1, 1] = np.nan
+        self.data[30, 2, 2] = np.inf
+        scanner = DataScanner(chunk_rows=64, workers=2)
+        stats = scanner.scan(self.data)
+        assert int(stats.nan_count.sum()) == 2
+        assert int(stats.inf_count.sum()) == 1
+        # statistics are calculated by finite values only
+        assert np.isfinite(stats.mean).all()
+        assert len(scanner.check('batches', stats)) == 2
+
+    def test_scan_values_limit(self):
+        self.data[500, 0, 0] = -1e9
+        scanner = DataScanner(chunk_rows=64, workers=2, value_limit=1e6)
+        anomalies = scanner.check('batches', scanner.scan(self.data))
+        assert len(anomalies) == 1
+        # values magnitude is not limited by default
+        scanner = DataScanner(chunk_rows=64, workers=2)
+        assert scanner.check('batches', scanner.scan(self.data)) == []
+
+    def test_sample_chunks(self):
+        scanner = DataScanner(chunk_rows=10)
+        assert scanner.sample_chunks(1000, 'all') == list(range(0, 1000, 10))
+        sample = scanner.sample_chunks(1000, '8', seed='0xjob')
+        assert len(sample) == 8
+        assert sample == sorted(set(sample))
+        # the same job address gives the same sample
+        assert sample == scanner.sample_chunks(1000, '8', seed='0xjob')
+        assert len(scanner.sample_chunks(1000, '5%', seed='0xjob')) == 5
+        assert len(scanner.sample_chunks(1000, '500', seed='0xjob')) == 100
+
+    def test_sample_confidence(self):
+        assert DataScanner.sample_confidence(100, 100) == 0.0
+        assert abs(DataScanner.sample_confidence(30, 1000) - 0.0950) < 1e-3
@@ -0,0 +1,65 @@
+import unittest
+import tempfile
+import os
+import h5py
+import keras
+import numpy as np
+
+from pynode.core.processor.sparse import CsrMatrix, write_sparse
+from pynode.core.processor.readers import Hdf5Reader
+from pynode.core.processor.entities.kernel import Kernel, MinibatchSequence
+
+
+class TestSparse(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.temp_dir.name, 'sparse.hdf5')
+        random = np.random.RandomState(0)
+        # about 95% of zeros
+        self.dense = random.rand(200, 50) * (random.rand(200, 50) > 0.95)
+        with h5py.File(self.data_file, 'w') as h5f:
+            write_sparse(h5f.create_group('batches'), self.dense)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_rows_slicing(self):
+        matrix = Hdf5Reader().read(self.data_file, 'batches')
+        assert type(matrix).__name__ == CsrMatrix.__name__
+        assert matrix.shape == (200, 50)
+        assert matrix.nnz == np.count_nonzero(self.dense)
+        assert np.array_equal(matrix[10:20], self.dense[10:20])
+        assert np.array_equal(matrix[190:300], self.dense[190:])
+        assert np.array_equal(matrix[:], self.dense)
+
+    def test_read_header(self):
+        shape, dtype = Hdf5Reader().read_header(self.data_file, 'batches', (50, 150))
+        assert shape == (100, 50)
+        assert dtype == self.dense.dtype
+
+    def test_read_rows(self):
+        matrix = Hdf5Reader().read(self.data_file, 'batches', (50, 150))
+        assert matrix.shape == (100, 50)
+        assert np.array_equal(matrix[:], self.dense[50:150])
+
+    def test_inconsistent_matrix(self):
+        with self.assertRaises(Exception) as context:
+            CsrMatrix(np.zeros(3), np.zeros(3), np.array([0, 1, 3]), (3, 4))
+        assert type(context.exception).__name__ == 'DataInconsistencyError'
+
+    def test_minibatch_sequence(self):
+        matrix = Hdf5Reader().read(self.data_file, 'batches')
+        labels = np.arange(200)
+        sequence = MinibatchSequence(matrix, labels, batch_size=64, start=100)
+        assert len(sequence) == 2
+        x, y = sequence[1]
+        assert np.array_equal(x, self.dense[164:200])
+        assert np.array_equal(y, labels[164:200])
+
+    def test_sparse_prediction(self):
+        kernel = Kernel(kernel_file={}, ipfs_api=None)
+        kernel.model = keras.models.Sequential([keras.layers.Dense(4, input_shape=(50,))])
+        matrix = Hdf5Reader().read(self.data_file, 'batches')
+        result = kernel.predict(matrix, batch_size=64)
+        assert np.allclose(result, kernel.model.predict(self.dense, batch_size=64), atol=1e-6)
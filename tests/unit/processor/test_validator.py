@@ -0,0 +1,276 @@
+import unittest
+import tempfile
+import json
+import os
+import h5py
+import keras
+import numpy as np
+
+from unittest import mock
+
+from pynode.core.processor.entities.kernel import Kernel, Dataset
+from pynode.core.processor.validator import Validator, InferenceWorker
+from pynode.core.processor.reducers import OutputReducer
+from pynode.integration.ipfs_service import IpfsService
+from pynode.integration.dummy.ipfs_connector import IpfsConnectorDummy
+
+
+class TestValidator(unittest.TestCase):
+
+    # test_model_1 - model with input layer shape [null, 784]
+    # test_dataset_1.json - simple dataset for training
+    # test_dataset_2.json - file for prediction
+
+    test_ipfs_instance = None
+    test_data_path = '../tests/data/'
+    kernel_1_file = None
+    dataset_1_file = None
+    dataset_2_file = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_ipfs_instance = IpfsService(strategic=IpfsConnectorDummy())
+        if 'travis' in os.getcwd():  # fix path for travis launch
+            cls.test_data_path = 'tests/data/'
+
+        with open(cls.test_data_path + 'test_kernel_1') as json_file:
+            cls.kernel_1_file = json.load(json_file)
+        with open(cls.test_data_path + 'test_dataset_1.json') as json_file:
+            cls.dataset_1_file = json.load(json_file)
+        with open(cls.test_data_path + 'test_dataset_2.json') as json_file:
+            cls.dataset_2_file = json.load(json_file)
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_file(self, name: str, data, file_name: str = None):
+        file_path = os.path.join(self.temp_dir.name, (file_name or name) + '.h5')
+        with h5py.File(file_path, 'w') as h5f:
+            h5f.create_dataset(name, data=data)
+        return file_path
+
+    def make_validator(self, dataset_file) -> Validator:
+        kernel = Kernel(kernel_file=self.kernel_1_file,
+                        ipfs_api=self.test_ipfs_instance)
+        kernel.init_kernel()
+        kernel.model_address = self.test_data_path + 'test_model_1'
+        dataset = Dataset(dataset_file=dataset_file,
+                          ipfs_api=self.test_ipfs_instance,
+                          batch_no=0)
+        dataset.init_dataset()
+        return Validator(kernel=kernel, dataset=dataset)
+
+    # ------------------------------------
+    # prediction data validation
+    def test_validate_predict(self):
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_address = self.make_file('batches', np.zeros((10, 784)))
+        assert validator.validate() is True
+
+    def test_validate_predict_wrong_shape(self):
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_address = self.make_file('batches', np.zeros((10, 28, 28)))
+        assert validator.validate() is False
+
+    def test_validate_predict_wrong_features(self):
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_address = self.make_file('batches', np.zeros((10, 100)))
+        assert validator.validate() is False
+
+    def test_validate_predict_wrong_type(self):
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_address = self.make_file('batches', np.array([[b'a'] * 784] * 2))
+        assert validator.validate() is False
+
+    def test_validate_predict_wrong_name(self):
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_address = self.make_file('dataset', np.zeros((10, 784)))
+        assert validator.validate() is False
+
+    def test_validate_predict_nan_values(self):
+        validator = self.make_validator(self.dataset_2_file)
+        data = np.zeros((10, 784))
+        data[5, 5] = np.nan
+        validator.dataset.data_address = self.make_file('batches', data)
+        # values are scanned by default
+        assert validator.validate() is False
+        validator.manager.processor_scan_values = False
+        try:
+            assert validator.validate() is True
+        finally:
+            validator.manager.processor_scan_values = True
+
+    def test_validate_predict_large_values(self):
+        validator = self.make_validator(self.dataset_2_file)
+        data = np.zeros((10, 784))
+        data[5, 5] = -1e9
+        validator.dataset.data_address = self.make_file('batches', data)
+        try:
+            # large finite values are rejected only by configured limit
+            assert validator.validate() is True
+            validator.manager.processor_scan_value_limit = 1e6
+            assert validator.validate() is False
+        finally:
+            validator.manager.processor_scan_value_limit = None
+
+    def test_validate_predict_default_sample(self):
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_address = self.make_file('batches', np.zeros((300, 784)))
+        validator.manager.processor_scan_chunk_rows = 10
+        try:
+            # default scan reads bounded sample of chunks
+            validator.manager.job_contract_address = '0xjob'
+            assert validator.validate() is True
+            assert validator.manager.job_metrics['validation']['batches'] == {'chunks': 30, 'sampled': 16}
+        finally:
+            validator.manager.processor_scan_chunk_rows = 4096
+            validator.manager.job_contract_address = ''
+
+    def test_validate_predict_sampled_values(self):
+        validator = self.make_validator(self.dataset_2_file)
+        data = np.zeros((10000, 784), dtype=np.float32)
+        data[9999, 5] = np.inf
+        validator.dataset.data_address = self.make_file('batches', data)
+        validator.manager.processor_scan_sample = '1'
+        try:
+            # anomaly outside of sample is not found
+            validator.manager.job_contract_address = '0xjob'
+            assert validator.validate() is True
+            assert validator.manager.job_metrics['validation']['batches'] == {'chunks': 3, 'sampled': 1}
+            # anomaly in sample escalates to full scan
+            data[0:4096, 5] = np.inf
+            validator.dataset.data_address = self.make_file('batches', data)
+            validator.manager.processor_scan_sample = '2'
+            assert validator.validate() is False
+        finally:
+            validator.manager.processor_scan_sample = '16'
+            validator.manager.job_contract_address = ''
+
+    def test_validate_predict_multiple_batches(self):
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_addresses = [self.make_file('batches', np.zeros((10, 784)), 'batch_0'),
+                                            self.make_file('batches', np.zeros((5, 784)), 'batch_1')]
+        assert validator.validate() is True
+
+    def test_validate_predict_multiple_batches_wrong_shape(self):
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_addresses = [self.make_file('batches', np.zeros((10, 784)), 'batch_0'),
+                                            self.make_file('batches', np.zeros((5, 100)), 'batch_1')]
+        assert validator.validate() is False
+
+    def test_validate_predict_missing_file(self):
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_address = os.path.join(self.temp_dir.name, 'missing.h5')
+        assert validator.validate() is False
+
+    # ------------------------------------
+    # training data validation
+    def test_validate_fit(self):
+        validator = self.make_validator(self.dataset_1_file)
+        validator.dataset.train_x_address = self.make_file('train_x', np.zeros((10, 784)))
+        validator.dataset.train_y_address = self.make_file('train_y', np.zeros((10, 10)))
+        assert validator.validate() is True
+
+    def test_validate_fit_wrong_optimizer(self):
+        validator = self.make_validator(self.dataset_1_file)
+        validator.dataset.optimizer = 'unknown'
+        validator.dataset.train_x_address = self.make_file('train_x', np.zeros((10, 784)))
+        validator.dataset.train_y_address = self.make_file('train_y', np.zeros((10, 10)))
+        assert validator.validate() is False
+
+    def test_validate_fit_rows_mismatch(self):
+        validator = self.make_validator(self.dataset_1_file)
+        validator.dataset.train_x_address = self.make_file('train_x', np.zeros((10, 784)))
+        validator.dataset.train_y_address = self.make_file('train_y', np.zeros((9, 10)))
+        assert validator.validate() is False
+
+    # ------------------------------------
+    # kernel dry run
+    def test_probe_predict(self):
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_address = self.make_file('batches', np.zeros((100, 784)))
+        assert validator.validate() is True
+        probe = validator.manager.job_metrics['probe']
+        assert probe['rows'] == 8 and probe['total_rows'] == 100
+        assert probe['estimated_time'] >= 0
+
+    def test_probe_predict_minibatch_timing(self):
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_address = self.make_file('batches', np.zeros((500, 784)))
+        # probe is timed by minibatch call as computing, per call overhead of predict is not extrapolated
+        with mock.patch.object(keras.Model, 'predict', side_effect=AssertionError('predict is called')):
+            assert validator.validate() is True
+        probe = validator.manager.job_metrics['probe']
+        assert probe['estimated_time'] == probe['run_time'] / 8 * 500
+
+    def test_probe_predict_reducer(self):
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_address = self.make_file('batches', np.zeros((100, 784)))
+        validator.dataset.reducer = OutputReducer([{'op': 'argmax'}])
+        assert validator.validate() is True
+        # second argmax has no outputs axis, job is rejected on validation instead of results writing
+        validator.dataset.reducer = OutputReducer([{'op': 'argmax'}, {'op': 'argmax'}])
+        assert validator.validate() is False
+
+    def test_probe_fit_wrong_labels(self):
+        # labels shape is checked by kernel output only on dry run
+        validator = self.make_validator(self.dataset_1_file)
+        validator.dataset.train_x_address = self.make_file('train_x', np.zeros((10, 784)))
+        validator.dataset.train_y_address = self.make_file('train_y', np.zeros((10, 3)))
+        assert validator.validate() is False
+
+    def test_probe_fit_keeps_weights(self):
+        validator = self.make_validator(self.dataset_1_file)
+        validator.dataset.train_x_address = self.make_file('train_x', np.ones((10, 784)))
+        validator.dataset.train_y_address = self.make_file('train_y', np.eye(10))
+        weights = validator.kernel.read_model(validator.dataset).get_weights()
+        assert validator.validate() is True
+        assert all(np.array_equal(before, after)
+                   for before, after in zip(weights, validator.kernel.model.get_weights()))
+
+    def test_probe_disabled(self):
+        validator = self.make_validator(self.dataset_1_file)
+        validator.dataset.train_x_address = self.make_file('train_x', np.zeros((10, 784)))
+        validator.dataset.train_y_address = self.make_file('train_y', np.zeros((10, 3)))
+        validator.manager.processor_probe_rows = 0
+        try:
+            assert validator.validate() is True
+        finally:
+            validator.manager.processor_probe_rows = 8
+
+    def test_probe_predict_inference_worker(self):
+        # model is loaded by worker process only
+        validator = self.make_validator(self.dataset_2_file)
+        validator.dataset.data_address = self.make_file('batches', np.zeros((20, 784)))
+        validator.manager.processor_inference_worker = True
+        try:
+            assert validator.validate() is True
+            assert validator.kernel.model is None
+            assert validator.manager.job_metrics['probe']['total_rows'] == 20
+        finally:
+            validator.manager.processor_inference_worker = False
+            InferenceWorker.get_instance().stop()
+            InferenceWorker._InferenceWorker__instance = None
+
+    def test_probe_fit_failure_keeps_weights(self):
+        validator = self.make_validator(self.dataset_1_file)
+        validator.dataset.train_x_address = self.make_file('train_x', np.ones((10, 784)))
+        validator.dataset.train_y_address = self.make_file('train_y', np.eye(10))
+        model = validator.kernel.read_model(validator.dataset)
+        weights = model.get_weights()
+        train_on_batch = model.train_on_batch
+        calls = []
+
+        def failing_train_on_batch(x, y):
+            # first batch changes weights, second batch fails
+            calls.append(x.shape[0])
+            if len(calls) > 1:
+                raise ValueError('training failure')
+            return train_on_batch(x, y)
+
+        with mock.patch.object(model, 'train_on_batch', failing_train_on_batch):
+            assert validator.validate() is False
+        assert all(np.array_equal(before, after) for before, after in zip(weights, model.get_weights()))